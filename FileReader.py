@@ -6,6 +6,12 @@ Provides:
 """
 import pandas as pd
 import os
+import threading
+
+# Parsed sections shared by everything in this process, keyed by absolute path.
+# Each entry is (mtime_ns, size, DataFrame) so an edited file is re-read.
+_section_cache = {}
+_section_cache_lock = threading.Lock()
 
 #new class
 class fileReader:
@@ -14,6 +20,9 @@ class fileReader:
 
     Methods:
         readSEC(name): Parse a single .sec file into a DataFrame.
+        readSECHeader(name): Read the section id and credit hours from a .sec header.
+        cachedReadSEC(name): readSEC through the shared in-process section cache.
+        clearCache(): Drop every cached section.
         bulkReadSEC(filePath, secFileList): Parse multiple .sec files given a base path.
     """
 
@@ -71,6 +80,70 @@ class fileReader:
             raise Exception("Wrong File Type Passed")
             
 
+    def readSECHeader(name):
+        """
+        Read the header line of a section file.
+
+        The header holds the section id and its credit hours,
+        e.g. "COMSC110.01S25 4.0".
+
+        Args:
+            name (str): Full path to the .sec file.
+
+        Returns:
+            tuple: (section_id, credit_hours) - credit_hours is a float, or
+                   None if the header does not give one.
+
+        Raises:
+            Exception: If file extension is not '.sec'.
+            IOError: If the file cannot be opened or read.
+        """
+        if name.split(".")[-1].lower() != "sec":
+            raise Exception("Wrong File Type Passed")
+        with open(name, 'r') as file:
+            parts = file.readline().split()
+        section_id = parts[0] if parts else ""
+        try:
+            credit_hours = float(parts[-1]) if len(parts) > 1 else None
+        except ValueError:
+            credit_hours = None
+        return section_id, credit_hours
+
+    def cachedReadSEC(name):
+        """
+        Parse a section file, reusing an earlier parse if the file is unchanged.
+
+        The cache is shared by every caller in the process (lists, z-scores and
+        the background prefetch), so a section is parsed once per run.
+
+        Args:
+            name (str): Full path to the .sec file.
+
+        Returns:
+            pandas.DataFrame: A copy of the parsed section, safe to modify.
+
+        Raises:
+            Exception: If file extension is not '.sec'.
+            IOError: If the file cannot be opened or read.
+        """
+        key = os.path.abspath(name)
+        stat = os.stat(key)
+        with _section_cache_lock:
+            cached = _section_cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2].copy()
+
+        # parse outside the lock so other threads are not held up
+        dataframe = fileReader.readSEC(key)
+        with _section_cache_lock:
+            _section_cache[key] = (stat.st_mtime_ns, stat.st_size, dataframe)
+        return dataframe.copy()
+
+    def clearCache():
+        """Forget every section parsed by cachedReadSEC."""
+        with _section_cache_lock:
+            _section_cache.clear()
+
     def bulkReadSEC(filePath, secFileList):
         """
         Load multiple section files relative to a run file path.
@@ -5,11 +5,14 @@ aggregated across all course sections.
 Provides:
   - Lists.goodList: returns students earning "A" or "A-" with source section.
   - Lists.badList: returns students earning "F" or "D-" range with source section.
+  - Lists.cohortList: returns the enrollments of a run matching a cohort filter expression.
+  - Lists.rankedList: returns the top/bottom N or percentile students by GPA per section, group or run.
 """
 
 from run_parser import runReader
 from grp_parser import grpReader
 from FileReader import fileReader
+from cohort_filter import compile_filter
 import pandas as pd
 import os # Import os for basename
 
@@ -20,6 +23,8 @@ class Lists:
     Methods:
         goodList(runFile): DataFrame of top-performing students with source section.
         badList(runFile): DataFrame of bottom-performing students with source section.
+        cohortList(runFile, expression): Enrollments of a run in a cohort.
+        rankedList(runFile, ...): Top/bottom students by GPA, selected by partial sorting.
     """
 
     def goodList(runFile):
@@ -29,7 +34,7 @@ class Lists:
         Workflow:
           1. Parse run file to get group identifiers.
           2. Determine section filenames via grpReader.
-          3. Bulk read section DataFrames with fileReader.
+          3. Read section DataFrames with fileReader (through its section cache).
           4. For each section DataFrame, filter rows where Grade is "A" or "A-".
           5. Add a 'section_source' column with the base name of the .sec file.
           6. Concatenate filtered data from all sections.
@@ -55,7 +60,7 @@ class Lists:
         for sec_file_name in secList:
             full_path = os.path.join(sections_path, sec_file_name)
             try:
-                dataframe = fileReader.readSEC(full_path)
+                dataframe = fileReader.cachedReadSEC(full_path)
                 if dataframe.empty:
                     continue # Skip empty dataframes
 
@@ -80,7 +85,7 @@ class Lists:
                 # --- End Robustness Check ---
 
                 # Filter for good grades
-                filtered_df = dataframe[dataframe["Grade"].isin(["A", "A-"])].copy()
+                filtered_df = compile_filter('good').apply(dataframe).copy()
                 if not filtered_df.empty:
                     # Add the source section file name
                     filtered_df['section_source'] = os.path.basename(sec_file_name)
@@ -109,7 +114,7 @@ class Lists:
         Workflow:
           1. Parse run file to get group identifiers.
           2. Determine section filenames via grpReader.
-          3. Bulk read section DataFrames with fileReader.
+          3. Read section DataFrames with fileReader (through its section cache).
           4. For each section DataFrame, filter rows where Grade is "F", "D-", "D", or "D+".
           5. Add a 'section_source' column with the base name of the .sec file.
           6. Concatenate filtered data from all sections.
@@ -135,7 +140,7 @@ class Lists:
         for sec_file_name in secList:
             full_path = os.path.join(sections_path, sec_file_name)
             try:
-                dataframe = fileReader.readSEC(full_path)
+                dataframe = fileReader.cachedReadSEC(full_path)
                 if dataframe.empty:
                     continue # Skip empty dataframes
 
@@ -160,7 +165,7 @@ class Lists:
                 # --- End Robustness Check ---
 
                 # Filter for bad grades
-                filtered_df = dataframe[dataframe["Grade"].isin(["F", "D-", "D", "D+"])].copy()
+                filtered_df = compile_filter('work').apply(dataframe).copy()
                 if not filtered_df.empty:
                     # Add the source section file name
                     filtered_df['section_source'] = os.path.basename(sec_file_name)
@@ -179,4 +184,60 @@ class Lists:
         # Drop duplicates - 'id' column should now reliably exist
         badListDF = badListDF.drop_duplicates(subset=['id', 'section_source'], keep='first')
 
-        return badListDF
\ No newline at end of file
+        return badListDF
+
+
+    def cohortList(runFile, expression):
+        """
+        Collect the enrollments of a run that match a cohort filter expression.
+
+        Args:
+            runFile (str): Path to the run file defining group/sections.
+            expression (str): Filter expression such as
+                'grade in (D+, D, D-, F) and term >= F20', or a cohort name
+                from cohort_filter.COHORTS ('good', 'work').
+
+        Returns:
+            pandas.DataFrame: Matching rows of the run's enrollment table, with
+                the section file name in 'section_source' like the other lists.
+
+        Raises:
+            ValueError: If the expression is not valid.
+        """
+        from enrollments import run_enrollments
+
+        cohort = compile_filter(expression)
+        cohortDF = cohort.apply(run_enrollments(runFile)).reset_index(drop=True)
+        return cohortDF.assign(section_source=cohortDF['section'])
+
+
+    def rankedList(runFile, top=True, n=None, percentile=None, by='run'):
+        """
+        Collect the top or bottom students of a run by GPA.
+
+        Selection uses partial sorting (see performers.select_performers), so
+        only the selected students are ever ordered.
+
+        Args:
+            runFile (str): Path to the run file defining group/sections.
+            top (bool): Highest GPAs (default) or lowest.
+            n (int, optional): Students per section, group or run.
+            percentile (float, optional): Percent of the students of each
+                section, group or run (ties at the cutoff included).
+            by (str): 'section', 'group' or 'run' (default).
+
+        Returns:
+            pandas.DataFrame: Scope columns, 'rank', 'id', names, 'gpa',
+                'credits' and 'enrollments'. With by='section' the section
+                is also in 'section_source' like the other lists.
+
+        Raises:
+            ValueError: If not exactly one of n and percentile is given, or by is unknown.
+        """
+        from enrollments import run_enrollments
+        from performers import select_performers
+
+        rankedDF = select_performers(run_enrollments(runFile), by=by, top=top, n=n, percentile=percentile)
+        if by == 'section':
+            rankedDF = rankedDF.assign(section_source=rankedDF['section'])
+        return rankedDF
@@ -1,5 +1,12 @@
-import pandas as pd
+import csv
 import os
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
 
 
 
@@ -22,6 +29,393 @@ To do this we will create a new column ini the CSV that will....
 
 """
 
+
+# Columns of the wide history view (one row per student)
+HISTORY_COLUMNS = ['FirstName', 'LastName', 'id', 'grades', 'sections']
+
+# Columns of a history entry (one row per student, section and list). The
+# entry snapshot and the append-only journal both use this layout.
+ENTRY_COLUMNS = ['id', 'FirstName', 'LastName', 'list', 'section', 'grade', 'run', 'timestamp']
+JOURNAL_COLUMNS = ENTRY_COLUMNS
+
+# A student is recorded at most once per section on each list
+ENTRY_KEY = ['id', 'section', 'list']
+
+
+def _fsync_write(path, write):
+    """Write a file through a temporary file and atomically rename it into place."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', newline='', encoding='utf-8') as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def wide_view(entries):
+    """
+    Collapse history entries into the wide view: one row per student with the
+    grades and sections comma-joined in the order they were recorded.
+
+    Args:
+        entries (pd.DataFrame): Entries with ENTRY_COLUMNS.
+
+    Returns:
+        pd.DataFrame: Columns HISTORY_COLUMNS.
+    """
+    if entries.empty:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    wide = entries.groupby('id', sort=False).agg(
+        FirstName=('FirstName', 'first'),
+        LastName=('LastName', 'first'),
+        grades=('grade', lambda grades: ','.join(filter(None, grades))),
+        sections=('section', lambda sections: ','.join(filter(None, sections))),
+    ).reset_index()
+    return wide[HISTORY_COLUMNS]
+
+
+# Columns kept in per-run snapshots
+SNAPSHOT_COLUMNS = ['id', 'FirstName', 'LastName', 'section', 'grade']
+
+
+def diff_entries(before, after):
+    """
+    Compare two sets of list entries.
+
+    Student ids and sections are factorized into integer codes shared by both
+    sides, so membership is decided with sorted integer set operations rather
+    than string comparisons.
+
+    Args:
+        before (pd.DataFrame): Entries of the earlier run or snapshot
+            (needs 'id', 'section' and 'grade').
+        after (pd.DataFrame): Entries of the later run or snapshot.
+
+    Returns:
+        dict: DataFrames keyed by
+            'added': rows of after for students not in before,
+            'removed': rows of before for students not in after,
+            'changed': students recorded for the same section on both sides
+                with a different grade (id, section, grade_before, grade_after).
+    """
+    before = before.reset_index(drop=True)
+    after = after.reset_index(drop=True)
+    n_before = len(before)
+
+    id_codes, id_values = pd.factorize(pd.concat([before['id'], after['id']], ignore_index=True).astype(str))
+    ids_before, ids_after = id_codes[:n_before], id_codes[n_before:]
+    # Codes are dense (0..n_ids-1), so set membership is a boolean lookup table
+    in_before = np.zeros(len(id_values), dtype=bool)
+    in_before[ids_before] = True
+    in_after = np.zeros(len(id_values), dtype=bool)
+    in_after[ids_after] = True
+
+    added = after[~in_before[ids_after]]
+    removed = before[~in_after[ids_before]]
+
+    # Only students on both sides can have a changed grade; key those rows
+    # by one int64 per (student, section)
+    shared_before = np.flatnonzero(in_after[ids_before])
+    shared_after = np.flatnonzero(in_before[ids_after])
+    n_shared_before = len(shared_before)
+    section_codes, section_values = pd.factorize(pd.concat(
+        [before['section'].iloc[shared_before], after['section'].iloc[shared_after]], ignore_index=True
+    ).astype(str))
+    keys = np.concatenate([ids_before[shared_before], ids_after[shared_after]]).astype(np.int64)
+    keys = keys * max(len(section_values), 1) + section_codes
+    keys_before, keys_after = keys[:n_shared_before], keys[n_shared_before:]
+
+    # Sorted-key merge of the first row of each key on both sides
+    _, first_before = np.unique(keys_before, return_index=True)
+    _, first_after = np.unique(keys_after, return_index=True)
+    _, match_before, match_after = np.intersect1d(keys_before[first_before], keys_after[first_after],
+                                                  assume_unique=True, return_indices=True)
+    rows_before = shared_before[first_before[match_before]]
+    rows_after = shared_after[first_after[match_after]]
+    grades_before = before['grade'].astype(str).to_numpy()[rows_before]
+    grades_after = after['grade'].astype(str).to_numpy()[rows_after]
+    differs = grades_before != grades_after
+    changed = pd.DataFrame({
+        'id': before['id'].astype(str).to_numpy()[rows_before][differs],
+        'section': before['section'].astype(str).to_numpy()[rows_before][differs],
+        'grade_before': grades_before[differs],
+        'grade_after': grades_after[differs],
+    })
+
+    return {
+        'added': added.reset_index(drop=True),
+        'removed': removed.reset_index(drop=True),
+        'changed': changed,
+    }
+
+
+# Columns of the per-student repeat counters
+REPEAT_COLUMNS = ['id', 'FirstName', 'LastName', 'section_count', 'term_count', 'sections', 'terms', 'grades']
+
+
+def _section_terms(sections):
+    """Term of each section name; every distinct name is parsed once."""
+    from enrollments import parse_section_name
+
+    codes, names = pd.factorize(pd.Series(sections, dtype=object).astype(str))
+    terms = np.array([parse_section_name(name)['term'] for name in names], dtype=object)
+    return terms[codes]
+
+
+def repeat_counts(entries, counts=None):
+    """
+    Count the sections and terms each student was recorded in.
+
+    Entries are grouped by student in one pass; with counts given, only the
+    students in entries are recomputed and the rest are carried over.
+
+    Args:
+        entries (pd.DataFrame): Entries with ENTRY_COLUMNS, unique by ENTRY_KEY
+            and not already counted, in the order they were recorded.
+        counts (pd.DataFrame, optional): Counters of the earlier entries, as
+            returned by this function.
+
+    Returns:
+        pd.DataFrame: One row per student indexed by id, columns REPEAT_COLUMNS;
+            sections, terms and grades are comma-joined in recorded order.
+    """
+    if counts is None:
+        counts = pd.DataFrame(columns=REPEAT_COLUMNS).astype({'section_count': int, 'term_count': int})
+    if entries.empty:
+        return counts
+    new = pd.DataFrame({
+        'id': entries['id'].astype(str).to_numpy(),
+        'FirstName': entries['FirstName'].to_numpy(),
+        'LastName': entries['LastName'].to_numpy(),
+        'section': entries['section'].astype(str).to_numpy(),
+        'grade': entries['grade'].astype(str).to_numpy(),
+        'term': _section_terms(entries['section'].to_numpy()),
+    })
+    grouped = new.groupby('id', sort=False).agg(
+        FirstName=('FirstName', 'first'),
+        LastName=('LastName', 'first'),
+        section_count=('section', 'size'),
+        sections=('section', ','.join),
+        grades=('grade', ','.join),
+    )
+    ids = grouped.index
+    old = counts.reindex(ids)
+    known = old['id'].notna().to_numpy()
+
+    # Distinct terms: the earlier ones first, then the new ones in recorded order
+    old_terms = old.loc[known, 'terms'].str.split(',').explode()
+    terms = pd.concat([
+        pd.DataFrame({'id': old_terms.index.to_numpy(), 'term': old_terms.to_numpy()}),
+        new[['id', 'term']],
+    ], ignore_index=True)
+    terms = terms[terms['term'].fillna('') != ''].drop_duplicates()
+    terms = terms.groupby('id', sort=False)['term'].agg(['size', ','.join]).reindex(ids)
+
+    updated = pd.DataFrame({
+        'id': ids.to_numpy(),
+        'FirstName': np.where(known, old['FirstName'].to_numpy(), grouped['FirstName'].to_numpy()),
+        'LastName': np.where(known, old['LastName'].to_numpy(), grouped['LastName'].to_numpy()),
+        'section_count': grouped['section_count'].to_numpy() + old['section_count'].fillna(0).to_numpy(dtype=int),
+        'term_count': terms['size'].fillna(0).to_numpy(dtype=int),
+        'sections': np.where(known, old['sections'].fillna('').to_numpy() + ',', '') + grouped['sections'].to_numpy(),
+        'terms': terms['join'].fillna('').to_numpy(),
+        'grades': np.where(known, old['grades'].fillna('').to_numpy() + ',', '') + grouped['grades'].to_numpy(),
+    }, index=ids)
+    updated.index.name = None
+    return pd.concat([counts[~counts.index.isin(ids)], updated])
+
+
+class _FileLock:
+    """
+    Exclusive OS-level lock on a lock file, held for the body of a with block.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows, so separate
+    processes writing to the same history folder take turns.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+b')
+        if os.name == 'nt':
+            import msvcrt
+            self.file.seek(0)
+            while True:
+                try:
+                    # LK_LOCK retries for about 10 seconds before giving up
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.file.close()
+        return False
+
+
+class _ListIndex:
+    """
+    In-memory state of one list: its entries plus lookup indexes.
+
+    Appends made through this HistoryManager are kept as pending frames and
+    folded in (and the indexes rebuilt) on the next read, so an update only
+    costs the size of the update.
+
+    The work list also carries its repeat counters (see repeat_counts), which
+    are folded forward on every append, so repeat-student queries never scan
+    the entries.
+    """
+
+    def __init__(self, signature, entries, journal_rows, counts=None):
+        self.signature = signature
+        self.entries = entries
+        self.journal_rows = journal_rows
+        self.keys = set(zip(entries['id'], entries['section']))
+        self.ids = set(entries['id'])
+        self.pending = []
+        self._views = None
+        # repeat_counts() frame, or None when the list does not track repeats
+        self.counts = counts
+        # Guards the in-memory state only; never held while touching files
+        self.lock = threading.Lock()
+
+    def append(self, events, signature):
+        """Record events that were just appended to the journal."""
+        with self.lock:
+            self.pending.append(events)
+            self.keys.update(zip(events['id'], events['section']))
+            self.ids.update(events['id'])
+            if self.counts is not None:
+                self.counts = repeat_counts(events, self.counts)
+            self.journal_rows += len(events)
+            self.signature = signature
+            self._views = None
+
+    def repeats(self, min_count, by):
+        """
+        Return the counters of students with at least min_count distinct
+        sections (by='section') or terms (by='term').
+        """
+        with self.lock:
+            counts = self.counts
+        return counts[counts[f'{by}_count'] >= min_count]
+
+    def views(self):
+        """
+        Return (entries, wide, by_id, by_section, by_student).
+
+        by_id is the wide view indexed by id; by_section and by_student map a
+        section or id to the positions of its rows in entries.
+        """
+        with self.lock:
+            if self.pending:
+                self.entries = pd.concat([self.entries] + self.pending, ignore_index=True)
+                self.pending = []
+            if self._views is None:
+                wide = wide_view(self.entries)
+                by_id = wide.set_index('id', drop=False)
+                by_id.index.name = None
+                self._views = (
+                    self.entries,
+                    wide,
+                    by_id,
+                    self.entries.groupby('section', sort=False).indices if not self.entries.empty else {},
+                    self.entries.groupby('id', sort=False).indices if not self.entries.empty else {},
+                )
+            return self._views
+
+
+class HistoryWriter:
+    """
+    Single writer thread for a HistoryManager.
+
+    Update batches are submitted over a queue; the thread takes everything
+    queued at once, groups it by list and applies each group with one file
+    lock, one journal append and one fsync. Callers get a Future with the
+    (appended_events, existing_ids) result of their own batch.
+    """
+
+    def __init__(self, manager):
+        """
+        Start the writer thread.
+
+        Args:
+            manager (HistoryManager): The manager whose lists are written.
+        """
+        self.manager = manager
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="HistoryWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, new_data, file_path, run=None):
+        """
+        Queue an update batch.
+
+        Args:
+            new_data (pd.DataFrame): Entries as accepted by HistoryManager.update_list.
+            file_path (str): The list's wide CSV path.
+            run (str, optional): Name of the run these entries come from.
+
+        Returns:
+            concurrent.futures.Future: Resolves to (appended_events, existing_ids).
+        """
+        future = Future()
+        self._queue.put((file_path, new_data, run, future))
+        return future
+
+    def in_writer_thread(self):
+        """True when called from the writer thread itself."""
+        return threading.current_thread() is self._thread
+
+    def close(self):
+        """Apply everything already queued, then stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        """Writer loop: drain the queue, coalesce per list, apply."""
+        stopping = False
+        while not stopping:
+            items = [self._queue.get()]
+            # Coalesce everything that queued up while the last batch was written
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                stopping = True
+                items = [item for item in items if item is not None]
+
+            by_list = {}
+            for file_path, new_data, run, future in items:
+                by_list.setdefault(file_path, []).append((new_data, run, future))
+            for file_path, batches in by_list.items():
+                try:
+                    results = self.manager._write_batches(file_path, [(data, run) for data, run, _ in batches])
+                except Exception as e:
+                    for _, _, future in batches:
+                        future.set_exception(e)
+                    continue
+                for (_, _, future), result in zip(batches, results):
+                    future.set_result(result)
+
+
 class HistoryManager:
     """
     Manages the persistence of student lists across program runs.
@@ -30,203 +424,725 @@ class HistoryManager:
       - Good List: students with A/A- grades.
       - Work List: students with D+/D/D-/F grades.
 
-    Lists are stored as CSV files in a dedicated folder. Provides methods to update, retrieve,
-    and check student history in these lists.
+    History is kept as entries, one row per (student, section, list) with the
+    grade, run and time it was recorded; a student is recorded at most once
+    per section on a list. Each list has an entry snapshot and an append-only
+    journal next to it (e.g. good_list.entries.csv and good_list.journal.csv).
+    Updates only append to the journal; compact() folds the journal into the
+    snapshot and rewrites good_list.csv / work_list.csv, the wide one-row-per-
+    student view, as an export. Older folders that only have the wide CSV are
+    read by splitting its grades and sections. Compacting the work list also
+    saves its repeat counters (work_list.repeats.csv), so reopening it only
+    counts the journal.
+
+    Every update made for a run also saves that run's full list under
+    snapshots/<list>/<run>, including students whose entries were already
+    recorded by an earlier run, so any two runs (or labelled snapshots saved
+    with save_snapshot) can be compared with diff_runs. Each update appends
+    one part file to the run's snapshot; compact() folds them into one.
+
+    Writes (journal appends and compaction) hold an OS file lock on
+    <list>.lock and replace files atomically, so threads and processes sharing
+    a folder cannot clobber each other. Readers take no file lock: they read
+    the journal before the snapshot, and entries are unique by key, so a read
+    that overlaps a compaction still sees every entry exactly once.
     """
 
-    def __init__(self, good_file="good_list.csv", work_file="work_list.csv"):
+    def __init__(self, good_file="good_list.csv", work_file="work_list.csv", compact_threshold=10000,
+                 background_writes=False):
         """
         Initialize the HistoryManager with file paths for good and work lists.
 
         Args:
             good_file (str): Filename for the Good List CSV (default: "good_list.csv").
             work_file (str): Filename for the Work List CSV (default: "work_list.csv").
+            compact_threshold (int or None): Compact a list automatically once its
+                journal holds this many events (default 10000); None disables it.
+            background_writes (bool): Route every update through a HistoryWriter
+                thread (default False). update_* calls still return their result.
 
         Side Effects:
             Creates the storage folder if it does not exist.
             Sets up file paths for list storage.
+            Starts the writer thread if background_writes is True.
         """
         self.folder = "historical_lists"
         os.makedirs(self.folder, exist_ok=True)
         self.good_file = os.path.join(self.folder, good_file)
         self.work_file = os.path.join(self.folder, work_file)
+        self.snapshot_dir = os.path.join(self.folder, "snapshots")
+        self.compact_threshold = compact_threshold
+        # file_path -> _ListIndex
+        self._indexes = {}
+        # Serializes writers inside this process; the file lock covers other processes
+        self._write_lock = threading.Lock()
+        self.writer = HistoryWriter(self) if background_writes else None
+
+    def journal_path(self, file_path):
+        """
+        Return the journal file that belongs to a list.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            str: Path of the journal, e.g. good_list.journal.csv.
+        """
+        return os.path.splitext(file_path)[0] + ".journal.csv"
+
+    def entries_path(self, file_path):
+        """
+        Return the entry snapshot file that belongs to a list.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            str: Path of the entry snapshot, e.g. good_list.entries.csv.
+        """
+        return os.path.splitext(file_path)[0] + ".entries.csv"
+
+    def lock_path(self, file_path):
+        """
+        Return the lock file that guards writes to a list.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            str: Path of the lock file, e.g. good_list.lock.
+        """
+        return os.path.splitext(file_path)[0] + ".lock"
+
+    def repeats_path(self, file_path):
+        """
+        Return the file that holds a list's saved repeat counters.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            str: Path of the counters, e.g. work_list.repeats.csv.
+        """
+        return os.path.splitext(file_path)[0] + ".repeats.csv"
+
+    def _list_name(self, file_path):
+        """Name recorded in entries: 'good', 'work' or the file's stem."""
+        if file_path == self.good_file:
+            return 'good'
+        if file_path == self.work_file:
+            return 'work'
+        return os.path.splitext(os.path.basename(file_path))[0]
+
+    def _signature(self, file_path):
+        """Size and mtime of the list's files, to detect outside changes."""
+        signature = []
+        for path in (file_path, self.entries_path(file_path), self.journal_path(file_path)):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _read_wide(self, file_path):
+        """Read a wide history CSV as strings, or an empty frame if there is none."""
+        if not os.path.exists(file_path):
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        try:
+            existing = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            print(f"Warning: History file {file_path} is empty. Creating new structure.")
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        except Exception as e:
+            print(f"Error reading history file {file_path}: {e}. Starting fresh.")
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return existing.reindex(columns=HISTORY_COLUMNS, fill_value='')
+
+    def _explode_wide(self, wide, list_name):
+        """Turn a wide history frame into entries, pairing each section with its grade."""
+        rows = []
+        for record in wide.itertuples(index=False):
+            sections = [section for section in str(record.sections).split(',') if section]
+            grades = [grade for grade in str(record.grades).split(',') if grade]
+            grades += [''] * (len(sections) - len(grades))
+            for section, grade in zip(sections, grades):
+                rows.append((record.id, record.FirstName, record.LastName, list_name, section, grade, '', ''))
+        return pd.DataFrame(rows, columns=ENTRY_COLUMNS)
+
+    def _read_entries(self, file_path):
+        """Read the entry snapshot, falling back to the wide CSV of older folders."""
+        path = self.entries_path(file_path)
+        if os.path.exists(path):
+            try:
+                entries = pd.read_csv(path, dtype=str, keep_default_na=False)
+                return entries.reindex(columns=ENTRY_COLUMNS, fill_value='')
+            except pd.errors.EmptyDataError:
+                return pd.DataFrame(columns=ENTRY_COLUMNS)
+        return self._explode_wide(self._read_wide(file_path), self._list_name(file_path))
+
+    def _read_journal(self, file_path):
+        """
+        Read the journal events of a list.
+
+        A crash while appending can leave a torn last line; rows that are not
+        newline-terminated or do not have every column are ignored.
+        """
+        path = self.journal_path(file_path)
+        rows = []
+        if os.path.exists(path):
+            with open(path, 'r', newline='', encoding='utf-8') as file:
+                text = file.read()
+            lines = text.split('\n')
+            # The piece after the last newline is either empty or a torn write
+            for row in csv.reader(line for line in lines[1:-1] if line):
+                if len(row) == len(ENTRY_COLUMNS):
+                    rows.append(row)
+        return pd.DataFrame(rows, columns=ENTRY_COLUMNS)
+
+    def _load_repeats(self, file_path, entries_stamp):
+        """
+        Read the saved repeat counters of a list.
+
+        Returns None when there are none or they were not counted from the
+        entry snapshot whose (mtime, size) is entries_stamp.
+        """
+        if entries_stamp is None:
+            return None
+        try:
+            with open(self.repeats_path(file_path), 'r', newline='', encoding='utf-8') as file:
+                if file.readline().split() != ['#', 'entries', str(entries_stamp[0]), str(entries_stamp[1])]:
+                    return None
+                counts = pd.read_csv(file, dtype=object, keep_default_na=False)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return None
+        except Exception as e:
+            print(f"Warning: Could not read repeat counters for {file_path}: {e}")
+            return None
+        counts = counts.reindex(columns=REPEAT_COLUMNS, fill_value='')
+        counts = counts.astype({'section_count': int, 'term_count': int})
+        counts.index = counts['id'].to_numpy()
+        return counts
+
+    def _save_repeats(self, file_path, counts):
+        """Save repeat counters, stamped with the entry snapshot they were counted from."""
+        stat = os.stat(self.entries_path(file_path))
 
-    def update_list(self, new_data, file_path):
+        def write(file):
+            file.write(f"# entries {stat.st_mtime_ns} {stat.st_size}\n")
+            counts.to_csv(file, index=False)
+
+        _fsync_write(self.repeats_path(file_path), write)
+
+    def _index(self, file_path):
+        """
+        The list's _ListIndex, re-read only when its files changed on disk.
+
+        The files' size and mtime are checked on every call, so an update made
+        by another HistoryManager or process is picked up on the next read.
+        The work list's repeat counters are loaded from the last compaction
+        and only the journal's entries are counted on top of them.
+        """
+        signature = self._signature(file_path)
+        index = self._indexes.get(file_path)
+        if index is not None and index.signature == signature:
+            return index
+        # Journal before snapshot: a compaction in between moves events into the
+        # snapshot (seen twice, de-duplicated below) instead of losing them
+        journal = self._read_journal(file_path)
+        snapshot = self._read_entries(file_path)
+        entries = pd.concat([snapshot, journal], ignore_index=True)
+        # Enforce the unique key; the first recorded grade for a section wins
+        entries = entries.drop_duplicates(subset=ENTRY_KEY, keep='first')
+
+        counts = None
+        if file_path == self.work_file:
+            counts = self._load_repeats(file_path, signature[1])
+            if counts is None:
+                counts = repeat_counts(entries)
+            else:
+                counts = repeat_counts(entries[entries.index >= len(snapshot)], counts)
+        entries = entries.reset_index(drop=True)
+        index = _ListIndex(signature, entries, len(journal), counts)
+        self._indexes[file_path] = index
+        return index
+
+    def _indexed_list(self, file_path):
+        """The wide view of a list indexed by id."""
+        return self._index(file_path).views()[2]
+
+    def load_list(self, file_path):
+        """
+        Return the wide view of a list: one row per student.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            pd.DataFrame: Columns FirstName, LastName, id, grades, sections (as text).
+        """
+        return self._index(file_path).views()[1].copy()
+
+    def load_entries(self, file_path):
+        """
+        Return every entry of a list: one row per student and section.
+
+        Args:
+            file_path (str): Path to the list's wide CSV.
+
+        Returns:
+            pd.DataFrame: Columns ENTRY_COLUMNS (as text).
+        """
+        return self._index(file_path).views()[0].copy()
+
+    def _append_journal(self, file_path, events):
+        """Append events to a journal and fsync it, creating the journal atomically."""
+        path = self.journal_path(file_path)
+        if not os.path.exists(path):
+            _fsync_write(path, lambda file: csv.writer(file, lineterminator='\n').writerow(ENTRY_COLUMNS))
+
+        with open(path, 'r+b') as file:
+            # Terminate a torn last line so it cannot swallow the next event
+            file.seek(0, os.SEEK_END)
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                needs_newline = file.read(1) != b'\n'
+            else:
+                needs_newline = False
+
+        with open(path, 'a', newline='', encoding='utf-8') as file:
+            if needs_newline:
+                file.write('\n')
+            csv.writer(file, lineterminator='\n').writerows(events[ENTRY_COLUMNS].itertuples(index=False, name=None))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _prepare_events(self, new_data, file_path, run):
+        """Turn a Lists-style DataFrame into journal events."""
+        return pd.DataFrame({
+            'id': new_data['id'].astype(str).to_numpy(),
+            'FirstName': new_data['FirstName'].astype(str).to_numpy() if 'FirstName' in new_data.columns else '',
+            'LastName': new_data['LastName'].astype(str).to_numpy() if 'LastName' in new_data.columns else '',
+            'list': self._list_name(file_path),
+            'section': new_data['section_source'].astype(str).to_numpy(),
+            'grade': new_data['Grade'].astype(str).to_numpy(),
+            'run': new_data['run'].astype(str).to_numpy() if 'run' in new_data.columns else (run or ''),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        }, columns=ENTRY_COLUMNS)
+
+    def _write_batches(self, file_path, batches):
         """
-        Update a CSV file with new student data, tracking grade and section history.
+        Apply update batches to one list with a single locked journal append.
+
+        Args:
+            file_path (str): The list's wide CSV path.
+            batches (list of tuple): (new_data, run) pairs, applied in order.
+
+        Returns:
+            list of tuple: (appended_events, existing_ids) for each batch.
+        """
+        with self._write_lock, _FileLock(self.lock_path(file_path)):
+            # Under the lock: picks up anything another process appended
+            index = self._index(file_path)
+            keys = set()
+            ids = set()
+            results = []
+            to_write = []
+            run_entries = []
+            for new_data, run in batches:
+                if new_data is None or new_data.empty:
+                    results.append((pd.DataFrame(columns=ENTRY_COLUMNS), []))
+                    continue
+                events = self._prepare_events(new_data, file_path, run)
+                run_entries.append(events)
+                existing_ids = [student_id for student_id in events['id']
+                                if student_id in index.ids or student_id in ids]
+
+                # Unique (student, section) per list: drop entries already recorded
+                is_new = [key not in index.keys and key not in keys for key in zip(events['id'], events['section'])]
+                events = events[is_new].drop_duplicates(subset=ENTRY_KEY, keep='first').reset_index(drop=True)
+                keys.update(zip(events['id'], events['section']))
+                ids.update(events['id'])
+                results.append((events, existing_ids))
+                if not events.empty:
+                    to_write.append(events)
+
+            if to_write:
+                events = pd.concat(to_write, ignore_index=True)
+                try:
+                    self._append_journal(file_path, events)
+                except Exception as e:
+                    print(f"Error writing history journal for {file_path}: {e}")
+                    return [(pd.DataFrame(columns=ENTRY_COLUMNS), existing) for _, existing in results]
+                index.append(events, self._signature(file_path))
+
+                if self.compact_threshold is not None and index.journal_rows >= self.compact_threshold:
+                    self._compact_locked(file_path)
+
+            if run_entries:
+                # The entries are already committed to the journal; a failed
+                # snapshot write only costs this run's diff
+                try:
+                    self._save_run_snapshots(file_path, pd.concat(run_entries, ignore_index=True))
+                except Exception as e:
+                    print(f"Warning: Could not save run snapshots for {file_path}: {e}")
+        return results
+
+    def update_list(self, new_data, file_path, run=None):
+        """
+        Record new student entries for a list by appending them to its journal.
+
+        Entries whose (student, section) is already on the list are skipped, so
+        re-running the same run does not duplicate history. With
+        background_writes the batch goes through the writer thread.
 
         Args:
             new_data (pd.DataFrame): DataFrame containing new student records.
                                      Must include 'id', 'Grade', and 'section_source' columns.
-            file_path (str): Path to the CSV file to update.
+                                     A 'run' column, if present, overrides the run argument.
+            file_path (str): Path to the list's wide CSV.
+            run (str, optional): Name of the run these entries come from.
 
         Returns:
-            tuple: (updated_dataframe, list_of_updated_or_existing_ids)
-                   - updated_dataframe: The full DataFrame written back to the CSV.
+            tuple: (appended_events, list_of_updated_or_existing_ids)
+                   - appended_events: DataFrame of the entries written
+                     (columns ENTRY_COLUMNS).
                    - list_of_updated_or_existing_ids: IDs of students who were already in the list
                      (either updated or just present).
         """
-        updated_or_existing_ids = []
-        new_records_list = []
+        if self.writer is not None and not self.writer.in_writer_thread():
+            return self.writer.submit(new_data, file_path, run).result()
+        return self._write_batches(file_path, [(new_data, run)])[0]
 
-        # Define expected columns in the history CSV
-        history_columns = ['FirstName', 'LastName', 'id', 'grades', 'sections']
+    def submit_update(self, new_data, file_path, run=None):
+        """
+        Queue an update without waiting for it (requires background_writes).
 
-        if os.path.exists(file_path):
-            try:
-                existing = pd.read_csv(file_path)
-                # Ensure required columns exist, fill NaN sections/grades with empty string
-                if 'sections' not in existing.columns:
-                    existing['sections'] = ''
-                if 'grades' not in existing.columns:
-                    existing['grades'] = ''
-                existing['sections'] = existing['sections'].fillna('')
-                existing['grades'] = existing['grades'].fillna('')
-                
-                # Ensure 'id' column is of a consistent type (string) for reliable matching
-                existing['id'] = existing['id'].astype(str)
-                new_data['id'] = new_data['id'].astype(str)
+        Args:
+            new_data (pd.DataFrame): As for update_list.
+            file_path (str): The list's wide CSV path (self.good_file or self.work_file).
+            run (str, optional): Name of the run these entries come from.
 
-            except pd.errors.EmptyDataError:
-                print(f"Warning: History file {file_path} is empty. Creating new structure.")
-                existing = pd.DataFrame(columns=history_columns)
-            except Exception as e:
-                print(f"Error reading history file {file_path}: {e}. Starting fresh.")
-                existing = pd.DataFrame(columns=history_columns)
-        else:
-            print(f"🆕 Creating new history file: {file_path}")
-            existing = pd.DataFrame(columns=history_columns)
-
-        # Process each new record
-        for _, new_row in new_data.iterrows():
-            student_id = new_row['id']
-            new_grade = new_row['Grade']
-            new_section = new_row['section_source']
-
-            # Check if student exists
-            match = existing[existing['id'] == student_id]
-
-            if not match.empty:
-                # Student exists, update their record
-                existing_idx = match.index[0]
-                updated_or_existing_ids.append(student_id)
-
-                # Get current history, handle potential NaN/None
-                current_sections_str = str(existing.at[existing_idx, 'sections'])
-                current_grades_str = str(existing.at[existing_idx, 'grades'])
-
-                current_sections = current_sections_str.split(',') if current_sections_str else []
-                current_grades = current_grades_str.split(',') if current_grades_str else []
-
-                # Create a unique identifier for the grade/section pair
-                entry_identifier = f"{new_section}:{new_grade}"
-                
-                # Check if this specific section/grade combo is already recorded
-                # Simple check: is the section already listed? More robust check needed if grade matters per section.
-                # For now, just append if the section isn't listed.
-                # A more complex approach might store pairs like "SEC1:A,SEC2:A-"
-                if new_section not in current_sections:
-                    current_sections.append(new_section)
-                    current_grades.append(new_grade) # Append corresponding grade
-
-                    # Update the DataFrame
-                    existing.at[existing_idx, 'sections'] = ','.join(filter(None, current_sections)) # Filter removes empty strings
-                    existing.at[existing_idx, 'grades'] = ','.join(filter(None, current_grades))
-                # Optional: Add logic here if you want to update the grade for an *existing* section entry
+        Returns:
+            concurrent.futures.Future: Resolves to update_list's result.
 
-            else:
-                # Student is new, create a new record
-                new_record = {
-                    'FirstName': new_row.get('FirstName', ''), # Use .get for safety
-                    'LastName': new_row.get('LastName', ''),
-                    'id': student_id,
-                    'grades': new_grade,
-                    'sections': new_section
-                }
-                # Ensure the new record has all necessary columns, even if empty
-                for col in history_columns:
-                    if col not in new_record:
-                        new_record[col] = ''
-                new_records_list.append(new_record)
-
-        # Combine existing (potentially updated) data with completely new records
-        if new_records_list:
-            new_records_df = pd.DataFrame(new_records_list, columns=history_columns)
-            updated = pd.concat([existing, new_records_df], ignore_index=True)
-        else:
-            updated = existing
+        Raises:
+            RuntimeError: If the manager was created without background_writes.
+        """
+        if self.writer is None:
+            raise RuntimeError("submit_update needs HistoryManager(background_writes=True).")
+        return self.writer.submit(new_data, file_path, run)
+
+    def close(self):
+        """Finish queued background writes and stop the writer thread, if any."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def compact(self, file_path=None):
+        """
+        Fold a list's journal into its entry snapshot, rewrite the wide CSV
+        view and start an empty journal.
+
+        Runs under the list's file lock. Each file is replaced atomically, and
+        the journal is reset last. If the process stops in between, the
+        journal is replayed onto the new snapshot on the next read; replaying
+        is harmless because of the unique (student, section, list) key.
 
-        # Ensure final DataFrame has the correct columns in order
-        updated = updated.reindex(columns=history_columns)
-        
-        # Save the updated DataFrame
+        Args:
+            file_path (str, optional): List to compact; both lists if None.
+
+        Returns:
+            pd.DataFrame or None: The compacted wide view (None when compacting both).
+        """
+        if file_path is None:
+            self.compact(self.good_file)
+            self.compact(self.work_file)
+            return None
+        with self._write_lock, _FileLock(self.lock_path(file_path)):
+            return self._compact_locked(file_path)
+
+    def _compact_locked(self, file_path):
+        """compact() for one list; the caller holds the write locks."""
+        index = self._index(file_path)
+        entries, wide = index.views()[:2]
+        _fsync_write(self.entries_path(file_path), lambda file: entries.to_csv(file, index=False))
+        _fsync_write(file_path, lambda file: wide.to_csv(file, index=False))
+        journal = self.journal_path(file_path)
+        if os.path.exists(journal):
+            _fsync_write(journal, lambda file: csv.writer(file, lineterminator='\n').writerow(ENTRY_COLUMNS))
+        with index.lock:
+            index.signature = self._signature(file_path)
+            index.journal_rows = 0
+            counts = index.counts
+        if counts is not None:
+            try:
+                self._save_repeats(file_path, counts)
+            except Exception as e:
+                print(f"Warning: Could not save repeat counters for {file_path}: {e}")
         try:
-            updated.to_csv(file_path, index=False)
+            self._compact_snapshots(self._list_name(file_path))
         except Exception as e:
-            print(f"Error writing updated history to {file_path}: {e}")
-            # Decide how to handle write error - maybe return existing data?
-            return existing, updated_or_existing_ids
+            print(f"Warning: Could not compact run snapshots for {file_path}: {e}")
+        return wide.copy()
+
+    def _snapshot_name(self, list_name, label):
+        """Table name of a snapshot inside snapshot_dir."""
+        return os.path.join(list_name, str(label).replace(os.sep, '_'))
+
+    def _save_run_snapshots(self, file_path, events):
+        """
+        Append this update's entries to the snapshot of each run they came from.
+
+        Each update adds one part file per run, so saving costs O(new rows);
+        load_snapshot merges the parts and compaction folds them together.
+        """
+        import columnar_store
+
+        list_name = self._list_name(file_path)
+        for run, run_events in events.groupby('run', sort=False):
+            if not run:
+                continue
+            columnar_store.append_table(run_events[SNAPSHOT_COLUMNS].reset_index(drop=True),
+                                        self.snapshot_dir, self._snapshot_name(list_name, run))
+
+    def _write_snapshot(self, list_name, label, entries):
+        """Replace a snapshot with one part file (the new file is in place before the old ones go)."""
+        import columnar_store
+        columnar_store.write_table(entries.reindex(columns=SNAPSHOT_COLUMNS).reset_index(drop=True),
+                                   self.snapshot_dir, self._snapshot_name(list_name, label), partition_by=())
+
+    def _compact_snapshots(self, list_name):
+        """Fold the part files of each snapshot of a list into one; the caller holds the write locks."""
+        for label in self.list_snapshots(list_name):
+            directory = os.path.join(self.snapshot_dir, self._snapshot_name(list_name, label))
+            if len(os.listdir(directory)) > 1:
+                self._write_snapshot(list_name, label, self.load_snapshot(label, list_name))
+
+    def save_snapshot(self, label, list_name=None):
+        """
+        Save the current contents of a list under a label, to diff against later.
 
-        return updated, updated_or_existing_ids
+        Args:
+            label (str): Snapshot name, e.g. "before-fall-review".
+            list_name (str, optional): 'good' or 'work'; both lists if None.
+        """
+        files = {'good': self.good_file, 'work': self.work_file}
+        for name in ([list_name] if list_name is not None else ['good', 'work']):
+            # Under the write locks, so an update's appended part is not replaced
+            with self._write_lock, _FileLock(self.lock_path(files[name])):
+                self._write_snapshot(name, label, self.get_entries(name))
+
+    def list_snapshots(self, list_name):
+        """
+        Return the labels of the runs and snapshots saved for a list.
+
+        Args:
+            list_name (str): 'good' or 'work'.
+
+        Returns:
+            list of str: Snapshot labels, sorted.
+        """
+        directory = os.path.join(self.snapshot_dir, list_name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+    def load_snapshot(self, label, list_name):
+        """
+        Load a run or labelled snapshot of a list.
+
+        Runs recorded before snapshots existed fall back to the entries that
+        run contributed to the history.
+
+        Args:
+            label (str): Run name or snapshot label.
+            list_name (str): 'good' or 'work'.
+
+        Returns:
+            pd.DataFrame: Columns SNAPSHOT_COLUMNS (empty if nothing is known).
+        """
+        import columnar_store
+        snapshot = columnar_store.read_table(self.snapshot_dir, self._snapshot_name(list_name, label))
+        if not snapshot.empty:
+            # Parts are read oldest first; a later update of a section wins
+            snapshot = snapshot.drop_duplicates(subset=['id', 'section'], keep='last')
+            return snapshot.reindex(columns=SNAPSHOT_COLUMNS).reset_index(drop=True)
+        entries = self.get_entries(list_name)
+        return entries[entries['run'] == str(label)].reindex(columns=SNAPSHOT_COLUMNS).reset_index(drop=True)
+
+    def diff_runs(self, before, after, list_name='work'):
+        """
+        Compare a list between two runs or snapshots.
+
+        Args:
+            before (str): Earlier run name or snapshot label, e.g. "SECONDRUN".
+            after (str): Later run name or snapshot label, e.g. "SPRING25".
+            list_name (str): 'good' or 'work' (default 'work').
 
-    def update_good_list(self, good_list_data):
+        Returns:
+            dict: 'added', 'removed' and 'changed' DataFrames (see diff_entries).
         """
-        Update the Good List CSV with new student data, tracking history.
+        return diff_entries(self.load_snapshot(before, list_name), self.load_snapshot(after, list_name))
+
+    def update_good_list(self, good_list_data, run=None):
+        """
+        Update the Good List with new student data, tracking history.
 
         Args:
             good_list_data (pd.DataFrame): DataFrame of students to add/update in the Good List.
                                            Must include 'id', 'Grade', 'section_source'.
+            run (str, optional): Name of the run these entries come from.
 
         Returns:
-            tuple: (updated_dataframe, list_of_updated_or_existing_ids)
+            tuple: (appended_events, list_of_updated_or_existing_ids)
         """
-        # Remove the section_name argument, data comes from the dataframe
-        return self.update_list(good_list_data, self.good_file)
+        return self.update_list(good_list_data, self.good_file, run)
 
-    def update_work_list(self, work_list_data):
+    def update_work_list(self, work_list_data, run=None):
         """
-        Update the Work List CSV with new student data, tracking history.
+        Update the Work List with new student data, tracking history.
 
         Args:
             work_list_data (pd.DataFrame): DataFrame of students to add/update in the Work List.
                                            Must include 'id', 'Grade', 'section_source'.
+            run (str, optional): Name of the run these entries come from.
 
         Returns:
-            tuple: (updated_dataframe, list_of_updated_or_existing_ids)
+            tuple: (appended_events, list_of_updated_or_existing_ids)
         """
-        # Remove the section_name argument, data comes from the dataframe
-        return self.update_list(work_list_data, self.work_file)
+        return self.update_list(work_list_data, self.work_file, run)
+
+    def _has_history(self, file_path):
+        """True if any of the list's files exist."""
+        return any(os.path.exists(path) for path in
+                   (file_path, self.entries_path(file_path), self.journal_path(file_path)))
 
     def get_good_list(self):
         """
-        Retrieve the current Good List from CSV.
+        Retrieve the current Good List (wide view, one row per student).
 
         Returns:
             pd.DataFrame: DataFrame containing the Good List.
-                - If the file does not exist, returns an empty DataFrame.
+                - If the list has never been written, returns an empty DataFrame.
 
         Side Effects:
-            Reads from the Good List CSV file if it exists.
+            Reads the Good List files if they changed since the last read.
         """
-        if os.path.exists(self.good_file):
-            return pd.read_csv(self.good_file)
+        if self._has_history(self.good_file):
+            return self.load_list(self.good_file)
         return pd.DataFrame()
 
     def get_work_list(self):
         """
-        Retrieve the current Work List from CSV.
+        Retrieve the current Work List (wide view, one row per student).
 
         Returns:
             pd.DataFrame: DataFrame containing the Work List.
-                - If the file does not exist, returns an empty DataFrame.
+                - If the list has never been written, returns an empty DataFrame.
 
         Side Effects:
-            Reads from the Work List CSV file if it exists.
+            Reads the Work List files if they changed since the last read.
         """
-        if os.path.exists(self.work_file):
-            return pd.read_csv(self.work_file)
+        if self._has_history(self.work_file):
+            return self.load_list(self.work_file)
         return pd.DataFrame()
 
+    def get_entries(self, list_name=None):
+        """
+        Retrieve history entries (one row per student, section and list).
+
+        Args:
+            list_name (str, optional): 'good' or 'work'; both lists if None.
+
+        Returns:
+            pd.DataFrame: Columns ENTRY_COLUMNS.
+        """
+        files = {'good': self.good_file, 'work': self.work_file}
+        if list_name is not None:
+            return self.load_entries(files[list_name])
+        return pd.concat([self.load_entries(path) for path in files.values()], ignore_index=True)
+
+    def students_in_section(self, section, list_name=None):
+        """
+        Return the entries of every student recorded for a section.
+
+        Args:
+            section (str): Section file name, e.g. "COMSC110.01S25.SEC".
+            list_name (str, optional): 'good' or 'work'; both lists if None.
+
+        Returns:
+            pd.DataFrame: Matching entries (columns ENTRY_COLUMNS).
+        """
+        files = {'good': self.good_file, 'work': self.work_file}
+        names = [list_name] if list_name is not None else list(files)
+        frames = []
+        for name in names:
+            entries, _, _, by_section, _ = self._index(files[name]).views()
+            positions = by_section.get(section)
+            if positions is not None:
+                frames.append(entries.iloc[positions])
+        if not frames:
+            return pd.DataFrame(columns=ENTRY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def student_entries(self, student_id, list_name=None):
+        """
+        Return every entry recorded for one student.
+
+        Args:
+            student_id: The student ID to look up.
+            list_name (str, optional): 'good' or 'work'; both lists if None.
+
+        Returns:
+            pd.DataFrame: Matching entries (columns ENTRY_COLUMNS).
+        """
+        files = {'good': self.good_file, 'work': self.work_file}
+        names = [list_name] if list_name is not None else list(files)
+        frames = []
+        for name in names:
+            entries, _, _, _, by_student = self._index(files[name]).views()
+            positions = by_student.get(str(student_id))
+            if positions is not None:
+                frames.append(entries.iloc[positions])
+        if not frames:
+            return pd.DataFrame(columns=ENTRY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def repeat_students(self, min_count=2, by='section', list_name='work'):
+        """
+        Return the students recorded on a list in at least min_count sections or terms.
+
+        The work list is answered from its repeat counters, which are saved at
+        each compaction and kept up to date as entries are added; other lists
+        are counted from their entries on request.
+
+        Args:
+            min_count (int): Minimum number of distinct appearances (default 2).
+            by (str): Count distinct 'section's or distinct 'term's (default 'section').
+            list_name (str): 'good' or 'work' (default 'work').
+
+        Returns:
+            pd.DataFrame: One row per student with columns id, FirstName, LastName,
+                section_count, term_count and comma-separated sections, terms and
+                grades, most appearances first.
+
+        Raises:
+            ValueError: If by is not 'section' or 'term'.
+        """
+        if by not in ('section', 'term'):
+            raise ValueError(f"by must be 'section' or 'term', not {by!r}")
+        files = {'good': self.good_file, 'work': self.work_file}
+        min_count = max(int(min_count), 1)
+        index = self._index(files[list_name])
+        if index.counts is not None:
+            repeats = index.repeats(min_count, by)
+        else:
+            counts = repeat_counts(index.views()[0])
+            repeats = counts[counts[f'{by}_count'] >= min_count]
+        sort_by = ['section_count', 'term_count'] if by == 'section' else ['term_count', 'section_count']
+        return repeats[REPEAT_COLUMNS].sort_values(sort_by + ['id'], ascending=[False, False, True]).reset_index(drop=True)
+
     def check_student_history(self, student_id):
         """
         Check if a student has previously appeared on the Good or Work Lists.
@@ -242,7 +1158,7 @@ class HistoryManager:
                 - 'work_details' (dict): {'grades': str, 'sections': str} if on work list, else None
 
         Side Effects:
-            Reads from the Good and Work List CSV files if they exist.
+            Reads the Good and Work List files if they changed since the last lookup.
         """
         history = {
             'good_list': False,
@@ -252,34 +1168,46 @@ class HistoryManager:
         }
         student_id_str = str(student_id) # Ensure comparison is string-based
 
-        if os.path.exists(self.good_file):
+        for key, file_path in (('good', self.good_file), ('work', self.work_file)):
             try:
-                good_list = pd.read_csv(self.good_file)
-                good_list['id'] = good_list['id'].astype(str) # Ensure consistent type
-                match = good_list[good_list['id'] == student_id_str]
-                if not match.empty:
-                    history['good_list'] = True
-                    details = match.iloc[0]
-                    history['good_details'] = {
+                current = self._indexed_list(file_path)
+                if student_id_str in current.index:
+                    history[f'{key}_list'] = True
+                    details = current.loc[student_id_str]
+                    history[f'{key}_details'] = {
                         'grades': details.get('grades', ''),
                         'sections': details.get('sections', '')
                     }
             except Exception as e:
-                print(f"Error reading good list for history check: {e}")
-
-        if os.path.exists(self.work_file):
-            try:
-                work_list = pd.read_csv(self.work_file)
-                work_list['id'] = work_list['id'].astype(str) # Ensure consistent type
-                match = work_list[work_list['id'] == student_id_str]
-                if not match.empty:
-                    history['work_list'] = True
-                    details = match.iloc[0]
-                    history['work_details'] = {
-                        'grades': details.get('grades', ''),
-                        'sections': details.get('sections', '')
-                    }
-            except Exception as e:
-                print(f"Error reading work list for history check: {e}")
+                print(f"Error reading {key} list for history check: {e}")
 
         return history
+
+    def check_students(self, students):
+        """
+        Look up Good and Work List history for a whole roster in one call.
+
+        Args:
+            students: Iterable of student IDs, or a DataFrame with an 'id' (or 'ID')
+                      column such as the output of Lists.goodList or readSEC.
+
+        Returns:
+            pd.DataFrame: The roster (or a frame with an 'id' column) plus the columns
+                'good_list', 'work_list' (bool), 'good_grades', 'good_sections',
+                'work_grades' and 'work_sections' ('' when not on that list).
+        """
+        if isinstance(students, pd.DataFrame):
+            roster = students.copy()
+            id_col = 'id' if 'id' in roster.columns else 'ID'
+            ids = roster[id_col].astype(str)
+        else:
+            ids = pd.Series([str(student_id) for student_id in students], dtype=object)
+            roster = pd.DataFrame({'id': ids})
+
+        for key, file_path in (('good', self.good_file), ('work', self.work_file)):
+            current = self._indexed_list(file_path)
+            matches = current.reindex(ids.to_numpy())
+            roster[f'{key}_list'] = ids.isin(current.index).to_numpy()
+            roster[f'{key}_grades'] = matches['grades'].fillna('').to_numpy()
+            roster[f'{key}_sections'] = matches['sections'].fillna('').to_numpy()
+        return roster
@@ -1,27 +1,22 @@
 # import
 import os
 import tkinter as tk
-import sv_ttk as sv
-from pandastable import Table, TableModel, config
-from tkinter import filedialog
-from GoodAndBadList import Lists
+from tkinter import filedialog, messagebox, ttk
 import run_parser
 #global vars
 filepath = ""
-options = config.load_options()
+#pandastable options, loaded with the first table (see get_options)
+options = None
 bigfont = ("Arial",18,"bold")
 buttonfont = ("Arial",11)
 #
 
-#new class
-class gradeGUI(tk.Tk):
-    #init function for class gradegui
-    def __init__(self,*args,**kwargs):
-        #init for class
-        tk.Tk.__init__(self,*args,**kwargs)
-        #set theme
-        sv.set_theme("dark")
-        #table options
+#load the table options the first time a table is shown
+def get_options():
+    global options
+    if options is None:
+        from pandastable import config
+        options = config.load_options()
         options.update({
         'cellbackgr': '#2b2b2b',
         'textcolor': '#ffffff',
@@ -34,20 +29,25 @@ class gradeGUI(tk.Tk):
         'colheaderfg': '#ffffff',
         'fontsize': 14,
         })
+    return options
+
+#new class
+class gradeGUI(tk.Tk):
+    #init function for class gradegui
+    def __init__(self,*args,**kwargs):
+        #init for class
+        tk.Tk.__init__(self,*args,**kwargs)
+        #set theme
+        import sv_ttk as sv
+        sv.set_theme("dark")
         #new container
-        container = tk.Frame(self)
-        container.pack(side = 'top',fill = 'both',expand = True)
+        self.container = tk.Frame(self)
+        self.container.pack(side = 'top',fill = 'both',expand = True)
         #style
-        style = tk.ttk.Style()
+        style = ttk.Style()
         style.configure("TButton", font=buttonfont,padding=(10, 20))
-        #new empty frames
+        #new empty frames, each page is built the first time it is shown
         self.frames = {}
-        #get all of the page layouts
-        for F in (HomePage,DashBoard,SectionAverage,BottomPerformers,TopPerformers):
-            frame = F(container,self)
-            self.frames[F] = frame
-            #pack the frame
-            frame.pack(fill="both", expand=True)
 
         #show the homepage
         self.show_frame(HomePage)
@@ -56,6 +56,9 @@ class gradeGUI(tk.Tk):
         #hide non active frames
         for frame in self.frames.values():
             frame.pack_forget()
+        #build the page on first navigation
+        if cont not in self.frames:
+            self.frames[cont] = cont(self.container,self)
         #if need to load data
         if cont in (TopPerformers, BottomPerformers, SectionAverage):
             self.frames[cont].load_data()
@@ -69,7 +72,10 @@ class gradeGUI(tk.Tk):
             #nothing
             print("Cancelled")
         else:
-            df.to_html(open(os.path.join(folder_path,"gradeExport.html"), 'w'))
+            from exporter import export_in_background
+            #stream the table to the file on a worker thread
+            export_path = os.path.join(folder_path,"gradeExport.html")
+            export_in_background(df, export_path, on_done=lambda rows, error: print(f"Export failed: {error}" if error else f"Exported {rows} rows to {export_path}"), index=True)
 
 #homepage class
 class HomePage(tk.Frame):
@@ -80,7 +86,7 @@ class HomePage(tk.Frame):
         #apply grid
         homepagelabel.pack()
         #open file dialog
-        openfilebutton = tk.ttk.Button(self,text="Select Your Run File",command=lambda:self.getFilePath(controller),style="TButton")
+        openfilebutton = ttk.Button(self,text="Select Your Run File",command=lambda:self.getFilePath(controller),style="TButton")
         openfilebutton.pack(padx=10, pady=10)
     #get the file path
     def getFilePath(self,controller):
@@ -94,7 +100,7 @@ class HomePage(tk.Frame):
             controller.show_frame(DashBoard)
         #catch
         except:
-            tk.messagebox.showerror("Please choose a .run file to get started") 
+            messagebox.showerror("Please choose a .run file to get started") 
 
 
 #dashboard
@@ -105,9 +111,9 @@ class DashBoard(tk.Frame):
         dashboardlabel= tk.Label(self,text="Here Is Your Dashboard", font=bigfont,padx=20,pady=30)
         dashboardlabel.pack()
         #buttons to go to different tabs
-        lowestperformersbutton = tk.ttk.Button(self,text="See Work List",command=lambda:controller.show_frame(BottomPerformers),style="TButton")
-        topperformersbutton = tk.ttk.Button(self,text="See Good List",command=lambda:controller.show_frame(TopPerformers),style="TButton")
-        sectionaveragebutton = tk.ttk.Button(self,text="See Section Averages",command=lambda:controller.show_frame(SectionAverage),style="TButton")
+        lowestperformersbutton = ttk.Button(self,text="See Work List",command=lambda:controller.show_frame(BottomPerformers),style="TButton")
+        topperformersbutton = ttk.Button(self,text="See Good List",command=lambda:controller.show_frame(TopPerformers),style="TButton")
+        sectionaveragebutton = ttk.Button(self,text="See Section Averages",command=lambda:controller.show_frame(SectionAverage),style="TButton")
         #pack the buttons
         lowestperformersbutton.pack(padx=10, pady=10)
         topperformersbutton.pack(padx=10, pady=10)
@@ -121,11 +127,11 @@ class SectionAverage(tk.Frame):
         button_frame = tk.Frame(self)
         button_frame.pack(side=tk.TOP, fill=tk.X)
         #pack the home button
-        homebutton = tk.ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
+        homebutton = ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
         homebutton.pack(side=tk.LEFT)
         #export button
         # Initialize with sample data
-        exportbutton = tk.ttk.Button(button_frame,text="Export", command=lambda: controller.exportToHtml(self.table))
+        exportbutton = ttk.Button(button_frame,text="Export", command=lambda: controller.exportToHtml(self.table))
         exportbutton.pack(side=tk.LEFT)
         #define the button list frame 
         self.button_list_frame = None
@@ -139,13 +145,14 @@ class SectionAverage(tk.Frame):
         self.button_list_frame.pack(pady=20)
         for i in run_parser.runReader(filepath):
             #add the button
-            groupbutton = tk.ttk.Button(self.button_list_frame,text=os.path.basename(i),command=lambda: self.loadtable())
+            groupbutton = ttk.Button(self.button_list_frame,text=os.path.basename(i),command=lambda: self.loadtable())
             groupbutton.pack(side=tk.LEFT)
     #load the table
     def loadtable(self,groupdf):
+        from pandastable import Table, config
         #create the new table
-        self.table = Table(self.table_frame, dataframe=groupdf, showtoolbar=False, showstatusbar=False, editable=False, config=options)
-        config.apply_options(options, self.table)
+        self.table = Table(self.table_frame, dataframe=groupdf, showtoolbar=False, showstatusbar=False, editable=False, config=get_options())
+        config.apply_options(get_options(), self.table)
         self.table.autoResizeColumns()
         self.table.setRowHeight(50)
         self.table.show() 
@@ -159,11 +166,11 @@ class TopPerformers(tk.Frame):
         button_frame = tk.Frame(self)
         button_frame.pack(side=tk.TOP, fill=tk.X)
         #pack the home button
-        homebutton = tk.ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
+        homebutton = ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
         homebutton.pack(side=tk.LEFT)
         #export button
         # Initialize with sample data
-        exportbutton = tk.ttk.Button(button_frame, text="Export", command=lambda: controller.exportToHtml(self.df))
+        exportbutton = ttk.Button(button_frame, text="Export", command=lambda: controller.exportToHtml(self.df))
         exportbutton.pack(side=tk.LEFT)
         #display the data frame
         # create a container
@@ -174,6 +181,8 @@ class TopPerformers(tk.Frame):
 
     def load_data(self):
         global filepath
+        from pandastable import Table, TableModel, config
+        from GoodAndBadList import Lists
         #get data
         if filepath:
             self.df = Lists.goodList(filepath)
@@ -184,8 +193,8 @@ class TopPerformers(tk.Frame):
         if self.table:
             self.table.destroy()
         #create the new table
-        self.table = Table(self.table_frame, dataframe=self.df, showtoolbar=False, showstatusbar=False, editable=False, config=options)
-        config.apply_options(options, self.table)
+        self.table = Table(self.table_frame, dataframe=self.df, showtoolbar=False, showstatusbar=False, editable=False, config=get_options())
+        config.apply_options(get_options(), self.table)
         self.table.autoResizeColumns()
         self.table.setRowHeight(50)
         self.table.show() 
@@ -199,10 +208,10 @@ class BottomPerformers(tk.Frame):
         button_frame = tk.Frame(self)
         button_frame.pack(side=tk.TOP, fill=tk.X)
         #pack the home button
-        homebutton = tk.ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
+        homebutton = ttk.Button(button_frame, text="Home", command=lambda: controller.show_frame(DashBoard))
         homebutton.pack(side=tk.LEFT)
         #export button
-        exportbutton = tk.ttk.Button(button_frame, text="Export", command=lambda: controller.exportToHtml(self.df))
+        exportbutton = ttk.Button(button_frame, text="Export", command=lambda: controller.exportToHtml(self.df))
         exportbutton.pack(side=tk.LEFT)
         # create a container
         self.table_frame = tk.Frame(self)
@@ -212,6 +221,8 @@ class BottomPerformers(tk.Frame):
 
     def load_data(self):
         global filepath
+        from pandastable import Table, TableModel, config
+        from GoodAndBadList import Lists
         #get data
         if filepath:
             self.df = Lists.badList(filepath)
@@ -222,15 +233,16 @@ class BottomPerformers(tk.Frame):
         if self.table:
             self.table.destroy()
         #create the new table
-        self.table = Table(self.table_frame, dataframe=self.df, showtoolbar=False, showstatusbar=False, editable=False, config=options)
-        config.apply_options(options, self.table)
+        self.table = Table(self.table_frame, dataframe=self.df, showtoolbar=False, showstatusbar=False, editable=False, config=get_options())
+        config.apply_options(get_options(), self.table)
         self.table.autoResizeColumns()
         self.table.setRowHeight(50)
         self.table.show()
 
 
 #run gui
-gradeGUI().mainloop()
+if __name__ == "__main__":
+    gradeGUI().mainloop()
 
 
 
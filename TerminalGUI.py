@@ -21,12 +21,10 @@ planning on do them morning of the 29th (project work day)
 
 import os
 import sys
+import importlib.util
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from pathlib import Path
-import sv_ttk as sv
-import pandas as pd
-from pandastable import Table, TableModel, config
 import json
 import threading
 import queue
@@ -35,16 +33,13 @@ import queue
 import datetime
 import traceback
 
-# Attempt to import project modules, handle potential import errors
-try:
-    from run_parser import runReader
-    from grp_parser import grpReader
-    from FileReader import fileReader
-    from GoodAndBadList import Lists
-    from History import HistoryManager
-    from zscore_calculator import ZScoreCalculator
-except ImportError as e:
-    messagebox.showerror("Import Error", f"Failed to import required module: {e}\nMake sure all project files are in the correct location.")
+# pandas, pandastable and the project modules (which pull in pandas) are
+# imported inside the methods that use them so the window opens without
+# paying for them. Only check here that the project modules can be found.
+PROJECT_MODULES = ("run_parser", "grp_parser", "FileReader", "GoodAndBadList", "History", "zscore_calculator")
+missing_modules = [name for name in PROJECT_MODULES if importlib.util.find_spec(name) is None]
+if missing_modules:
+    messagebox.showerror("Import Error", f"Failed to find required module(s): {', '.join(missing_modules)}\nMake sure all project files are in the correct location.")
     sys.exit(1)
 
 # Add debug utility function
@@ -53,7 +48,9 @@ def debug_print(category, message, data=None):
     timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
     print(f"[DEBUG][{timestamp}][{category}] {message}")
     if data is not None:
-        if isinstance(data, pd.DataFrame):
+        # Only a DataFrame can be passed here if pandas is already loaded
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(data, pd.DataFrame):
             print(f"  DataFrame info: {len(data)} rows, {list(data.columns)} columns")
             print(f"  Column types: {data.dtypes}")
             if 'id' in data.columns or 'ID' in data.columns:
@@ -68,6 +65,7 @@ class TerminalGUIApp(tk.Tk):
         super().__init__()
         self.title("PGUA^2 Grade Analyzer - GUI")
         self.geometry("1000x700")
+        import sv_ttk as sv
         sv.set_theme("dark")
         self.current_theme = "dark"
 
@@ -79,18 +77,17 @@ class TerminalGUIApp(tk.Tk):
         self.bottom_performers = None
         self.sec_data = None
         self.zscore_results = None
-        self.history = HistoryManager()
-        debug_print("INIT", "HistoryManager initialized", self.history)
+        self._zscore_cache = None  # Last analysis, re-used for threshold changes
+        self._rollup_store = None  # Course/department rollups, refreshed incrementally
+        self._history = None  # Created on first use, see the history property
+        # Background prefetch of a run as soon as it is selected (optional)
+        self.prefetch_enabled = True
+        self._prefetcher = None
         self.recent_files = self._load_recent_files()
         self.search_var = tk.StringVar()
         
-        # Configure pandastable style for dark theme
-        self.options = config.load_options()
-        self.options.update({
-            'cellbackgr': '#2b2b2b', 'textcolor': '#ffffff', 'grid_color': '#444444',
-            'rowselectedcolor': '#44475a', 'colheadercolor': '#1e1e1e',
-            'colheaderfg': '#ffffff', 'fontsize': 10, 'rowheight': 22
-        })
+        # pandastable options are loaded with the first table, see the options property
+        self._options = None
 
         # Main layout frames
         self.menu_frame = ttk.Frame(self, padding="10")
@@ -141,6 +138,54 @@ class TerminalGUIApp(tk.Tk):
         self.task_queue = queue.Queue()
         self.check_queue()
 
+    @property
+    def history(self):
+        """HistoryManager for the Good/Work lists, created on first use."""
+        if self._history is None:
+            from History import HistoryManager
+            # Updates can come from run_in_thread and the Tk thread at once, so
+            # funnel them through the single history writer thread
+            self._history = HistoryManager(background_writes=True)
+            debug_print("INIT", "HistoryManager initialized", self._history)
+        return self._history
+
+    @property
+    def options(self):
+        """pandastable options for the current theme, loaded on first use."""
+        if self._options is None:
+            from pandastable import config
+            self._options = config.load_options()
+            self._options.update({
+                'cellbackgr': '#2b2b2b', 'textcolor': '#ffffff', 'grid_color': '#444444',
+                'rowselectedcolor': '#44475a', 'colheadercolor': '#1e1e1e',
+                'colheaderfg': '#ffffff', 'fontsize': 10, 'rowheight': 22
+            })
+        return self._options
+
+    def _start_prefetch(self):
+        """Start parsing the loaded run in the background, cancelling any earlier prefetch."""
+        if not self.prefetch_enabled or not self.run_file:
+            return
+        if self._prefetcher is None:
+            from prefetch import RunPrefetcher
+
+            # Callbacks run on the worker thread, so hand them to the Tk thread via the queue
+            def on_progress(run_file, done, total):
+                self.task_queue.put(lambda: self.status_var.set(f"Prefetching {os.path.basename(run_file)}: {done}/{total} sections"))
+
+            def on_done(run_file):
+                self.task_queue.put(lambda: self.status_var.set(f"Loaded: {os.path.basename(run_file)} (prefetched)"))
+
+            self._prefetcher = RunPrefetcher(on_progress=on_progress, on_done=on_done)
+        debug_print("PREFETCH", "Starting background prefetch", {"run_file": self.run_file})
+        self._prefetcher.start(self.run_file)
+
+    def _prefetched(self, key):
+        """Return a prefetched result for the loaded run, or None if it is not ready."""
+        if self._prefetcher is None or not self.run_file:
+            return None
+        return self._prefetcher.get(self.run_file, key)
+
     def _create_menu(self):
         """Creates the buttons in the left-side menu frame."""
         ttk.Label(self.menu_frame, text="Menu", font=("Arial", 16, "bold")).pack(pady=10)
@@ -151,10 +196,12 @@ class TerminalGUIApp(tk.Tk):
             ("Display Sections (Ctrl+S)", self.display_sections),
             ("Top Performers (Ctrl+T)", lambda: self.display_performers(top=True)),
             ("Bottom Performers (Ctrl+B)", lambda: self.display_performers(top=False)),
+            ("Ranked Performers", self.display_ranked_performers),
             ("Export Data (Ctrl+E)", self.export_data),
             ("Read SEC File", self.read_sec_file),
             ("Z-Score Analysis (Ctrl+Z)", self.perform_zscore),
             ("Manage History", self.manage_history),
+            ("Course Rollups", self.display_rollups),
             ("Auto-Process (Ctrl+A)", self.auto_process),
             ("Help (F1)", self.show_help),
             ("Exit", self.quit)
@@ -199,6 +246,7 @@ class TerminalGUIApp(tk.Tk):
         self.zscore_results = None
         self._clear_display()
         self.status_var.set(f"Loaded: {os.path.basename(file_path)}")
+        self._start_prefetch()
                 
     def _load_recent_files(self):
         """Load recent files from JSON file"""
@@ -251,6 +299,7 @@ class TerminalGUIApp(tk.Tk):
             info_frame.pack(fill=tk.X, pady=5)
             ttk.Label(info_frame, text=f"Rows: {len(df)}, Columns: {len(df.columns)}").pack(side=tk.LEFT, padx=5)
             
+        from pandastable import Table, config
         table_frame = ttk.Frame(self.display_frame)
         table_frame.pack(fill=tk.BOTH, expand=True)
         self.table = Table(table_frame, dataframe=df, showtoolbar=True, showstatusbar=True, editable=False)
@@ -299,6 +348,7 @@ class TerminalGUIApp(tk.Tk):
 
     def toggle_theme(self):
         """Toggle between light and dark theme"""
+        import sv_ttk as sv
         if self.current_theme == "dark":
             sv.set_theme("light")
             self.current_theme = "light"
@@ -318,6 +368,7 @@ class TerminalGUIApp(tk.Tk):
             
         # Update table if exists
         if self.table:
+            from pandastable import config
             config.apply_options(self.options, self.table)
             self.table.redraw()
             
@@ -334,6 +385,7 @@ class TerminalGUIApp(tk.Tk):
         help_window = tk.Toplevel(self)
         help_window.title("PGUA² Grade Analyzer Help")
         help_window.geometry("600x500")
+        import sv_ttk as sv
         sv.set_theme(self.current_theme)
         
         help_text = """
@@ -427,6 +479,7 @@ class TerminalGUIApp(tk.Tk):
                 self.zscore_results = None
                 self._clear_display() # Clear display after loading new file
                 self.status_var.set(f"Loaded: {os.path.basename(self.run_file)}")
+                self._start_prefetch()
             else:
                 self._show_message("Error", "Invalid file type. Please select a .run or .run.txt file.", "error")
                 self.run_file = None
@@ -436,8 +489,9 @@ class TerminalGUIApp(tk.Tk):
         if not self.run_file:
             self._show_message("Error", "Please load a RUN file first.", "error")
             return
+        from run_parser import runReader
         try:
-            self.grp_files = runReader(self.run_file)
+            self.grp_files = self._prefetched('grp_files') or runReader(self.run_file)
             self._clear_display()
             ttk.Label(self.display_frame, text="Groups Found:", font=("Arial", 14, "bold")).pack(pady=10)
             if self.grp_files:
@@ -457,6 +511,8 @@ class TerminalGUIApp(tk.Tk):
         if not self.run_file:
             self._show_message("Error", "Please load a RUN file first.", "error")
             return
+        from run_parser import runReader
+        from grp_parser import grpReader
         if not self.grp_files:
              # Attempt to load groups if not already loaded
             try:
@@ -469,7 +525,7 @@ class TerminalGUIApp(tk.Tk):
                 return
 
         try:
-            self.sec_files = grpReader(self.run_file, self.grp_files)
+            self.sec_files = self._prefetched('sec_files') or grpReader(self.run_file, self.grp_files)
             self._clear_display()
             ttk.Label(self.display_frame, text="Sections Found:", font=("Arial", 14, "bold")).pack(pady=10)
             if self.sec_files:
@@ -490,6 +546,8 @@ class TerminalGUIApp(tk.Tk):
             self._show_message("Error", "Please load a RUN file first.", "error")
             return
 
+        from GoodAndBadList import Lists
+        from enrollments import run_name
         list_type = "Top" if top else "Bottom"
         list_func = Lists.goodList if top else Lists.badList
         history_update_func = self.history.update_good_list if top else self.history.update_work_list
@@ -501,7 +559,9 @@ class TerminalGUIApp(tk.Tk):
         try:
             debug_print("PERFORMERS", f"Calling {list_func.__name__} function")
             # performers_df now includes 'section_source'
-            performers_df = list_func(self.run_file)
+            performers_df = self._prefetched('good' if top else 'bad')
+            if performers_df is None:
+                performers_df = list_func(self.run_file)
             debug_print("PERFORMERS", f"{list_type} performers data loaded", performers_df)
             
             if top:
@@ -547,7 +607,7 @@ class TerminalGUIApp(tk.Tk):
                     debug_print("HISTORY", f"Updating {history_list_name}", {"id_col_exists": 'id' in performers_df.columns})
                     try:
                         # Pass the performers_df directly
-                        updated_df, updated_or_existing_ids = history_update_func(performers_df)
+                        updated_df, updated_or_existing_ids = history_update_func(performers_df, run=run_name(self.run_file))
                         debug_print("HISTORY", f"{history_list_name} update result",
                                    {"updated_df_shape": updated_df.shape if updated_df is not None else None,
                                     "updated_or_existing_ids_count": len(updated_or_existing_ids)})
@@ -565,8 +625,34 @@ class TerminalGUIApp(tk.Tk):
             if top: self.top_performers = None
             else: self.bottom_performers = None
 
+    def display_ranked_performers(self):
+        """Displays the top or bottom students by GPA (N or a percentile per section, group or run)."""
+        if not self.run_file:
+            self._show_message("Error", "Please load a RUN file first.", "error")
+            return
+        request = simpledialog.askstring("Ranked Performers",
+                                         "Select, e.g. 'top 10', 'bottom 5%' or 'top 3 by section':",
+                                         initialvalue="top 10")
+        if request is None: return # User cancelled
+
+        from GoodAndBadList import Lists
+        from performers import parse_selection
+        try:
+            ranked = Lists.rankedList(self.run_file, **parse_selection(request))
+        except ValueError as e:
+            self._show_message("Error", str(e), "error")
+            return
+        except Exception as e:
+            self._show_message("Error Loading Ranked Performers", f"An error occurred: {e}", "error")
+            return
+        if ranked.empty:
+            self._show_message("Ranked Performers", "No graded students found.")
+        else:
+            self._display_dataframe(ranked.drop(columns='section_source', errors='ignore'),
+                                    f"Ranked Performers: {request}")
+
     def export_data(self):
-        """Provides options to export data to HTML."""
+        """Provides options to export data to HTML, CSV and/or Excel."""
         export_options = {
             "Top Performers": self.top_performers,
             "Bottom Performers": self.bottom_performers,
@@ -579,7 +665,8 @@ class TerminalGUIApp(tk.Tk):
         # Create a simple dialog for selection
         dialog = tk.Toplevel(self)
         dialog.title("Export Data")
-        dialog.geometry("300x300")
+        dialog.geometry("300x380")
+        import sv_ttk as sv
         sv.set_theme("dark") # Apply theme to dialog
 
         ttk.Label(dialog, text="Select data to export:").pack(pady=10)
@@ -589,6 +676,17 @@ class TerminalGUIApp(tk.Tk):
             listbox.insert(tk.END, key)
         listbox.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
 
+        # All checked formats are written from a single pass over the data
+        format_vars = {
+            ".html": tk.BooleanVar(value=True),
+            ".csv": tk.BooleanVar(value=False),
+            ".xlsx": tk.BooleanVar(value=False),
+        }
+        format_frame = ttk.Frame(dialog)
+        format_frame.pack(pady=5)
+        for extension, label in ((".html", "HTML"), (".csv", "CSV"), (".xlsx", "Excel")):
+            ttk.Checkbutton(format_frame, text=label, variable=format_vars[extension]).pack(side=tk.LEFT, padx=5)
+
         def on_export():
             selection_index = listbox.curselection()
             if not selection_index:
@@ -602,25 +700,49 @@ class TerminalGUIApp(tk.Tk):
                 self._show_message("Export Error", f"No data available for '{selected_key}'.", "warning")
                 return
 
-            filename_suggestion = f"{selected_key.lower().replace(' ', '_')}_export.html"
+            extensions = [ext for ext, var in format_vars.items() if var.get()]
+            if not extensions:
+                self._show_message("Export Error", "Please select at least one file format.", "warning")
+                return
+
+            filename_suggestion = f"{selected_key.lower().replace(' ', '_')}_export{extensions[0]}"
             filepath = filedialog.asksaveasfilename(
-                defaultextension=".html",
-                filetypes=[("HTML files", "*.html"), ("All files", "*.*")],
+                defaultextension=extensions[0],
+                filetypes=[("HTML files", "*.html"), ("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")],
                 initialfile=filename_suggestion,
-                title=f"Save {selected_key} as HTML"
+                title=f"Save {selected_key}"
             )
 
             if filepath:
-                try:
-                    df_to_export.to_html(filepath, index=False)
-                    self._show_message("Export Successful", f"Data exported to:\n{filepath}")
-                    dialog.destroy()
-                except Exception as e:
-                    self._show_message("Export Error", f"Failed to export data: {e}", "error")
+                # One output per checked format, sharing the chosen file name
+                stem = os.path.splitext(filepath)[0]
+                paths = [stem + ext for ext in extensions]
+                dialog.destroy()
+                self._export_in_background(df_to_export, paths)
 
         ttk.Button(dialog, text="Export Selected", command=on_export).pack(pady=10)
         ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack(pady=5)
 
+    def _export_in_background(self, df, paths):
+        """Write df to paths on a worker thread, reporting progress in the status bar."""
+        from exporter import export_in_background
+
+        names = ", ".join(os.path.basename(path) for path in paths)
+
+        # Callbacks run on the worker thread, so hand them to the Tk thread via the queue
+        def on_progress(rows_written, total_rows):
+            self.task_queue.put(lambda: self.status_var.set(f"Exporting {names}: {rows_written}/{total_rows} rows"))
+
+        def on_done(rows_written, error):
+            if error is not None:
+                debug_print("ERROR", "Export failed", {"paths": paths, "error": str(error)})
+                self.task_queue.put(lambda: self._show_message("Export Error", f"Failed to export data: {error}", "error"))
+            else:
+                self.task_queue.put(lambda: self._show_message("Export Successful", "Data exported to:\n" + "\n".join(paths)))
+
+        self.status_var.set(f"Exporting {names}...")
+        export_in_background(df, paths, on_progress=on_progress, on_done=on_done, index=False)
+
 
     def read_sec_file(self):
         """Prompts user to select a SEC file and displays its content."""
@@ -635,6 +757,7 @@ class TerminalGUIApp(tk.Tk):
         )
         if filepath:
             if filepath.lower().endswith('.sec'):
+                from FileReader import fileReader
                 try:
                     self.sec_data = fileReader.readSEC(filepath)
                     self._display_dataframe(self.sec_data, f"SEC Data: {os.path.basename(filepath)}")
@@ -668,7 +791,17 @@ class TerminalGUIApp(tk.Tk):
                 self._show_message("Error", "Invalid threshold value. Please enter a number.", "error")
                 return
 
-            result_data, self.zscore_results = ZScoreCalculator.analyze_sections(self.run_file, self.grp_files, self.sec_files, threshold)
+            from zscore_calculator import ZScoreCalculator, ZScoreCache
+            cache = self._zscore_cache
+            if cache is not None and cache.matches(self.run_file, self.sec_files):
+                # Sections unchanged: only the threshold comparison is redone
+                debug_print("ZSCORE", "Re-using cached z-scores", {"threshold": threshold})
+                self.zscore_results = cache.apply(threshold)
+                result_data = self.zscore_results.to_dict('records')
+            else:
+                result_data, self.zscore_results = ZScoreCalculator.analyze_sections(self.run_file, self.grp_files, self.sec_files, threshold)
+                cache = ZScoreCache(self.zscore_results, self.run_file, self.sec_files)
+                self._zscore_cache = cache
 
             if self.zscore_results is None or self.zscore_results.empty:
                  self._show_message("Z-Score Analysis", "No results generated from the analysis.")
@@ -679,17 +812,82 @@ class TerminalGUIApp(tk.Tk):
                     summary_text = f"Group GPA: {result_data[0].get('group_gpa', 'N/A'):.2f}, Group Std Dev: {result_data[0].get('group_std', 'N/A'):.2f}"
 
                 self._display_dataframe(self.zscore_results, f"Z-Score Analysis Results\n{summary_text}")
+                self._add_threshold_slider(cache, threshold)
 
         except Exception as e:
             self._show_message("Z-Score Error", f"An error occurred during Z-score analysis: {e}", "error")
             self.zscore_results = None
 
+    def _add_threshold_slider(self, cache, threshold):
+        """
+        Add a threshold slider under the Z-score table.
+
+        Moving it re-marks the significant sections from the cached z-scores
+        (a searchsorted and one comparison); the table is only redrawn when
+        the number of significant sections changes.
+        """
+        import pandas as pd
+
+        slider_frame = ttk.Frame(self.display_frame)
+        slider_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(slider_frame, text="Threshold:").pack(side=tk.LEFT, padx=5)
+        threshold_var = tk.DoubleVar(value=threshold)
+        summary = ttk.Label(slider_frame, width=45)
+        last_count = [cache.count(threshold)]
+
+        def on_slide(value):
+            value = float(value)
+            count = cache.count(value)
+            summary.config(text=f"|z| >= {value:.2f}: {count} of {cache.valid} sections significant")
+            if count == last_count[0]:
+                return
+            last_count[0] = count
+            # Align on the index so a table the user re-sorted still gets the right rows
+            significant = pd.Series(cache.significant(value), index=cache.results.index)
+            self.zscore_results['significant'] = significant
+            if self.table is not None:
+                self.table.model.df['significant'] = significant
+                self.table.redraw()
+
+        ttk.Scale(slider_frame, from_=0.0, to=4.0, orient=tk.HORIZONTAL, variable=threshold_var,
+                  command=on_slide).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        summary.pack(side=tk.LEFT, padx=5)
+        on_slide(threshold)
+
+    def display_rollups(self):
+        """Displays a course/term, course or department rollup of every section on file."""
+        level = simpledialog.askstring("Course Rollups", "Rollup level (course_term, course or department):",
+                                       initialvalue="course")
+        if level is None: return # User cancelled
+        level = level.strip().lower()
+
+        from catalog import default_sections_dir
+        from rollups import ROLLUP_LEVELS, RollupStore
+        if level not in ROLLUP_LEVELS:
+            self._show_message("Error", f"Unknown rollup level '{level}'.", "error")
+            return
+        sections_dir = default_sections_dir(self.run_file)
+        try:
+            if self._rollup_store is None or self._rollup_store.catalog.sections_dir != os.path.abspath(sections_dir):
+                self._rollup_store = RollupStore(sections_dir)
+            rollups = self._rollup_store.table(level)
+        except Exception as e:
+            self._show_message("Rollup Error", f"An error occurred building the rollups: {e}", "error")
+            return
+        if rollups.empty:
+            self._show_message("Course Rollups", "No sections found.")
+        else:
+            self._display_dataframe(rollups.drop(columns=['gpa_sum', 'gpa_sumsq']),
+                                    f"{level.replace('_', ' by ').capitalize()} rollup")
+
     def manage_history(self):
         """Opens a new window for history management."""
         debug_print("HISTORY", "Opening history management window")
         history_window = tk.Toplevel(self)
         history_window.title("Student History Management")
         history_window.geometry("700x500")
+        import sv_ttk as sv
+        from pandastable import Table, config
         sv.set_theme("dark") # Apply theme
 
         notebook = ttk.Notebook(history_window)
@@ -726,28 +924,44 @@ class TerminalGUIApp(tk.Tk):
         check_student_frame = ttk.Frame(notebook, padding="10")
         notebook.add(check_student_frame, text='Check Student')
 
-        ttk.Label(check_student_frame, text="Enter Student ID:").pack(side=tk.LEFT, padx=5)
-        student_id_entry = ttk.Entry(check_student_frame, width=15)
+        ttk.Label(check_student_frame, text="Enter Student ID(s):").pack(side=tk.LEFT, padx=5)
+        student_id_entry = ttk.Entry(check_student_frame, width=25)
         student_id_entry.pack(side=tk.LEFT, padx=5)
-        result_label = ttk.Label(check_student_frame, text="")
+        result_label = ttk.Label(check_student_frame, text="", justify=tk.LEFT)
         result_label.pack(side=tk.LEFT, padx=10)
 
         def check_student():
+            student_ids = [student_id.strip() for student_id in student_id_entry.get().split(",") if student_id.strip()]
+            if not student_ids:
+                result_label.config(text="Please enter one or more IDs, separated by commas.")
+                return
             try:
-                student_id = int(student_id_entry.get())
-                debug_print("HISTORY", f"Checking student history for ID: {student_id}")
-                history_info = self.history.check_student_history(student_id)
+                debug_print("HISTORY", f"Checking student history for IDs: {student_ids}")
+                # One lookup for the whole batch
+                history_info = self.history.check_students(student_ids)
                 debug_print("HISTORY", "Student history check result", history_info)
-                result_text = f"Student {student_id}: Good List: {'Yes' if history_info['good_list'] else 'No'}, Work List: {'Yes' if history_info['work_list'] else 'No'}"
+                result_text = "\n".join(
+                    f"Student {row.id}: Good List: {'Yes' if row.good_list else 'No'}, Work List: {'Yes' if row.work_list else 'No'}"
+                    for row in history_info.itertuples(index=False)
+                )
                 result_label.config(text=result_text)
-            except ValueError:
-                result_label.config(text="Invalid ID. Please enter a number.")
             except Exception as e:
-                debug_print("ERROR", f"Error checking student history", {"error": str(e)})
+                debug_print("ERROR", "Error checking student history", {"error": str(e)})
                 result_label.config(text=f"Error checking history: {e}")
 
         ttk.Button(check_student_frame, text="Check", command=check_student).pack(side=tk.LEFT, padx=5)
 
+        def compact_history():
+            try:
+                self.history.compact()
+                debug_print("HISTORY", "Compacted history journals")
+                self._show_message("History Compacted", "The history journals were folded into the list files.")
+            except Exception as e:
+                debug_print("ERROR", "Error compacting history", {"error": str(e)})
+                self._show_message("History Error", f"Failed to compact history: {e}", "error")
+
+        ttk.Button(history_window, text="Compact History", command=compact_history).pack(side=tk.BOTTOM, pady=5)
+
         notebook.pack(expand=True, fill='both', padx=10, pady=10)
 
     def auto_process(self):
@@ -776,6 +990,13 @@ class TerminalGUIApp(tk.Tk):
             current_step += 1
             self.update_idletasks() # Update GUI
 
+        from run_parser import runReader
+        from grp_parser import grpReader
+        from FileReader import fileReader
+        from GoodAndBadList import Lists
+        from zscore_calculator import ZScoreCalculator
+        from enrollments import run_name
+
         try:
             # 2. Load groups
             update_status("Loading groups...")
@@ -805,7 +1026,7 @@ class TerminalGUIApp(tk.Tk):
                                 "section_sample": self.top_performers['section_source'].head(3)})
                     try:
                         # Pass dataframe directly, remove section_name
-                        updated_df, updated_or_existing_ids = self.history.update_good_list(self.top_performers)
+                        updated_df, updated_or_existing_ids = self.history.update_good_list(self.top_performers, run=run_name(self.run_file))
                         debug_print("AUTO", "Good list update results",
                                    {"updated_df_rows": len(updated_df) if updated_df is not None else 0,
                                     "updated_or_existing_ids": len(updated_or_existing_ids)})
@@ -836,7 +1057,7 @@ class TerminalGUIApp(tk.Tk):
                                 "section_sample": self.bottom_performers['section_source'].head(3)})
                     try:
                         # Pass dataframe directly, remove section_name
-                        updated_df, updated_or_existing_ids = self.history.update_work_list(self.bottom_performers)
+                        updated_df, updated_or_existing_ids = self.history.update_work_list(self.bottom_performers, run=run_name(self.run_file))
                         debug_print("AUTO", "Work list update results",
                                    {"updated_df_rows": len(updated_df) if updated_df is not None else 0,
                                     "updated_or_existing_ids": len(updated_or_existing_ids)})
@@ -888,15 +1109,7 @@ class TerminalGUIApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    # Ensure History files exist before starting
-    try:
-        debug_print("STARTUP", "Initializing history files")
-        HistoryManager() # This will create files if they don't exist
-    except Exception as e:
-         debug_print("ERROR", "History initialization failed", {"error": str(e)})
-         messagebox.showerror("History Init Error", f"Could not initialize history files: {e}")
-         sys.exit(1)
-
+    # History files are created by the history property the first time they are needed
     debug_print("STARTUP", "Starting TerminalGUIApp")
     app = TerminalGUIApp()
     app.mainloop()
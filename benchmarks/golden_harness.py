@@ -0,0 +1,346 @@
+"""
+Golden-output regression and timing harness for the bundled test data.
+
+Every RUN file in COMSC330_POC_Data/Runs is processed in a fresh interpreter
+(so imports and parsing are part of the measurement):
+
+  - good.lst / work.lst: Lists.goodList and Lists.badList, written with
+    lst_io.write_lst. The same lists are also built through the cohort
+    filters (lst_io.write_run_lists), and the harness fails if the two paths
+    disagree.
+  - zscores_run.csv: ZScoreCalculator.analyze_sections (sections vs the run).
+  - zscores_groups.csv: ZScoreCalculator.analyze_groups (sections vs their group).
+
+The outputs are compared with the checked-in files in benchmarks/golden/<RUN>/
+(list entries including names and section counts, z-scores within a
+tolerance). The bundled sample lists in "Some test data" are also parsed, to
+check that the reader still accepts the reference format.
+
+Timing is opt-in, since wall times only mean something on the machine that
+recorded them: --update-timings writes the pipeline's wall time and the
+child's peak memory to benchmarks/golden/baseline.json (not checked in), and
+--timing then also fails a run that is slower (or larger) than that baseline
+by more than the tolerance. The harness exits with status 1 on any failure.
+
+Usage:
+    python benchmarks/golden_harness.py                   # check outputs
+    python benchmarks/golden_harness.py --update-timings  # record this machine's timings
+    python benchmarks/golden_harness.py --timing          # check outputs and timings
+    python benchmarks/golden_harness.py --update          # re-record the golden outputs
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "COMSC330_POC_Data")
+GOLDEN_DIR = os.path.join(REPO_ROOT, "benchmarks", "golden")
+BASELINE_FILE = os.path.join(GOLDEN_DIR, "baseline.json")
+
+OUTPUT_FILES = ["good.lst", "work.lst", "zscores_run.csv", "zscores_groups.csv"]
+
+# The lists as built by the cohort filters, checked against the Lists output
+COHORT_FILES = {"good.lst": "good.cohort.lst", "work.lst": "work.cohort.lst"}
+
+# Columns that identify a z-score row; the rest are compared as values
+ZSCORE_KEYS = ["group", "section"]
+
+
+def _peak_memory_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be measured."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _zscore_table(df, group=None):
+    """Make a z-score table comparable across machines: base names, stable row order."""
+    df = df.copy()
+    if group is not None and "group" not in df.columns:
+        df.insert(0, "group", group)
+    df["section"] = df["section"].map(os.path.basename)
+    df["section_count"] = df["section_count"].map(
+        lambda counts: " ".join(f"{grade}:{count}" for grade, count in sorted(counts.items()))
+        if isinstance(counts, dict) else str(counts))
+    return df.sort_values(ZSCORE_KEYS, kind="stable").reset_index(drop=True)
+
+
+def run_child(run_file, output_dir):
+    """
+    Produce every output of one run (runs in the child interpreter).
+
+    Returns:
+        dict: 'wall_s' (pipeline time) and 'peak_rss_mb'.
+    """
+    sys.path.insert(0, REPO_ROOT)
+    start = time.perf_counter()
+    from GoodAndBadList import Lists
+    from grp_parser import grpReader
+    from lst_io import write_lst
+    from run_parser import runReader
+    from zscore_calculator import ZScoreCalculator
+
+    write_lst(Lists.goodList(run_file), os.path.join(output_dir, "good.lst"))
+    write_lst(Lists.badList(run_file), os.path.join(output_dir, "work.lst"))
+    grp_files = runReader(run_file)
+    sec_files = grpReader(run_file, grp_files)
+    _, run_scores = ZScoreCalculator.analyze_sections(run_file, grp_files, sec_files, threshold=2.0)
+    _, group_scores = ZScoreCalculator.analyze_groups(run_file, threshold=2.0)
+    _zscore_table(run_scores, group="run").to_csv(os.path.join(output_dir, "zscores_run.csv"), index=False)
+    _zscore_table(group_scores).to_csv(os.path.join(output_dir, "zscores_groups.csv"), index=False)
+    report = {"wall_s": time.perf_counter() - start, "peak_rss_mb": _peak_memory_mb()}
+
+    # Outside the timed part: the cohort-filter lists, compared by the parent
+    from lst_io import write_run_lists
+    paths = write_run_lists(run_file, os.path.join(output_dir, "cohort"))
+    for name, cohort_name in COHORT_FILES.items():
+        os.replace(paths[os.path.splitext(name)[0]], os.path.join(output_dir, cohort_name))
+    os.rmdir(os.path.join(output_dir, "cohort"))
+    return report
+
+
+def measure(run_file, output_dir):
+    """
+    Run one RUN file in a fresh interpreter.
+
+    Returns:
+        dict or None: The child's report; None if it failed.
+    """
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", run_file, output_dir],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()
+        print(f"{os.path.basename(run_file)}: failed ({error[-1] if error else 'no output'})")
+        return None
+    # The report is the last line; the parsers print progress before it
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check_cohort_agreement(actual_dir):
+    """
+    Compare one run's Lists output with the lists built by the cohort filters.
+
+    Args:
+        actual_dir (str): Folder with the new outputs.
+
+    Returns:
+        list of str: One message per disagreement; empty when the lists agree.
+    """
+    from lst_io import compare_lst
+
+    problems = []
+    for name, cohort_name in COHORT_FILES.items():
+        try:
+            differences = compare_lst(os.path.join(actual_dir, name), os.path.join(actual_dir, cohort_name))
+        except ValueError as e:
+            problems.append(f"{cohort_name}: {e}")
+            continue
+        if not differences.empty:
+            problems.append(f"{name}: Lists and the cohort filter disagree on {len(differences)} entries "
+                            f"(side 'actual' is the cohort filter)\n{differences.to_string(index=False)}")
+    return problems
+
+
+def compare_outputs(golden_dir, actual_dir, atol):
+    """
+    Compare one run's outputs with its golden files.
+
+    Args:
+        golden_dir (str): Folder with the golden files.
+        actual_dir (str): Folder with the new outputs.
+        atol (float): Absolute tolerance for numeric z-score columns.
+
+    Returns:
+        list of str: One message per difference; empty when everything matches.
+    """
+    import numpy as np
+    import pandas as pd
+    from lst_io import compare_lst
+
+    problems = []
+    for name in OUTPUT_FILES:
+        golden = os.path.join(golden_dir, name)
+        actual = os.path.join(actual_dir, name)
+        if not os.path.exists(golden):
+            problems.append(f"{name}: no golden file (run with --update)")
+            continue
+        if name.endswith(".lst"):
+            try:
+                differences = compare_lst(golden, actual)
+            except ValueError as e:
+                problems.append(f"{name}: {e}")
+                continue
+            if not differences.empty:
+                problems.append(f"{name}: {len(differences)} entries differ\n{differences.to_string(index=False)}")
+            continue
+
+        expected = pd.read_csv(golden, keep_default_na=False)
+        result = pd.read_csv(actual, keep_default_na=False)
+        if list(expected.columns) != list(result.columns):
+            problems.append(f"{name}: columns {list(result.columns)} != {list(expected.columns)}")
+            continue
+        if len(expected) != len(result) or not expected[ZSCORE_KEYS].equals(result[ZSCORE_KEYS]):
+            problems.append(f"{name}: rows differ ({len(result)} rows, {len(expected)} expected)")
+            continue
+        for column in expected.columns:
+            want = pd.to_numeric(expected[column].replace("", np.nan), errors="coerce")
+            got = pd.to_numeric(result[column].replace("", np.nan), errors="coerce")
+            # Numeric when every non-empty golden value parses as a number
+            numeric = (expected[column].dtype != bool
+                       and want.notna().sum() == (expected[column].astype(str) != "").sum())
+            if numeric:
+                mismatched = ~np.isclose(got.to_numpy(dtype=float), want.to_numpy(dtype=float),
+                                         rtol=0, atol=atol, equal_nan=True)
+            else:
+                mismatched = (expected[column].astype(str) != result[column].astype(str)).to_numpy()
+            if mismatched.any():
+                rows = result.loc[mismatched, ZSCORE_KEYS + [column]].assign(expected=expected.loc[mismatched, column])
+                problems.append(f"{name}: {column} differs in {int(mismatched.sum())} rows\n{rows.to_string(index=False)}")
+    return problems
+
+
+def check_timing(name, measured, baseline, time_tolerance, time_slack, memory_tolerance):
+    """
+    Compare a run's timing and memory with its baseline.
+
+    A run regresses when it is slower than baseline * (1 + time_tolerance)
+    + time_slack, or uses more than baseline * (1 + memory_tolerance) memory.
+
+    Returns:
+        list of str: One message per regression.
+    """
+    if baseline is None:
+        return [f"{name}: no timing baseline (run with --update-timings)"]
+    problems = []
+    limit = baseline["wall_s"] * (1 + time_tolerance) + time_slack
+    if measured["wall_s"] > limit:
+        problems.append(f"{name}: {measured['wall_s']:.3f}s exceeds {limit:.3f}s "
+                        f"(baseline {baseline['wall_s']:.3f}s)")
+    if measured.get("peak_rss_mb") and baseline.get("peak_rss_mb"):
+        memory_limit = baseline["peak_rss_mb"] * (1 + memory_tolerance)
+        if measured["peak_rss_mb"] > memory_limit:
+            problems.append(f"{name}: peak memory {measured['peak_rss_mb']:.1f} MB exceeds {memory_limit:.1f} MB "
+                            f"(baseline {baseline['peak_rss_mb']:.1f} MB)")
+    return problems
+
+
+def check_sample_lists():
+    """Parse the reference lists in "Some test data"; return a message per file that fails."""
+    from lst_io import iter_lst
+
+    problems = []
+    sample_dir = os.path.join(DATA_DIR, "Some test data")
+    for name in ("good.lst", "work.lst"):
+        path = os.path.join(sample_dir, name)
+        if os.path.exists(path):
+            try:
+                for _ in iter_lst(path):
+                    pass
+            except ValueError as e:
+                problems.append(f"sample {name}: {e}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every bundled RUN against golden outputs and timings.")
+    parser.add_argument("--child", nargs=2, metavar=("RUN", "OUTPUT_DIR"), help=argparse.SUPPRESS)
+    parser.add_argument("--update", action="store_true", help="Re-record the golden outputs")
+    parser.add_argument("--update-timings", action="store_true",
+                        help="Record this machine's timing baseline (kept out of version control)")
+    parser.add_argument("--timing", action="store_true", help="Also check timings against the local baseline")
+    parser.add_argument("--repeat", type=int, default=None,
+                        help="Runs per RUN file; the median is used (default 3 when timing, else 1)")
+    parser.add_argument("--atol", type=float, default=2e-3,
+                        help="Absolute tolerance for z-score values (default 0.002, the rounding step)")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="Allowed slowdown as a fraction of the baseline (default 0.5)")
+    parser.add_argument("--time-slack", type=float, default=0.1,
+                        help="Extra seconds allowed on top, for timer noise (default 0.1)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="Allowed peak-memory growth as a fraction of the baseline (default 0.25)")
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return 0
+    if args.repeat is None:
+        args.repeat = 3 if (args.timing or args.update_timings) else 1
+
+    sys.path.insert(0, REPO_ROOT)
+    runs_dir = os.path.join(DATA_DIR, "Runs")
+    run_files = sorted(os.path.join(runs_dir, name) for name in os.listdir(runs_dir) if name.upper().endswith(".RUN"))
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r") as file:
+            baseline = json.load(file).get("runs", {})
+
+    problems = check_sample_lists()
+    timings = {}
+    print(f"{'RUN':<14} {'wall (s)':>9} {'peak (MB)':>10}  result")
+    print("-" * 50)
+    with tempfile.TemporaryDirectory() as scratch:
+        for run_file in run_files:
+            name = os.path.splitext(os.path.basename(run_file))[0]
+            reports = []
+            for attempt in range(max(args.repeat, 1)):
+                output_dir = os.path.join(scratch, f"{name}-{attempt}")
+                os.makedirs(output_dir)
+                report = measure(run_file, output_dir)
+                if report is None:
+                    break
+                reports.append(report)
+            if len(reports) < max(args.repeat, 1):
+                problems.append(f"{name}: the pipeline failed")
+                continue
+
+            measured = {"wall_s": statistics.median(report["wall_s"] for report in reports)}
+            memory = [report["peak_rss_mb"] for report in reports if report["peak_rss_mb"] is not None]
+            measured["peak_rss_mb"] = max(memory) if memory else None
+            timings[name] = measured
+
+            run_problems = [f"{name}/{problem}" for problem in check_cohort_agreement(output_dir)]
+            # Lists must still agree with the cohort path before its lists become golden
+            if args.update and not run_problems:
+                shutil.rmtree(os.path.join(GOLDEN_DIR, name), ignore_errors=True)
+                shutil.copytree(output_dir, os.path.join(GOLDEN_DIR, name),
+                                ignore=shutil.ignore_patterns(*COHORT_FILES.values()))
+            run_problems += [f"{name}/{problem}" for problem in
+                             compare_outputs(os.path.join(GOLDEN_DIR, name), output_dir, args.atol)]
+            if args.timing and not (args.update or args.update_timings):
+                run_problems += check_timing(name, measured, baseline.get(name), args.time_tolerance,
+                                             args.time_slack, args.memory_tolerance)
+            memory_text = f"{measured['peak_rss_mb']:.1f}" if measured["peak_rss_mb"] is not None else "n/a"
+            print(f"{name:<14} {measured['wall_s']:>9.3f} {memory_text:>10}  {'FAIL' if run_problems else 'ok'}")
+            problems += run_problems
+
+    if args.update and not problems:
+        print(f"\nRecorded golden outputs in {GOLDEN_DIR}")
+    if args.update_timings and timings:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(BASELINE_FILE, "w") as file:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "runs": timings}, file, indent=2)
+            file.write("\n")
+        print(f"\nRecorded timings in {BASELINE_FILE}")
+
+    if problems:
+        print("\nFailures:")
+        for problem in problems:
+            print(f"- {problem}")
+        return 1
+    print("\nAll runs match.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
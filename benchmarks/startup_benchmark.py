@@ -0,0 +1,93 @@
+"""
+Startup benchmark for the Tkinter front ends.
+
+Measures time-to-first-window for TerminalGUI.py, MainGUI.py and the
+test_gui application. Each GUI is started in a fresh interpreter so module
+imports are part of the measurement; the child process builds the main
+window, draws it once with update() and reports back.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code run in the child interpreter for each GUI. It must create `app`.
+GUI_TARGETS = {
+    "TerminalGUI": "import TerminalGUI\napp = TerminalGUI.TerminalGUIApp()",
+    "MainGUI": "import MainGUI\napp = MainGUI.gradeGUI()",
+    "test_gui": "from test_gui.app import ImprovedGradeGUI\napp = ImprovedGradeGUI()",
+}
+
+CHILD_TEMPLATE = """
+import sys, time, json
+start = time.perf_counter()
+{target}
+app.update()
+ready = time.perf_counter()
+heavy = [name for name in ("pandas", "pandastable", "scipy", "numpy") if name in sys.modules]
+app.destroy()
+print(json.dumps({{"window_s": ready - start, "loaded": heavy}}))
+"""
+
+
+def time_startup(name, target):
+    """
+    Start one GUI in a fresh interpreter and time its first window.
+
+    Args:
+        name (str): Label of the GUI being measured.
+        target (str): Python code that creates the window as `app`.
+
+    Returns:
+        dict or None: 'total_s' (process start to first window), 'window_s'
+        (imports plus window construction inside the child) and 'loaded'
+        (heavy modules imported by then); None if the GUI could not start.
+    """
+    code = CHILD_TEMPLATE.format(target=target)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()
+        print(f"{name}: failed to start ({error[-1] if error else 'no output'})")
+        return None
+    # The report is the last line; the GUIs print debug output before it
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["total_s"] = elapsed
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-window for each GUI.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per GUI (default 5)")
+    args = parser.parse_args()
+
+    print(f"{'GUI':<12} {'total (s)':>10} {'window (s)':>11}  heavy modules loaded")
+    print("-" * 60)
+    for name, target in GUI_TARGETS.items():
+        runs = [time_startup(name, target) for _ in range(args.repeat)]
+        runs = [run for run in runs if run is not None]
+        if not runs:
+            continue
+        total = statistics.median(run["total_s"] for run in runs)
+        window = statistics.median(run["window_s"] for run in runs)
+        loaded = ", ".join(runs[-1]["loaded"]) or "none"
+        print(f"{name:<12} {total:>10.3f} {window:>11.3f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
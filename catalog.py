@@ -0,0 +1,459 @@
+"""
+Corpus-wide catalog of section files and a student transcript index.
+
+The catalog remembers every .sec file in a Sections folder together with its
+course, term, credit hours, GPA aggregates and grade histogram and the
+(mtime, size) it was read at, so a refresh only parses the sections that were
+added or changed since the last one. The
+student index is built from the same refresh: one row per student per section,
+kept as numpy arrays sorted by student id, so a transcript (or the transcripts
+of thousands of students) is a pair of binary searches.
+
+Both are cached in a .catalog folder next to the Sections folder.
+
+Provides:
+  - TRANSCRIPT_COLUMNS: columns returned by StudentIndex.transcripts.
+  - sections_dir_for_run: the Sections folder that belongs to a run file.
+  - default_sections_dir: that folder, or the bundled data's when no run is loaded.
+  - SectionCatalog: incremental scan of a Sections folder plus its StudentIndex.
+  - StudentIndex: sorted-array index from student id to every enrollment.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from FileReader import fileReader
+from enrollments import parse_section_name, term_sort_key
+from grade_distribution import GRADE_BINS
+
+# Columns of the catalog's section table, in order: file metadata, then the
+# section's GPA aggregates (graded students, sum and sum of squares of grade
+# points) and its grade histogram
+SECTION_COLUMNS = (['section', 'course', 'number', 'term', 'credit_hours', 'students', 'mtime_ns', 'size',
+                    'graded', 'gpa_sum', 'gpa_sumsq'] + GRADE_BINS)
+
+# Columns of a transcript, in order
+TRANSCRIPT_COLUMNS = ['id', 'section', 'course', 'term', 'credit_hours', 'grade']
+
+CATALOG_DIR = ".catalog"
+
+
+def sections_dir_for_run(run_file):
+    """
+    Return the Sections folder that belongs to a run file.
+
+    Args:
+        run_file (str): Path to a .RUN file inside <data>/Runs.
+
+    Returns:
+        str: Path of <data>/Sections.
+    """
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(run_file))), "Sections")
+
+
+def default_sections_dir(run_file=None):
+    """
+    Return the Sections folder the catalog tools should use.
+
+    Args:
+        run_file (str, optional): The loaded run file, if any.
+
+    Returns:
+        str: sections_dir_for_run(run_file), or the Sections folder of the
+            COMSC330_POC_Data bundled with the repository when no run is loaded
+            (independent of the current directory).
+    """
+    if run_file:
+        return sections_dir_for_run(run_file)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "COMSC330_POC_Data", "Sections")
+
+
+def _sections_signature(sections):
+    """SectionCatalog.signature() of a section table."""
+    return str(pd.util.hash_pandas_object(sections[['section', 'mtime_ns', 'size']], index=False).sum())
+
+
+class StudentIndex:
+    """
+    Every (student, section, grade) of a corpus, sorted by student id.
+
+    Rows are three parallel arrays: ids (str), section codes and grade codes
+    (int32 positions in the sections and grade_names tables). The section
+    table carries term, course and credit hours, so those are not repeated
+    per row.
+    """
+
+    def __init__(self, ids=None, section_codes=None, grade_codes=None, sections=None, grade_names=None):
+        """
+        Create an index from already sorted arrays (empty if none are given).
+
+        Args:
+            ids (np.ndarray): Student id of each row, sorted.
+            section_codes (np.ndarray): Position of each row's section in sections.
+            grade_codes (np.ndarray): Position of each row's grade in grade_names.
+            sections (pd.DataFrame): Section table (SECTION_COLUMNS).
+            grade_names (np.ndarray): Distinct grades.
+        """
+        self.ids = ids if ids is not None else np.array([], dtype=str)
+        self.section_codes = section_codes if section_codes is not None else np.array([], dtype=np.int32)
+        self.grade_codes = grade_codes if grade_codes is not None else np.array([], dtype=np.int32)
+        self.sections = sections if sections is not None else pd.DataFrame(columns=SECTION_COLUMNS)
+        self.grade_names = grade_names if grade_names is not None else np.array([], dtype=str)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, frames, sections):
+        """
+        Build an index from per-section rosters.
+
+        Args:
+            frames (dict): section name -> DataFrame with 'id' and 'grade' columns.
+            sections (pd.DataFrame): Section table (SECTION_COLUMNS) covering
+                every key of frames.
+
+        Returns:
+            StudentIndex: The sorted index.
+        """
+        sections = sections.reset_index(drop=True)
+        position = {name: code for code, name in enumerate(sections['section'])}
+        ids, codes, grades = [], [], []
+        for name, roster in frames.items():
+            ids.append(roster['id'].astype(str).to_numpy())
+            codes.append(np.full(len(roster), position[name], dtype=np.int32))
+            grades.append(roster['grade'].astype(str).to_numpy())
+        if not ids:
+            return cls(sections=sections)
+
+        ids = np.concatenate(ids).astype(str)
+        grade_names, grade_codes = np.unique(np.concatenate(grades).astype(str), return_inverse=True)
+        order = np.argsort(ids, kind='stable')
+        return cls(ids[order], np.concatenate(codes)[order], grade_codes.astype(np.int32)[order],
+                   sections, grade_names)
+
+    def apply(self, sections, dropped, frames):
+        """
+        Return a new index with some sections dropped and others added.
+
+        Kept rows are never re-sorted: the new rows are sorted on their own and
+        merged in with one searchsorted and np.insert.
+
+        Args:
+            sections (pd.DataFrame): The new section table (SECTION_COLUMNS).
+            dropped (iterable of str): Sections whose rows are removed
+                (changed sections are dropped and then added again).
+            frames (dict): section name -> DataFrame('id', 'grade') of the rows to add.
+
+        Returns:
+            StudentIndex: The updated index.
+        """
+        sections = sections.reset_index(drop=True)
+        position = {name: code for code, name in enumerate(sections['section'])}
+        dropped = set(dropped)
+
+        # Re-code the kept rows against the new section table
+        old_names = self.sections['section'].to_numpy()
+        remap = np.array([-1 if name in dropped else position.get(name, -1) for name in old_names], dtype=np.int32)
+        old_codes = remap[self.section_codes] if len(self) else self.section_codes
+        keep = old_codes >= 0
+        added = StudentIndex.build(frames, sections)
+
+        grade_names = np.union1d(self.grade_names, added.grade_names).astype(str)
+        kept_grades = np.searchsorted(grade_names, self.grade_names)[self.grade_codes[keep]].astype(np.int32)
+        added_grades = np.searchsorted(grade_names, added.grade_names)[added.grade_codes].astype(np.int32)
+
+        # Widen to the longer id first: np.insert would truncate to kept_ids' width
+        kept_ids = self.ids[keep].astype(np.result_type(self.ids.dtype, added.ids.dtype))
+        # side='right' keeps earlier rows of a student ahead of new ones
+        at = np.searchsorted(kept_ids, added.ids, side='right')
+        return StudentIndex(np.insert(kept_ids, at, added.ids),
+                            np.insert(old_codes[keep], at, added.section_codes).astype(np.int32),
+                            np.insert(kept_grades, at, added_grades).astype(np.int32),
+                            sections, grade_names)
+
+    def _positions(self, student_ids):
+        """Row positions of every student in student_ids, grouped by student."""
+        query = np.asarray([str(student_id) for student_id in student_ids], dtype=str)
+        left = np.searchsorted(self.ids, query, side='left')
+        right = np.searchsorted(self.ids, query, side='right')
+        counts = right - left
+        # Expand each [left, right) range without a Python loop
+        starts = np.repeat(left - (np.cumsum(counts) - counts), counts)
+        return starts + np.arange(counts.sum())
+
+    def transcripts(self, student_ids):
+        """
+        Return every enrollment of a batch of students.
+
+        Args:
+            student_ids: Iterable of student ids.
+
+        Returns:
+            pd.DataFrame: Columns TRANSCRIPT_COLUMNS, grouped by student in the
+                order given and sorted by term within each student.
+        """
+        positions = self._positions(student_ids)
+        codes = self.section_codes[positions]
+        sections = self.sections
+        transcript = pd.DataFrame({
+            'id': self.ids[positions],
+            'section': sections['section'].to_numpy()[codes],
+            'course': sections['course'].to_numpy()[codes],
+            'term': sections['term'].to_numpy()[codes],
+            'credit_hours': sections['credit_hours'].to_numpy(dtype=float)[codes],
+            'grade': self.grade_names[self.grade_codes[positions]],
+        }, columns=TRANSCRIPT_COLUMNS)
+        if transcript.empty:
+            return transcript
+        # Chronological order inside each student's block
+        term_rank = {term: rank for rank, term in enumerate(sorted(set(transcript['term']), key=term_sort_key))}
+        student_rank = pd.factorize(transcript['id'])[0]
+        order = np.lexsort((transcript['section'].to_numpy(), transcript['term'].map(term_rank).to_numpy(),
+                           student_rank))
+        return transcript.iloc[order].reset_index(drop=True)
+
+    def enrollments(self):
+        """
+        Return every row of the index.
+
+        Returns:
+            pd.DataFrame: Columns TRANSCRIPT_COLUMNS, sorted by student id.
+        """
+        codes = self.section_codes
+        return pd.DataFrame({
+            'id': self.ids,
+            'section': self.sections['section'].to_numpy()[codes],
+            'course': self.sections['course'].to_numpy()[codes],
+            'term': self.sections['term'].to_numpy()[codes],
+            'credit_hours': self.sections['credit_hours'].to_numpy(dtype=float)[codes],
+            'grade': self.grade_names[self.grade_codes],
+        }, columns=TRANSCRIPT_COLUMNS)
+
+    def transcript(self, student_id):
+        """
+        Return every enrollment of one student.
+
+        Args:
+            student_id: The student id.
+
+        Returns:
+            pd.DataFrame: Columns TRANSCRIPT_COLUMNS, sorted by term.
+        """
+        return self.transcripts([student_id])
+
+    def save(self, path, sections_signature=''):
+        """
+        Write the index arrays to an .npz file.
+
+        Args:
+            path (str): The .npz file.
+            sections_signature (str): SectionCatalog.signature() of the section
+                table the codes point into, checked again by load.
+        """
+        np.savez(path, ids=self.ids, section_codes=self.section_codes, grade_codes=self.grade_codes,
+                 grade_names=self.grade_names, sections_signature=np.array(sections_signature))
+
+    @classmethod
+    def load(cls, path, sections, sections_signature=None):
+        """
+        Read an index written by save.
+
+        Args:
+            path (str): The .npz file.
+            sections (pd.DataFrame): The section table the index was saved with.
+            sections_signature (str, optional): Signature of sections; the
+                index is rejected unless it was saved with the same one.
+
+        Returns:
+            StudentIndex or None: The loaded index, or None if it belongs to
+                a different section table.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            if sections_signature is not None:
+                stored = str(arrays['sections_signature']) if 'sections_signature' in arrays.files else None
+                if stored != sections_signature:
+                    return None
+            return cls(arrays['ids'], arrays['section_codes'], arrays['grade_codes'],
+                       sections.reset_index(drop=True), arrays['grade_names'])
+
+
+class SectionCatalog:
+    """
+    Incremental catalog of the .sec files in one Sections folder.
+
+    refresh() stats every file, parses only the sections that are new or whose
+    mtime or size changed, drops the ones that disappeared, and updates the
+    StudentIndex in the same pass. The section table and the index are saved
+    together under <data>/.catalog.
+    """
+
+    def __init__(self, sections_dir, cache_dir=None):
+        """
+        Open the catalog of a Sections folder, loading its cache if there is one.
+
+        Args:
+            sections_dir (str): Folder holding the .sec files.
+            cache_dir (str, optional): Where to keep the cache
+                (default: .catalog next to sections_dir).
+        """
+        self.sections_dir = os.path.abspath(sections_dir)
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(self.sections_dir), CATALOG_DIR)
+        self.sections = pd.DataFrame(columns=SECTION_COLUMNS)
+        self.index = StudentIndex()
+        self._load()
+
+    @property
+    def _sections_path(self):
+        return os.path.join(self.cache_dir, "sections.csv")
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "student_index.npz")
+
+    def _load(self):
+        """Load the cached section table and index; start empty if either is missing or unreadable."""
+        if not (os.path.exists(self._sections_path) and os.path.exists(self._index_path)):
+            return
+        try:
+            sections = pd.read_csv(self._sections_path, dtype={'section': str, 'course': str, 'number': str,
+                                                               'term': str}, keep_default_na=False)
+            sections['credit_hours'] = pd.to_numeric(sections['credit_hours'], errors='coerce')
+            if set(SECTION_COLUMNS) - set(sections.columns):
+                # Written before some columns existed: rebuild from the files
+                return
+            sections = sections.reindex(columns=SECTION_COLUMNS)
+            index = StudentIndex.load(self._index_path, sections, _sections_signature(sections))
+        except Exception as e:
+            print(f"Warning: Could not read the section catalog in {self.cache_dir}: {e}. Rebuilding it.")
+            return
+        if index is None:
+            # The two files are from different saves (e.g. a crash between
+            # the renames); the index codes would point at the wrong sections
+            print(f"Warning: The section catalog in {self.cache_dir} is out of step with its index. Rebuilding it.")
+            return
+        self.sections = sections
+        self.index = index
+
+    def save(self):
+        """
+        Write the section table and index to the cache folder.
+
+        The index records the signature of the section table it belongs to, so
+        _load can tell when the two files come from different saves.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sections_tmp = self._sections_path + ".tmp"
+        index_tmp = self._index_path + ".tmp.npz"
+        self.sections.to_csv(sections_tmp, index=False)
+        self.index.save(index_tmp, self.signature())
+        os.replace(index_tmp, self._index_path)
+        os.replace(sections_tmp, self._sections_path)
+
+    def _scan(self):
+        """Return section name -> (path, mtime_ns, size) for every .sec file in the folder."""
+        found = {}
+        if not os.path.isdir(self.sections_dir):
+            return found
+        with os.scandir(self.sections_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith('.sec'):
+                    stat = entry.stat()
+                    found[entry.name] = (entry.path, stat.st_mtime_ns, stat.st_size)
+        return found
+
+    @staticmethod
+    def _aggregates(grades):
+        """GPA aggregates and grade histogram of one section's grades."""
+        from gpa_engine import grade_points
+
+        points = grade_points(grades.to_numpy(dtype=str))
+        points = points[~np.isnan(points)]
+        histogram = grades.str.strip().value_counts()
+        aggregates = {'graded': len(points), 'gpa_sum': float(points.sum()), 'gpa_sumsq': float((points ** 2).sum())}
+        aggregates.update({grade: int(histogram.get(grade, 0)) for grade in GRADE_BINS})
+        return aggregates
+
+    def refresh(self, save=True):
+        """
+        Bring the catalog and student index up to date with the folder.
+
+        Args:
+            save (bool): Write the cache when anything changed (default True).
+
+        Returns:
+            dict: {'added', 'changed', 'removed'} - lists of section names.
+        """
+        found = self._scan()
+        known = {row.section: (row.mtime_ns, row.size) for row in self.sections.itertuples(index=False)}
+        added = sorted(name for name in found if name not in known)
+        changed = sorted(name for name in found
+                         if name in known and (found[name][1], found[name][2]) != tuple(known[name]))
+        removed = sorted(name for name in known if name not in found)
+        if not (added or changed or removed):
+            return {'added': [], 'changed': [], 'removed': []}
+
+        dropped = set(changed + removed)
+        rows = [row for row in self.sections.to_dict('records') if row['section'] not in dropped]
+        frames = {}
+        for name in added + changed:
+            path, mtime_ns, size = found[name]
+            try:
+                roster = fileReader.readSEC(path)
+                _, credit_hours = fileReader.readSECHeader(path)
+            except Exception as e:
+                print(f"Warning: Could not read section {name}: {e}")
+                continue
+            parts = parse_section_name(name)
+            frames[name] = pd.DataFrame({'id': roster['ID'].astype(str), 'grade': roster['Grade'].astype(str)})
+            rows.append({'section': name, 'course': parts['course'], 'number': parts['number'],
+                         'term': parts['term'], 'credit_hours': credit_hours, 'students': len(roster),
+                         'mtime_ns': mtime_ns, 'size': size, **self._aggregates(frames[name]['grade'])})
+
+        sections = pd.DataFrame(rows, columns=SECTION_COLUMNS).sort_values('section').reset_index(drop=True)
+        self.index = self.index.apply(sections, dropped, frames)
+        self.sections = sections
+        if save:
+            self.save()
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def signature(self):
+        """
+        Fingerprint of the catalog's sections and their (mtime, size).
+
+        Tables derived from the catalog store it to tell whether they are stale.
+
+        Returns:
+            str: Changes whenever a section is added, edited or removed.
+        """
+        return _sections_signature(self.sections)
+
+    def transcripts(self, student_ids, refresh=True):
+        """
+        Return every enrollment of a batch of students across the whole folder.
+
+        Args:
+            student_ids: Iterable of student ids.
+            refresh (bool): Pick up added or edited sections first (default True).
+
+        Returns:
+            pd.DataFrame: Columns TRANSCRIPT_COLUMNS.
+        """
+        if refresh:
+            self.refresh()
+        return self.index.transcripts(student_ids)
+
+    def transcript(self, student_id, refresh=True):
+        """
+        Return every enrollment of one student across the whole folder.
+
+        Args:
+            student_id: The student id.
+            refresh (bool): Pick up added or edited sections first (default True).
+
+        Returns:
+            pd.DataFrame: Columns TRANSCRIPT_COLUMNS, sorted by term.
+        """
+        return self.transcripts([student_id], refresh=refresh)
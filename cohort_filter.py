@@ -0,0 +1,383 @@
+"""
+Cohort filter expressions compiled to vectorized boolean masks.
+
+A cohort is written as a small expression over the enrollment table, e.g.
+
+    grade in (D+, D, D-, F) and term >= F20 and course ~ "COMSC3*"
+
+and compiled once into a CohortFilter. Applying it never loops over rows:
+each field's column is factorized, every comparison is evaluated on the
+distinct values only, and the per-value results are broadcast back to the
+rows through the factor codes, so the whole expression becomes one boolean
+mask built from array operations.
+
+Syntax:
+  - Comparisons: field op value, with op one of = (or ==), !=, <, <=, >, >=,
+    ~ / !~ (shell-style wildcards * ? [..], case-insensitive), and
+    field in (v1, v2, ...) / field not in (...).
+  - Combine with and, or, not and parentheses (not binds tightest, then and).
+  - Values are bare words (A-, F20, COMSC110, 3.0) or quoted strings.
+  - Text matches ignore case. term compares chronologically (S20 < F20),
+    grade compares by grade points (B+ > B, I and W never order), credits
+    and points compare as numbers.
+
+Fields: grade, term, course, department (letters of the course), section,
+group, run, id, first, last, credits, points.
+
+Provides:
+  - COHORTS: named cohort definitions (the Good and Work lists).
+  - compile_filter: compile an expression (or cohort name) to a CohortFilter.
+  - CohortFilter: a compiled expression; mask() and apply() on a DataFrame.
+  - cohort_stats: enrollment, student and GPA counts of a cohort.
+"""
+
+import fnmatch
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+from enrollments import term_sort_key
+
+# Named cohorts, usable wherever an expression is accepted
+COHORTS = {
+    'good': 'grade in (A, A-)',
+    'work': 'grade in (F, D-, D, D+)',
+}
+
+# Field -> (candidate columns, kind); the first candidate present in the table is used
+FIELDS = {
+    'grade': (['Grade', 'grade'], 'grade'),
+    'term': (['term'], 'term'),
+    'course': (['course'], 'text'),
+    'department': (['course'], 'department'),
+    'section': (['section', 'section_source'], 'text'),
+    'group': (['group'], 'text'),
+    'run': (['run'], 'text'),
+    'id': (['id', 'ID'], 'text'),
+    'first': (['FirstName', 'FName'], 'text'),
+    'last': (['LastName', 'LName'], 'text'),
+    'credits': (['credit_hours'], 'number'),
+    'points': (['GradePoints'], 'number'),
+}
+
+_ALIASES = {'firstname': 'first', 'lastname': 'last', 'credit_hours': 'credits', 'gradepoints': 'points',
+            'dept': 'department'}
+
+_TOKEN = re.compile(r'\s*(?:(?P<string>"[^"]*"|\'[^\']*\')|(?P<op>==|!=|<=|>=|!~|=|<|>|~|\(|\)|,)'
+                    r'|(?P<word>[^\s"\'(),=<>!~]+))')
+
+_KEYWORDS = {'and', 'or', 'not', 'in'}
+
+_COMPARISONS = {
+    '=': np.equal, '!=': np.not_equal, '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+}
+
+
+def _tokenize(expression):
+    """Split an expression into (kind, value, position) tokens."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character {expression[position:].lstrip()[:1]!r} at position {position}")
+        if match.group('string') is not None:
+            tokens.append(('value', match.group('string')[1:-1], match.start('string')))
+        elif match.group('op') is not None:
+            tokens.append(('op', '=' if match.group('op') == '==' else match.group('op'), match.start('op')))
+        else:
+            word = match.group('word')
+            kind = 'keyword' if word.lower() in _KEYWORDS else 'value'
+            tokens.append((kind, word.lower() if kind == 'keyword' else word, match.start('word')))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a nested tuple tree."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None, len(self.expression))
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            expected = value or kind or 'more input'
+            found = 'end of expression' if token[0] is None else repr(token[1])
+            raise ValueError(f"Expected {expected} at position {token[2]}, found {found}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty filter expression")
+        tree = self._or()
+        if self.position < len(self.tokens):
+            token = self._peek()
+            raise ValueError(f"Unexpected {token[1]!r} at position {token[2]}")
+        return tree
+
+    def _or(self):
+        node = self._and()
+        while self._peek()[:2] == ('keyword', 'or'):
+            self._take()
+            node = ('or', node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek()[:2] == ('keyword', 'and'):
+            self._take()
+            node = ('and', node, self._not())
+        return node
+
+    def _not(self):
+        if self._peek()[:2] == ('keyword', 'not'):
+            self._take()
+            return ('not', self._not())
+        if self._peek()[:2] == ('op', '('):
+            self._take()
+            node = self._or()
+            self._take('op', ')')
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        _, name, position = self._take('value')
+        field = _ALIASES.get(name.lower(), name.lower())
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field {name!r} at position {position}; "
+                             f"expected one of {', '.join(FIELDS)}")
+        kind, operator, _ = self._peek()
+        if (kind, operator) == ('keyword', 'not'):
+            self._take()
+            self._take('keyword', 'in')
+            return ('not', ('in', field, self._list()))
+        if (kind, operator) == ('keyword', 'in'):
+            self._take()
+            return ('in', field, self._list())
+        if kind != 'op' or operator not in _COMPARISONS and operator not in ('~', '!~'):
+            self._take('op', 'comparison operator')
+        self._take()
+        value = self._take('value')[1]
+        if operator == '!~':
+            return ('not', ('~', field, value))
+        return (operator, field, value)
+
+    def _list(self):
+        self._take('op', '(')
+        values = [self._take('value')[1]]
+        while self._peek()[:2] == ('op', ','):
+            self._take()
+            values.append(self._take('value')[1])
+        self._take('op', ')')
+        return tuple(values)
+
+
+def _fields_of(tree):
+    """Fields used anywhere in a parse tree."""
+    if tree[0] in ('and', 'or'):
+        return _fields_of(tree[1]) | _fields_of(tree[2])
+    if tree[0] == 'not':
+        return _fields_of(tree[1])
+    return {tree[1]}
+
+
+class CohortFilter:
+    """
+    A compiled cohort expression.
+
+    Attributes:
+        expression (str): The source expression.
+        fields (set of str): Fields the expression refers to.
+    """
+
+    def __init__(self, expression):
+        """
+        Parse an expression.
+
+        Args:
+            expression (str): Filter expression (see the module docstring).
+
+        Raises:
+            ValueError: If the expression is not valid.
+        """
+        self.expression = expression
+        self._tree = _Parser(expression).parse()
+        self.fields = _fields_of(self._tree)
+
+    def __repr__(self):
+        return f"CohortFilter({self.expression!r})"
+
+    @staticmethod
+    def _column(df, field):
+        """Name of the column of df that holds field."""
+        for column in FIELDS[field][0]:
+            if column in df.columns:
+                return column
+        raise ValueError(f"The table has no column for field {field!r} "
+                         f"(looked for {', '.join(FIELDS[field][0])})")
+
+    @staticmethod
+    def _factor(df, field, factors):
+        """(codes, distinct values) of a field's column, normalized for comparison; cached per mask()."""
+        if field in factors:
+            return factors[field]
+        kind = FIELDS[field][1]
+        column = df[CohortFilter._column(df, field)]
+        if kind == 'number':
+            values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=float)
+            factors[field] = (None, values)
+            return factors[field]
+        codes, uniques = pd.factorize(column.astype(str).str.strip().str.upper().where(column.notna()))
+        uniques = np.asarray(uniques, dtype=object)
+        if kind == 'department':
+            from rollups import department_of
+            uniques = np.array([department_of(value) for value in uniques], dtype=object)
+        factors[field] = (codes, uniques)
+        return factors[field]
+
+    @staticmethod
+    def _order(field, uniques, value):
+        """Comparable numbers for the distinct values and the literal of an ordered comparison."""
+        kind = FIELDS[field][1]
+        if kind == 'term':
+            keys = [term_sort_key(term) for term in uniques]
+            ranks = {key: rank for rank, key in enumerate(sorted(set(keys) | {term_sort_key(value)}))}
+            return np.array([ranks[key] for key in keys], dtype=float), float(ranks[term_sort_key(value)])
+        if kind == 'grade':
+            from zscore_calculator import ZScoreCalculator
+
+            def points(grade):
+                gpa = ZScoreCalculator.letter_to_gpa(grade)
+                return np.nan if gpa is None else gpa
+            if points(value) == 0.0 and value != 'F':
+                raise ValueError(f"Unknown grade {value!r}")
+            return np.array([points(grade) for grade in uniques], dtype=float), points(value)
+        return uniques, value
+
+    def _evaluate(self, tree, df, factors):
+        """Boolean row mask of a parse tree."""
+        operator = tree[0]
+        if operator == 'and':
+            return self._evaluate(tree[1], df, factors) & self._evaluate(tree[2], df, factors)
+        if operator == 'or':
+            return self._evaluate(tree[1], df, factors) | self._evaluate(tree[2], df, factors)
+        if operator == 'not':
+            return ~self._evaluate(tree[1], df, factors)
+
+        field = tree[1]
+        codes, uniques = self._factor(df, field, factors)
+        if codes is None:
+            # Numeric column: compare the rows directly
+            try:
+                literals = [float(value) for value in (tree[2] if operator == 'in' else [tree[2]])]
+            except ValueError:
+                raise ValueError(f"Field {field!r} needs a number, not {tree[2]!r}")
+            if operator == 'in':
+                return np.isin(uniques, literals)
+            if operator == '~':
+                raise ValueError(f"Field {field!r} is numeric; use =, <, >, ... instead of ~")
+            with np.errstate(invalid='ignore'):
+                return _COMPARISONS[operator](uniques, literals[0])
+
+        if operator == 'in':
+            hits = np.isin(uniques, [value.strip().upper() for value in tree[2]])
+        elif operator == '~':
+            pattern = re.compile(fnmatch.translate(tree[2].strip().upper()))
+            hits = np.array([bool(pattern.match(value)) for value in uniques], dtype=bool)
+        elif operator in ('=', '!='):
+            hits = _COMPARISONS[operator](uniques, tree[2].strip().upper())
+        else:
+            if FIELDS[field][1] not in ('term', 'grade'):
+                raise ValueError(f"Field {field!r} cannot be ordered; use =, in or ~")
+            ranks, literal = self._order(field, uniques, tree[2].strip().upper())
+            with np.errstate(invalid='ignore'):
+                hits = _COMPARISONS[operator](ranks, literal)
+        # Missing values (code -1) pick up the trailing False
+        return np.append(np.asarray(hits, dtype=bool), False)[codes]
+
+    def mask(self, df):
+        """
+        Evaluate the expression on a table.
+
+        Args:
+            df (pd.DataFrame): Enrollment table (run_enrollments, a catalog
+                transcript, a Good/Work list or a section roster).
+
+        Returns:
+            np.ndarray: bool, one entry per row of df.
+
+        Raises:
+            ValueError: If df lacks a column the expression needs, or a
+                literal does not fit its field.
+        """
+        if df.empty:
+            return np.zeros(len(df), dtype=bool)
+        return np.asarray(self._evaluate(self._tree, df, {}), dtype=bool)
+
+    def apply(self, df):
+        """
+        Return the rows of df in the cohort.
+
+        Args:
+            df (pd.DataFrame): Table to filter.
+
+        Returns:
+            pd.DataFrame: The matching rows, original index kept.
+        """
+        return df[self.mask(df)]
+
+
+@functools.lru_cache(maxsize=128)
+def compile_filter(expression):
+    """
+    Compile a cohort expression (or the name of one of COHORTS).
+
+    Compiled filters are cached, so calling this for every list or export is cheap.
+
+    Args:
+        expression (str): Filter expression or cohort name.
+
+    Returns:
+        CohortFilter: The compiled filter.
+
+    Raises:
+        ValueError: If the expression is not valid.
+    """
+    return CohortFilter(COHORTS.get(expression.strip().lower(), expression))
+
+
+def cohort_stats(enrollments, expression, by=None):
+    """
+    Count the enrollments, students and GPA of a cohort.
+
+    Args:
+        enrollments (pd.DataFrame): Enrollment table with 'id' and 'GradePoints'
+            (run_enrollments output).
+        expression (str): Filter expression or cohort name.
+        by (str or list of str, optional): Columns to break the counts down by.
+
+    Returns:
+        pd.DataFrame: Columns (by...) enrollments, students, gpa.
+    """
+    cohort = compile_filter(expression).apply(enrollments)
+    by = [by] if isinstance(by, str) else list(by or [])
+    columns = by + ['enrollments', 'students', 'gpa']
+    if cohort.empty:
+        return pd.DataFrame(columns=columns)
+    if not by:
+        return pd.DataFrame([{'enrollments': len(cohort), 'students': cohort['id'].nunique(),
+                              'gpa': round(float(cohort['GradePoints'].mean()), 3)}], columns=columns)
+    stats = cohort.groupby(by, sort=True).agg(enrollments=('id', 'size'), students=('id', 'nunique'),
+                                              gpa=('GradePoints', 'mean')).reset_index()
+    stats['gpa'] = stats['gpa'].round(3)
+    return stats[columns]
@@ -0,0 +1,518 @@
+"""
+Typed columnar storage for lists, history, enrollments and z-score results.
+
+Tables are written as Parquet (or Feather) through pyarrow when it is
+installed, and as NumPy .npz archives otherwise. Tables that carry 'run' and
+'term' columns are partitioned on disk as
+
+    <root>/<table>/run=<run>/term=<term>/part_<time>_<pid>_<n>.<ext>
+
+so reading one run or term only opens the files of that partition. A
+partition is never deleted before it is rewritten: the new part file is
+written to a temporary name and renamed into place, and only then are the
+partition's older part files removed, so readers always find a complete
+table. append_table adds a part file without rewriting the others.
+
+Provides:
+  - COLUMNAR_FORMATS: supported format names.
+  - pyarrow_available / default_format: pick the best available format.
+  - write_table / append_table / read_table / list_partitions: generic partitioned tables.
+  - lists_table / history_table / zscore_table: shape repo DataFrames for storage.
+  - DATASET_TABLES: names of the tables export_run writes.
+  - export_run / load_table: write or read everything for a run in one call.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+COLUMNAR_FORMATS = ('parquet', 'feather', 'npz')
+
+# Columns tables are partitioned on, outermost first
+PARTITION_COLUMNS = ('run', 'term')
+
+# Tables written by export_run
+DATASET_TABLES = ('good_list', 'work_list', 'enrollments', 'zscores', 'student_gpa',
+                  'good_history', 'work_history', 'history_entries')
+
+# Partition value used for rows with no run/term
+_MISSING_PARTITION = '__none__'
+
+_EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'npz': '.npz'}
+
+# Numbers part files written by this process within one clock tick
+_part_counter = itertools.count()
+
+
+def pyarrow_available():
+    """Return True if pyarrow can be imported."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_format():
+    """Return 'parquet' when pyarrow is installed, else 'npz'."""
+    return 'parquet' if pyarrow_available() else 'npz'
+
+
+def _check_format(fmt):
+    """Validate fmt, raising ImportError if it needs pyarrow and pyarrow is missing."""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{fmt}'. Use one of {COLUMNAR_FORMATS}.")
+    if fmt != 'npz' and not pyarrow_available():
+        raise ImportError(f"Please install the 'pyarrow' library to use {fmt} files.\nRun: pip install pyarrow")
+
+
+def _is_text(series):
+    """True for columns that are not numeric, boolean or datetime."""
+    return not (pd.api.types.is_numeric_dtype(series)
+                or pd.api.types.is_bool_dtype(series)
+                or pd.api.types.is_datetime64_any_dtype(series))
+
+
+def _typed_columns(df):
+    """
+    Give every column a storable type.
+
+    Numeric, boolean and datetime columns are kept. Other columns become
+    strings (missing values stay missing); dicts and lists are stored as
+    JSON text.
+    """
+    df = df.reset_index(drop=True).copy()
+    for col in df.columns:
+        if not _is_text(df[col]):
+            continue
+        df[col] = df[col].map(
+            lambda value: None if value is None or (isinstance(value, float) and value != value)
+            else json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+        ).astype(object)
+    return df
+
+
+def _write_npz(df, path):
+    """Store each column as an array; string columns get a null mask."""
+    arrays = {}
+    meta = {'columns': [str(col) for col in df.columns], 'strings': []}
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        key = f"c{position}"
+        if _is_text(series):
+            mask = series.isna().to_numpy()
+            arrays[key] = np.array(series.where(~mask, '').tolist(), dtype=str)
+            arrays[f"{key}_null"] = mask
+            meta['strings'].append(key)
+        else:
+            arrays[key] = series.to_numpy()
+    arrays['__meta__'] = np.array(json.dumps(meta))
+    with open(path, 'wb') as file:
+        np.savez(file, **arrays)
+
+
+def _read_npz(path, columns=None):
+    """Load an .npz written by _write_npz, only decoding the requested columns."""
+    with np.load(path, allow_pickle=False) as archive:
+        meta = json.loads(str(archive['__meta__']))
+        data = {}
+        for position, col in enumerate(meta['columns']):
+            if columns is not None and col not in columns:
+                continue
+            key = f"c{position}"
+            values = archive[key]
+            if key in meta['strings']:
+                # Same dtype as a freshly built text column ('str' on pandas 3)
+                series = pd.Series(values.astype(object)).astype(str)
+                series[archive[f"{key}_null"]] = None
+                data[col] = series
+            else:
+                data[col] = pd.Series(values)
+    return pd.DataFrame(data)
+
+
+def _write_file(df, path, fmt):
+    """Write one partition file atomically in the given format."""
+    temp_path = path + '.part'
+    if fmt == 'parquet':
+        df.to_parquet(temp_path, index=False)
+    elif fmt == 'feather':
+        df.to_feather(temp_path)
+    else:
+        _write_npz(df, temp_path)
+    os.replace(temp_path, path)
+
+
+def _part_path(directory, extension):
+    """
+    A new part file name in directory.
+
+    Names start with the write time, so reading a directory's files in name
+    order reads them in the order they were written.
+    """
+    name = f"part_{time.time_ns():020d}_{os.getpid()}_{next(_part_counter):06d}{extension}"
+    return os.path.join(directory, name)
+
+
+def _drop_stale_parts(directory, keep):
+    """Remove the data files and partition subdirectories of directory other than keep."""
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if path == keep:
+            continue
+        if os.path.isdir(path):
+            if '=' in entry:
+                shutil.rmtree(path, ignore_errors=True)
+        elif os.path.splitext(entry)[1] in _EXTENSIONS.values():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_file(path, columns=None):
+    """Read one partition file, choosing the reader from the extension."""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    if path.endswith('.feather'):
+        return pd.read_feather(path, columns=columns)
+    return _read_npz(path, columns)
+
+
+def _partition_value(value):
+    """Turn a partition value into a safe directory name component."""
+    if value is None or (isinstance(value, float) and value != value) or str(value) == '':
+        return _MISSING_PARTITION
+    return str(value).replace(os.sep, '_').replace('=', '_')
+
+
+def write_table(df, root, name, fmt=None, partition_by=PARTITION_COLUMNS):
+    """
+    Write a DataFrame as a (partitioned) columnar table.
+
+    Only the partition columns present in df are used. Each partition that
+    appears in df is replaced; other partitions already on disk are kept, so
+    exporting a second run adds to the table instead of overwriting it.
+
+    Args:
+        df (pd.DataFrame): Table to store.
+        root (str): Directory holding all tables.
+        name (str): Table name (subdirectory of root).
+        fmt (str, optional): 'parquet', 'feather' or 'npz'; default_format() if None.
+        partition_by (tuple): Candidate partition columns (default run, term).
+
+    Returns:
+        list of str: Paths of the files written.
+
+    Raises:
+        ValueError: If fmt is unknown.
+        ImportError: If fmt needs pyarrow and pyarrow is not installed.
+    """
+    fmt = fmt or default_format()
+    _check_format(fmt)
+    extension = _EXTENSIONS[fmt]
+    table_dir = os.path.join(root, name)
+    partitions = [col for col in partition_by if col in df.columns]
+    df = _typed_columns(df)
+
+    if not partitions:
+        # Unpartitioned tables are replaced as a whole, new file first
+        os.makedirs(table_dir, exist_ok=True)
+        path = _part_path(table_dir, extension)
+        _write_file(df, path, fmt)
+        _drop_stale_parts(table_dir, path)
+        return [path]
+
+    written = []
+    keys = df[partitions].apply(lambda column: column.map(_partition_value))
+    for values, group in df.groupby([keys[col] for col in partitions], sort=False):
+        if not isinstance(values, tuple):
+            values = (values,)
+        partition_dir = os.path.join(table_dir, *(f"{col}={value}" for col, value in zip(partitions, values)))
+        os.makedirs(partition_dir, exist_ok=True)
+        path = _part_path(partition_dir, extension)
+        # Partition values live in the directory names, not in the file
+        _write_file(group.drop(columns=partitions).reset_index(drop=True), path, fmt)
+        _drop_stale_parts(partition_dir, path)
+        written.append(path)
+    return written
+
+
+def append_table(df, root, name, fmt=None):
+    """
+    Add rows to an unpartitioned table as one new part file.
+
+    Existing part files are left alone, so the cost is that of the new rows.
+    Callers that append from several processes at once need no lock; a
+    write_table of the same table does replace everything appended before it.
+
+    Args:
+        df (pd.DataFrame): Rows to add.
+        root (str): Directory holding all tables.
+        name (str): Table name (subdirectory of root).
+        fmt (str, optional): 'parquet', 'feather' or 'npz'; default_format() if None.
+
+    Returns:
+        str: Path of the file written.
+
+    Raises:
+        ValueError: If fmt is unknown.
+        ImportError: If fmt needs pyarrow and pyarrow is not installed.
+    """
+    fmt = fmt or default_format()
+    _check_format(fmt)
+    table_dir = os.path.join(root, name)
+    os.makedirs(table_dir, exist_ok=True)
+    path = _part_path(table_dir, _EXTENSIONS[fmt])
+    _write_file(_typed_columns(df), path, fmt)
+    return path
+
+
+def _walk_partitions(table_dir):
+    """Yield (partition dict, file path) for every data file under table_dir."""
+    for directory, _, files in os.walk(table_dir):
+        relative = os.path.relpath(directory, table_dir)
+        partition = {}
+        if relative != '.':
+            for component in relative.split(os.sep):
+                if '=' in component:
+                    key, value = component.split('=', 1)
+                    partition[key] = None if value == _MISSING_PARTITION else value
+        for file_name in sorted(files):
+            if os.path.splitext(file_name)[1] in _EXTENSIONS.values():
+                yield partition, os.path.join(directory, file_name)
+
+
+def list_partitions(root, name):
+    """
+    List the partitions of a stored table without reading any data.
+
+    Args:
+        root (str): Directory holding all tables.
+        name (str): Table name.
+
+    Returns:
+        pd.DataFrame: One row per data file with its partition values and 'path'.
+    """
+    rows = [dict(partition, path=path) for partition, path in _walk_partitions(os.path.join(root, name))]
+    return pd.DataFrame(rows)
+
+
+def read_table(root, name, filters=None, columns=None):
+    """
+    Read a stored table, opening only the partitions that match filters.
+
+    Args:
+        root (str): Directory holding all tables.
+        name (str): Table name.
+        filters (dict, optional): Column -> value or list of values,
+            e.g. {'run': 'SPRING25'} or {'term': ['F24', 'S25']}. Partition
+            columns skip whole files; other columns are matched row by row
+            (as text) after loading.
+        columns (list of str, optional): Data columns to load (partition
+            columns are always added back).
+
+    Returns:
+        pd.DataFrame: The matching rows; empty if the table does not exist.
+
+    Raises:
+        ValueError: If a filter names a column the table does not have.
+    """
+    table_dir = os.path.join(root, name)
+    if not os.path.isdir(table_dir):
+        return pd.DataFrame()
+
+    wanted = {}
+    for key, value in (filters or {}).items():
+        wanted[key] = {str(v) for v in value} if isinstance(value, (list, tuple, set)) else {str(value)}
+
+    # A table rewritten while it is read loses files that were listed; read it again
+    for attempt in range(5):
+        try:
+            return _read_partitions(table_dir, name, wanted, columns)
+        except FileNotFoundError:
+            if attempt == 4:
+                raise
+            time.sleep(0.01)
+
+
+def _read_partitions(table_dir, name, wanted, columns):
+    """read_table's work, for already parsed filters."""
+    frames = []
+    for partition, path in _walk_partitions(table_dir):
+        if any(str(partition.get(key)) not in values for key, values in wanted.items() if key in partition):
+            continue
+        row_filters = {key: values for key, values in wanted.items() if key not in partition}
+        file_columns = None
+        if columns is not None:
+            # Filter columns are loaded too, and dropped again below
+            file_columns = [col for col in columns if col not in partition]
+            file_columns += [key for key in row_filters if key not in file_columns]
+        frame = _read_file(path, file_columns)
+        for key, value in partition.items():
+            frame[key] = value
+        if row_filters:
+            missing = [key for key in row_filters if key not in frame.columns]
+            if missing:
+                raise ValueError(f"Table '{name}' has no column {', '.join(map(repr, missing))} to filter on")
+            keep = np.ones(len(frame), dtype=bool)
+            for key, values in row_filters.items():
+                keep &= frame[key].astype(str).isin(values).to_numpy()
+            frame = frame[keep].reset_index(drop=True)
+            if columns is not None:
+                frame = frame[[col for col in frame.columns if col in columns or col in partition]]
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame()
+    table = pd.concat(frames, ignore_index=True)
+    # Partition columns first, like the table that was written
+    leading = [col for col in PARTITION_COLUMNS if col in table.columns]
+    return table[leading + [col for col in table.columns if col not in leading]]
+
+
+def lists_table(list_df, run_file):
+    """
+    Add run and term columns to a Lists.goodList/badList DataFrame.
+
+    Args:
+        list_df (pd.DataFrame): Output of Lists.goodList or Lists.badList.
+        run_file (str): Run the list was built from.
+
+    Returns:
+        pd.DataFrame: Copy of list_df with 'run' and 'term' columns.
+    """
+    from enrollments import parse_section_name, run_name
+
+    table = list_df.copy()
+    table['run'] = run_name(run_file)
+    table['term'] = table['section_source'].map(lambda section: parse_section_name(section)['term'])
+    return table
+
+
+def zscore_table(zscore_df, run_file):
+    """
+    Shape an analyze_sections result for storage.
+
+    z_score and p_value become numeric (NaN where the analysis reported
+    'N/A'), sections are reduced to their file names, the grade-count dict
+    is kept as JSON text, and run and term columns are added.
+
+    Args:
+        zscore_df (pd.DataFrame): DataFrame returned by ZScoreCalculator.analyze_sections.
+        run_file (str): Run the analysis was done on.
+
+    Returns:
+        pd.DataFrame: Storable copy of zscore_df.
+    """
+    from enrollments import parse_section_name, run_name
+
+    table = zscore_df.copy()
+    for col in ('z_score', 'p_value'):
+        if col in table.columns:
+            table[col] = pd.to_numeric(table[col], errors='coerce')
+    # analyze_sections reports full paths; keep the file name like the lists do
+    table['section'] = table['section'].map(os.path.basename)
+    table['run'] = run_name(run_file)
+    table['term'] = table['section'].map(lambda section: parse_section_name(section)['term'])
+    return table
+
+
+def history_table(history_df):
+    """
+    Shape a HistoryManager list for storage.
+
+    Wide history rows span several runs and terms, so they are stored
+    unpartitioned; the per-entry table (HistoryManager.get_entries) is
+    partitioned by run instead.
+
+    Args:
+        history_df (pd.DataFrame): Output of get_good_list or get_work_list.
+
+    Returns:
+        pd.DataFrame: Copy with 'id' as text.
+    """
+    table = history_df.copy()
+    if 'id' in table.columns:
+        table['id'] = table['id'].astype(str)
+    return table
+
+
+def export_run(run_file, root, fmt=None, history=None, zscore_df=None, threshold=2.0):
+    """
+    Write the good list, work list, enrollments, z-scores and student GPAs of
+    a run, plus the history tables, to a columnar dataset.
+
+    Args:
+        run_file (str): Path to the run file.
+        root (str): Dataset directory.
+        fmt (str, optional): 'parquet', 'feather' or 'npz'; default_format() if None.
+        history (HistoryManager, optional): History to export as well.
+        zscore_df (pd.DataFrame, optional): Existing analyze_sections result;
+            computed with threshold if None.
+        threshold (float): Z-score threshold used when computing z-scores.
+
+    Returns:
+        dict: Table name -> list of files written.
+    """
+    from GoodAndBadList import Lists
+    from enrollments import run_enrollments, run_name
+    from gpa_engine import run_gpas
+    from run_parser import runReader
+    from grp_parser import grpReader
+    from zscore_calculator import ZScoreCalculator
+
+    fmt = fmt or default_format()
+    _check_format(fmt)
+    if zscore_df is None:
+        grp_files = runReader(run_file)
+        sec_files = grpReader(run_file, grp_files)
+        _, zscore_df = ZScoreCalculator.analyze_sections(run_file, grp_files, sec_files, threshold)
+
+    written = {
+        'good_list': write_table(lists_table(Lists.goodList(run_file), run_file), root, 'good_list', fmt),
+        'work_list': write_table(lists_table(Lists.badList(run_file), run_file), root, 'work_list', fmt),
+        'enrollments': write_table(run_enrollments(run_file), root, 'enrollments', fmt),
+        'zscores': write_table(zscore_table(zscore_df, run_file), root, 'zscores', fmt),
+        'student_gpa': write_table(run_gpas(run_file).assign(run=run_name(run_file)), root, 'student_gpa', fmt),
+    }
+    if history is not None:
+        written['good_history'] = write_table(history_table(history.get_good_list()), root, 'good_history', fmt)
+        written['work_history'] = write_table(history_table(history.get_work_list()), root, 'work_history', fmt)
+        written['history_entries'] = write_table(history.get_entries(), root, 'history_entries', fmt)
+    return written
+
+
+def load_table(root, name, run=None, term=None, columns=None):
+    """
+    Read one table of a dataset written by export_run.
+
+    Args:
+        root (str): Dataset directory.
+        name (str): One of DATASET_TABLES.
+        run (str or list, optional): Only these runs (e.g. "SPRING25").
+        term (str or list, optional): Only these terms (e.g. "S25").
+        columns (list of str, optional): Data columns to load.
+
+    Returns:
+        pd.DataFrame: The matching rows.
+
+    Raises:
+        ValueError: If root is not a directory, name is not one of
+            DATASET_TABLES, or the table has no run/term to filter on.
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"No dataset found in '{root}'")
+    if name not in DATASET_TABLES:
+        raise ValueError(f"Unknown table '{name}'. Use one of {', '.join(DATASET_TABLES)}.")
+    filters = {}
+    if run is not None:
+        filters['run'] = run
+    if term is not None:
+        filters['term'] = term
+    return read_table(root, name, filters=filters, columns=columns)
@@ -0,0 +1,139 @@
+"""
+Module to flatten a run into one row per student enrollment.
+
+A run lists groups, each group lists sections, and each section lists students
+with a grade. The enrollment table joins those levels so a run can be stored,
+filtered and compared as a single typed table.
+
+Provides:
+  - parse_section_name: split a section file name into course, section number and term.
+  - term_sort_key: chronological sort key for terms like "F18" or "S25".
+  - run_name: short name of a run file (file name without extension).
+  - run_enrollments: DataFrame of every enrollment in a run.
+"""
+
+import os
+import re
+
+import pandas as pd
+
+from run_parser import runReader
+from grp_parser import grpReader
+from FileReader import fileReader
+
+# e.g. COMSC110.01S25.SEC -> course COMSC110, section 01, term S25
+_SECTION_NAME = re.compile(r'^(?P<course>[^.]+)\.(?P<number>\d+)(?P<term>[A-Za-z]+\d{2})(?:\.sec)?$', re.IGNORECASE)
+
+# Order of terms inside a year, used to sort terms chronologically
+_SEASON_ORDER = {'W': 0, 'S': 1, 'SU': 2, 'F': 3}
+
+# Columns of the enrollment table, in order
+ENROLLMENT_COLUMNS = ['run', 'group', 'section', 'course', 'term', 'credit_hours',
+                      'id', 'FirstName', 'LastName', 'Grade', 'GradePoints']
+
+
+def parse_section_name(name):
+    """
+    Split a section file name into its parts.
+
+    Args:
+        name (str): Section file name or path, e.g. "COMSC110.01S25.SEC".
+
+    Returns:
+        dict: {'course', 'number', 'term'} - each value is '' if the name
+              does not follow the COURSE.NNTERM pattern.
+    """
+    match = _SECTION_NAME.match(os.path.basename(name).strip())
+    if match is None:
+        return {'course': '', 'number': '', 'term': ''}
+    return {
+        'course': match.group('course'),
+        'number': match.group('number'),
+        'term': match.group('term').upper(),
+    }
+
+
+def term_sort_key(term):
+    """
+    Sort key that orders terms chronologically (S18 < F18 < S19).
+
+    Args:
+        term (str): Term code such as "F18" or "S25".
+
+    Returns:
+        tuple: (year, season order, term) - unknown terms sort first.
+    """
+    match = re.match(r'^([A-Za-z]+)(\d{2})$', str(term))
+    if match is None:
+        return (-1, -1, str(term))
+    season = match.group(1).upper()
+    return (2000 + int(match.group(2)), _SEASON_ORDER.get(season, len(_SEASON_ORDER)), season)
+
+
+def run_name(run_file):
+    """
+    Return the short name of a run file, e.g. "SPRING25" for .../SPRING25.RUN.
+
+    Args:
+        run_file (str): Path to the run file.
+
+    Returns:
+        str: The file name without its extension.
+    """
+    return os.path.splitext(os.path.basename(run_file))[0]
+
+
+def run_enrollments(run_file):
+    """
+    Build one row per student per section for every group in a run.
+
+    Sections are read through fileReader.cachedReadSEC, so building the table
+    right after the lists (or a prefetch) re-uses the parsed sections.
+
+    Args:
+        run_file (str): Path to the run file.
+
+    Returns:
+        pandas.DataFrame: Columns ENROLLMENT_COLUMNS. GradePoints is the GPA
+                          value of the grade, NaN for grades excluded from GPA
+                          (I, W, P, NP).
+    """
+    from zscore_calculator import ZScoreCalculator
+
+    run = run_name(run_file)
+    frames = []
+    for grp_file in runReader(run_file):
+        group = os.path.splitext(os.path.basename(grp_file))[0]
+        for sec_path in grpReader(run_file, [grp_file]):
+            try:
+                section_df = fileReader.cachedReadSEC(sec_path)
+                _, credit_hours = fileReader.readSECHeader(sec_path)
+            except Exception as e:
+                print(f"Warning: Could not read section {os.path.basename(sec_path)}: {e}")
+                continue
+            if section_df.empty:
+                continue
+
+            section = os.path.basename(sec_path)
+            parts = parse_section_name(section)
+            section_df = section_df.rename(columns={'ID': 'id'})
+            section_df['run'] = run
+            section_df['group'] = group
+            section_df['section'] = section
+            section_df['course'] = parts['course']
+            section_df['term'] = parts['term']
+            section_df['credit_hours'] = credit_hours
+            frames.append(section_df)
+
+    if not frames:
+        return pd.DataFrame(columns=ENROLLMENT_COLUMNS)
+
+    enrollments = pd.concat(frames, ignore_index=True)
+    # Names come from "Last, First" so strip the space left after the comma
+    enrollments['FirstName'] = enrollments['FirstName'].str.strip()
+    enrollments['LastName'] = enrollments['LastName'].str.strip()
+    enrollments['credit_hours'] = enrollments['credit_hours'].astype(float)
+    enrollments['GradePoints'] = pd.to_numeric(
+        enrollments['Grade'].map(ZScoreCalculator.letter_to_gpa), errors='coerce'
+    )
+    return enrollments.reindex(columns=ENROLLMENT_COLUMNS)
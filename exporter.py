@@ -0,0 +1,264 @@
+"""
+Streaming export of DataFrames to CSV, HTML and Excel files.
+
+Rows are written in chunks, so the fully rendered table is never held in
+memory. Several formats can be written in one pass over the data, and the
+export can run on a worker thread that reports progress.
+
+Provides:
+  - EXPORT_FORMATS: file extension -> format name.
+  - export_dataframe: write data to one or more files, chunk by chunk.
+  - export_in_background: run export_dataframe on a worker thread.
+"""
+
+import html
+import os
+import threading
+
+import pandas as pd
+
+# File extensions understood by export_dataframe
+EXPORT_FORMATS = {
+    '.csv': 'csv',
+    '.html': 'html',
+    '.htm': 'html',
+    '.xlsx': 'xlsx',
+}
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class _CsvWriter:
+    """Append chunks to a CSV file, writing the header once."""
+
+    def __init__(self, path, index):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.index = index
+        self.header_written = False
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, index=self.index, header=not self.header_written)
+        self.header_written = True
+
+    def close(self):
+        self.file.close()
+
+
+class _HtmlWriter:
+    """Stream table rows into an HTML file laid out like DataFrame.to_html."""
+
+    def __init__(self, path, index):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.index = index
+        self.started = False
+
+    def _start(self, chunk):
+        columns = ([chunk.index.name or ''] if self.index else []) + [str(col) for col in chunk.columns]
+        header_cells = "".join(f"      <th>{html.escape(col, quote=False)}</th>\n" for col in columns)
+        self.file.write(
+            '<table border="1" class="dataframe">\n'
+            '  <thead>\n'
+            '    <tr style="text-align: right;">\n'
+            f'{header_cells}'
+            '    </tr>\n'
+            '  </thead>\n'
+            '  <tbody>\n'
+        )
+        self.started = True
+
+    def write(self, chunk):
+        if not self.started:
+            self._start(chunk)
+        # pandas formats and escapes the cells, so they read exactly like to_html
+        # (float columns are padded to the same decimals within a chunk)
+        table = chunk.to_html(index=self.index, header=False)
+        start = table.index('  <tbody>\n') + len('  <tbody>\n')
+        self.file.write(table[start:table.rindex('  </tbody>')])
+
+    def close(self):
+        try:
+            if self.started:
+                self.file.write('  </tbody>\n</table>\n')
+        finally:
+            self.file.close()
+
+
+class _XlsxWriter:
+    """Append chunks to an Excel sheet using openpyxl's write-only mode."""
+
+    def __init__(self, path, index):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("Please install the 'openpyxl' library to export to Excel.\nRun: pip install openpyxl")
+        self.path = path
+        self.index = index
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Sheet1")
+        self.header_written = False
+
+    def write(self, chunk):
+        if not self.header_written:
+            header = ([chunk.index.name or ''] if self.index else []) + [str(col) for col in chunk.columns]
+            self.sheet.append(header)
+            self.header_written = True
+        # openpyxl wants plain Python values, with empty cells for missing data
+        cells = chunk.astype(object).where(chunk.notna(), None)
+        for row in cells.itertuples(index=self.index, name=None):
+            self.sheet.append([_excel_value(value) for value in row])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+_WRITERS = {
+    'csv': _CsvWriter,
+    'html': _HtmlWriter,
+    'xlsx': _XlsxWriter,
+}
+
+
+def _excel_value(value):
+    """Convert numpy scalars to the Python types openpyxl accepts."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _iter_chunks(data, chunk_size):
+    """Yield DataFrame chunks from a DataFrame or an iterable of DataFrames."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_size):
+            yield data.iloc[start:start + chunk_size]
+        if len(data) == 0:
+            yield data
+    else:
+        for chunk in data:
+            yield chunk
+
+
+def export_format(path):
+    """
+    Return the export format for a file path based on its extension.
+
+    Args:
+        path (str): Output file path.
+
+    Returns:
+        str: 'csv', 'html' or 'xlsx'.
+
+    Raises:
+        ValueError: If the extension is not one of EXPORT_FORMATS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export file type: {extension or path}")
+    return EXPORT_FORMATS[extension]
+
+
+def export_dataframe(data, paths, index=False, chunk_size=DEFAULT_CHUNK_SIZE,
+                     progress=None, cancel_event=None, total_rows=None):
+    """
+    Write data to one or more files in a single pass, chunk by chunk.
+
+    Each output is written to a temporary file next to its target and renamed
+    into place only when the whole export succeeds, so a failed or cancelled
+    export never leaves a half-written file behind.
+
+    Args:
+        data (DataFrame or iterable of DataFrame): The rows to export. An
+            iterable is consumed once, so it can be a generator of chunks.
+        paths (str or list of str): Output file(s); the format of each comes
+            from its extension (.csv, .html/.htm, .xlsx).
+        index (bool): Write the DataFrame index as the first column.
+        chunk_size (int): Rows per chunk when data is a single DataFrame.
+        progress (callable, optional): Called as progress(rows_written, total_rows)
+            after every chunk; total_rows is None if it is not known.
+        cancel_event (threading.Event, optional): Stop early when set.
+        total_rows (int, optional): Row count to report when data is an iterable.
+
+    Returns:
+        int: Number of data rows written to each file.
+
+    Raises:
+        ValueError: If a path has an unsupported extension.
+        ImportError: If Excel output is requested without openpyxl.
+        InterruptedError: If cancel_event was set before the export finished.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    formats = [export_format(path) for path in paths]
+    if isinstance(data, pd.DataFrame):
+        total_rows = len(data)
+
+    temp_paths = [f"{path}.part" for path in paths]
+    writers = []
+    rows_written = 0
+    succeeded = False
+    try:
+        for fmt, temp_path in zip(formats, temp_paths):
+            writers.append(_WRITERS[fmt](temp_path, index))
+
+        for chunk in _iter_chunks(data, chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Export cancelled.")
+            for writer in writers:
+                writer.write(chunk)
+            rows_written += len(chunk)
+            if progress is not None:
+                progress(rows_written, total_rows)
+
+        for writer in writers:
+            writer.close()
+        writers = []
+        for temp_path, path in zip(temp_paths, paths):
+            os.replace(temp_path, path)
+        succeeded = True
+    finally:
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        if not succeeded:
+            for temp_path in temp_paths:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    return rows_written
+
+
+def export_in_background(data, paths, on_progress=None, on_done=None, **kwargs):
+    """
+    Run export_dataframe on a daemon worker thread.
+
+    The callbacks are called from the worker thread; GUI code should hand them
+    over to its own thread (e.g. through a queue polled with after()).
+
+    Args:
+        data (DataFrame or iterable of DataFrame): The rows to export.
+        paths (str or list of str): Output file(s).
+        on_progress (callable, optional): progress(rows_written, total_rows).
+        on_done (callable, optional): Called as on_done(rows_written, error)
+            when the export ends; error is None on success.
+        **kwargs: Passed through to export_dataframe (index, chunk_size, ...).
+
+    Returns:
+        tuple: (thread, cancel_event) - set the event to cancel the export.
+    """
+    cancel_event = kwargs.pop('cancel_event', None) or threading.Event()
+
+    def worker():
+        try:
+            rows = export_dataframe(data, paths, progress=on_progress,
+                                    cancel_event=cancel_event, **kwargs)
+        except Exception as e:
+            if on_done is not None:
+                on_done(0, e)
+            return
+        if on_done is not None:
+            on_done(rows, None)
+
+    thread = threading.Thread(target=worker, name="Exporter", daemon=True)
+    thread.start()
+    return thread, cancel_event
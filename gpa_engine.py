@@ -0,0 +1,225 @@
+"""
+Credit-hour weighted term and cumulative GPAs for every student.
+
+Each enrollment contributes credit_hours * grade points to its student's term.
+Term and cumulative GPAs for all students are computed together with a single
+grouped reduction (np.bincount over one integer key per student and term)
+followed by a cumulative sum, with no per-student Python loop.
+
+Results are materialized so lists, reports and the GUIs can reuse them: run
+GPAs are cached in the process until one of the run's section files changes,
+and corpus GPAs are stored as a columnar table next to the section catalog.
+
+Provides:
+  - GPA_COLUMNS: columns of the term GPA table.
+  - grade_points: vectorized letter grade -> grade points.
+  - compute_gpas: term and cumulative GPAs from an enrollment table.
+  - cumulative_gpas: the latest cumulative GPA of each student.
+  - run_gpas: GPAs over every section of a run (cached).
+  - corpus_gpas: GPAs over every section in a Sections folder (materialized).
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from enrollments import term_sort_key
+
+# Columns of the term GPA table, in order
+GPA_COLUMNS = ['id', 'term', 'term_credits', 'term_points', 'term_gpa',
+               'cumulative_credits', 'cumulative_points', 'cumulative_gpa']
+
+# Run GPAs computed in this process: abspath -> (signature, DataFrame)
+_run_cache = {}
+_run_cache_lock = threading.Lock()
+
+_CORPUS_TABLE = "student_gpa"
+
+
+def grade_points(grades):
+    """
+    Convert letter grades to grade points, looking up each distinct grade once.
+
+    Args:
+        grades (array-like of str): Letter grades.
+
+    Returns:
+        np.ndarray: float grade points; NaN for grades excluded from GPA (I, W, P, NP).
+    """
+    from zscore_calculator import ZScoreCalculator
+
+    uniques, inverse = np.unique(np.asarray(grades, dtype=str), return_inverse=True)
+    table = np.array([ZScoreCalculator.letter_to_gpa(grade) for grade in uniques], dtype=float)
+    return table[inverse] if len(uniques) else np.array([], dtype=float)
+
+
+def compute_gpas(enrollments):
+    """
+    Compute credit-weighted term and cumulative GPAs for every student.
+
+    Grades excluded from GPA (I, W, P, NP) and sections without credit hours
+    carry no weight. Terms are ordered chronologically (S18 < F18 < S19), so a
+    student's cumulative GPA at a term includes every earlier term.
+
+    Args:
+        enrollments (pd.DataFrame): One row per student per section with
+            'id', 'term', 'credit_hours' and a 'Grade' or 'grade' column
+            (run_enrollments output or a catalog transcript).
+
+    Returns:
+        pd.DataFrame: Columns GPA_COLUMNS, one row per student and term, in
+            chronological order within each student. GPAs are NaN when no
+            credits counted.
+    """
+    if enrollments.empty:
+        return pd.DataFrame(columns=GPA_COLUMNS)
+
+    grade_column = 'Grade' if 'Grade' in enrollments.columns else 'grade'
+    points = grade_points(enrollments[grade_column].astype(str).to_numpy())
+    credits = pd.to_numeric(enrollments['credit_hours'], errors='coerce').to_numpy(dtype=float)
+    counted = ~(np.isnan(points) | np.isnan(credits))
+    weights = np.where(counted, credits, 0.0)
+    quality = np.where(counted, credits * np.nan_to_num(points), 0.0)
+
+    id_codes, id_values = pd.factorize(enrollments['id'].astype(str))
+    term_codes, term_values = pd.factorize(enrollments['term'].fillna('').astype(str))
+    # Rank terms chronologically so the (student, term) key sorts by student, then time
+    chronological = sorted(range(len(term_values)), key=lambda code: term_sort_key(term_values[code]))
+    term_rank = np.empty(len(term_values), dtype=np.int64)
+    term_rank[chronological] = np.arange(len(term_values))
+    ordered_terms = np.asarray(term_values, dtype=object)[chronological]
+
+    # One grouped reduction over the (student, term) key
+    keys = id_codes.astype(np.int64) * len(term_values) + term_rank[term_codes]
+    groups, inverse = np.unique(keys, return_inverse=True)
+    term_credits = np.bincount(inverse, weights=weights, minlength=len(groups))
+    term_points = np.bincount(inverse, weights=quality, minlength=len(groups))
+
+    # Cumulative sums restart at each student's first term
+    group_ids = groups // len(term_values)
+    starts = np.r_[0, np.flatnonzero(np.diff(group_ids)) + 1]
+    lengths = np.diff(np.r_[starts, len(groups)])
+    running_credits = np.cumsum(term_credits)
+    running_points = np.cumsum(term_points)
+    offset_credits = np.repeat(running_credits[starts] - term_credits[starts], lengths)
+    offset_points = np.repeat(running_points[starts] - term_points[starts], lengths)
+    cumulative_credits = running_credits - offset_credits
+    cumulative_points = running_points - offset_points
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        term_gpa = np.where(term_credits > 0, term_points / term_credits, np.nan)
+        cumulative_gpa = np.where(cumulative_credits > 0, cumulative_points / cumulative_credits, np.nan)
+
+    return pd.DataFrame({
+        'id': np.asarray(id_values, dtype=object)[group_ids],
+        'term': ordered_terms[groups % len(term_values)],
+        'term_credits': term_credits,
+        'term_points': term_points,
+        'term_gpa': term_gpa,
+        'cumulative_credits': cumulative_credits,
+        'cumulative_points': cumulative_points,
+        'cumulative_gpa': cumulative_gpa,
+    }, columns=GPA_COLUMNS)
+
+
+def cumulative_gpas(term_gpas):
+    """
+    Return each student's cumulative GPA as of their latest term.
+
+    Args:
+        term_gpas (pd.DataFrame): Output of compute_gpas (or run_gpas/corpus_gpas).
+
+    Returns:
+        pd.DataFrame: Columns id, last_term, credits, gpa - one row per student.
+    """
+    latest = term_gpas.drop_duplicates(subset='id', keep='last')
+    return pd.DataFrame({
+        'id': latest['id'].to_numpy(),
+        'last_term': latest['term'].to_numpy(),
+        'credits': latest['cumulative_credits'].to_numpy(),
+        'gpa': latest['cumulative_gpa'].to_numpy(),
+    })
+
+
+def _run_signature(run_file):
+    """Section files of a run with their (mtime, size), to detect edits."""
+    from run_parser import runReader
+    from grp_parser import grpReader
+
+    signature = []
+    for grp_file in runReader(run_file):
+        for sec_path in grpReader(run_file, [grp_file]):
+            try:
+                stat = os.stat(sec_path)
+                signature.append((sec_path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((sec_path, None, None))
+    return tuple(signature)
+
+
+def run_gpas(run_file):
+    """
+    Credit-weighted term and cumulative GPAs over every section of a run.
+
+    The result is cached for the process and recomputed only when one of the
+    run's section files changes.
+
+    Args:
+        run_file (str): Path to the run file.
+
+    Returns:
+        pd.DataFrame: Columns GPA_COLUMNS (a copy, safe to modify).
+    """
+    from enrollments import run_enrollments
+
+    key = os.path.abspath(run_file)
+    signature = _run_signature(run_file)
+    with _run_cache_lock:
+        cached = _run_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
+    gpas = compute_gpas(run_enrollments(run_file))
+    with _run_cache_lock:
+        _run_cache[key] = (signature, gpas)
+    return gpas.copy()
+
+
+def corpus_gpas(sections_dir, catalog=None):
+    """
+    Credit-weighted term and cumulative GPAs over every section in a folder.
+
+    The catalog is refreshed first; the GPA table is stored next to it (as a
+    columnar table) and recomputed only when a section was added, edited or
+    removed since it was written.
+
+    Args:
+        sections_dir (str): Folder holding the .sec files.
+        catalog (SectionCatalog, optional): Catalog to use instead of opening one.
+
+    Returns:
+        pd.DataFrame: Columns GPA_COLUMNS.
+    """
+    import columnar_store
+    from catalog import SectionCatalog
+
+    catalog = catalog or SectionCatalog(sections_dir)
+    catalog.refresh()
+    signature = catalog.signature()
+    signature_path = os.path.join(catalog.cache_dir, _CORPUS_TABLE + ".signature")
+
+    if os.path.exists(signature_path):
+        with open(signature_path, 'r') as file:
+            stored = file.read().strip()
+        if stored == signature:
+            gpas = columnar_store.read_table(catalog.cache_dir, _CORPUS_TABLE)
+            if not gpas.empty:
+                return gpas.reindex(columns=GPA_COLUMNS)
+
+    gpas = compute_gpas(catalog.index.enrollments())
+    columnar_store.write_table(gpas, catalog.cache_dir, _CORPUS_TABLE, partition_by=())
+    with open(signature_path, 'w') as file:
+        file.write(signature)
+    return gpas
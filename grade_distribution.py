@@ -0,0 +1,198 @@
+"""
+Grade-distribution anomaly tests for every section at once.
+
+The z-test only compares means. These tests compare the whole grade
+distribution of a section with the rest of its group: every section is one
+row of a (sections x 13 grades) histogram matrix, and the chi-square or G
+statistic of each section-vs-rest 2 x 13 table is computed for all rows
+together with array arithmetic.
+
+Provides:
+  - GRADE_BINS: the 13 letter grades that count towards GPA, in order.
+  - histogram_matrix: (sections x grades) count matrix from an enrollment table.
+  - distribution_tests: chi-square / G statistics and p-values for every row.
+  - run_distribution_anomalies: tests for every section of a run against its group.
+  - corpus_distribution_anomalies: tests for every section on file against its course.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Grades that count towards GPA; I, W, P and NP are left out like in the z-test
+GRADE_BINS = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F']
+
+# Columns of the anomaly table, in order
+ANOMALY_COLUMNS = ['group', 'section', 'n', 'statistic', 'df', 'p_value', 'effect_size', 'significant']
+
+
+def histogram_matrix(enrollments, grade_column='Grade', section_column='section', group_column='group'):
+    """
+    Count the grades of every section in one pass.
+
+    Args:
+        enrollments (pd.DataFrame): One row per student per section.
+        grade_column (str): Column holding the letter grade.
+        section_column (str): Column identifying the section.
+        group_column (str): Column identifying the section's group.
+
+    Returns:
+        tuple: (keys, counts)
+            keys (pd.DataFrame): group and section of each row of counts.
+            counts (np.ndarray): int64 (sections x len(GRADE_BINS)) matrix.
+    """
+    grade_codes = pd.Categorical(enrollments[grade_column].astype(str).str.strip(), categories=GRADE_BINS).codes
+    counted = grade_codes >= 0
+    rows = enrollments.loc[counted, [group_column, section_column]]
+    row_codes, keys = pd.factorize(pd.MultiIndex.from_frame(rows))
+    n_bins = len(GRADE_BINS)
+    flat = np.bincount(row_codes.astype(np.int64) * n_bins + grade_codes[counted], minlength=len(keys) * n_bins)
+    keys = keys.to_frame(index=False, name=['group', 'section']) if len(keys) else pd.DataFrame(
+        columns=['group', 'section'])
+    return keys, flat.reshape(len(keys), n_bins)
+
+
+def chi2_sf(statistic, df):
+    """
+    Upper-tail probability of the chi-square distribution, for arrays.
+
+    Uses scipy.special.gammaincc when scipy is installed, otherwise the
+    Wilson-Hilferty normal approximation (accurate to about two decimals in
+    the tail, which is enough to rank and flag sections).
+
+    Args:
+        statistic (array-like): Test statistics.
+        df (array-like): Degrees of freedom (NaN where the test is undefined).
+
+    Returns:
+        np.ndarray: p-values (NaN where df < 1).
+    """
+    from zscore_calculator import erfc
+
+    statistic = np.asarray(statistic, dtype=float)
+    df = np.asarray(df, dtype=float)
+    valid = df >= 1
+    safe_df = np.where(valid, df, 1.0)
+    try:
+        from scipy.special import gammaincc
+        p = gammaincc(safe_df / 2.0, np.maximum(statistic, 0.0) / 2.0)
+    except ImportError:
+        scaled = np.cbrt(np.maximum(statistic, 0.0) / safe_df)
+        z = (scaled - (1 - 2 / (9 * safe_df))) / np.sqrt(2 / (9 * safe_df))
+        p = 0.5 * erfc(z / math.sqrt(2))
+    return np.where(valid, np.clip(p, 0.0, 1.0), np.nan)
+
+
+def distribution_tests(counts, group_codes, method='g'):
+    """
+    Test every section's grade histogram against the rest of its group.
+
+    Each section forms a 2 x 13 table with the rest of its group (the group's
+    totals minus the section). Expected counts come from the group's overall
+    distribution, and all sections are scored at once.
+
+    Args:
+        counts (np.ndarray): (sections x grades) histogram matrix.
+        group_codes (np.ndarray): int group code of each row.
+        method (str): 'g' (G-test, the default) or 'chi2' (Pearson chi-square).
+
+    Returns:
+        dict: Arrays with one entry per section - 'statistic', 'df',
+            'p_value' and 'effect_size' (Cramer's V, sqrt(statistic / n_group)).
+            NaN when the section is alone in its group or the group has a
+            single grade.
+
+    Raises:
+        ValueError: If method is not 'g' or 'chi2'.
+    """
+    if method not in ('g', 'chi2'):
+        raise ValueError(f"method must be 'g' or 'chi2', not {method!r}")
+    counts = np.asarray(counts, dtype=float)
+    group_codes = np.asarray(group_codes)
+    n_groups = int(group_codes.max()) + 1 if len(group_codes) else 0
+
+    group_totals = np.zeros((n_groups, counts.shape[1]))
+    np.add.at(group_totals, group_codes, counts)
+    column_totals = group_totals[group_codes]                       # (S x K)
+    group_n = column_totals.sum(axis=1)                             # (S,)
+    section_n = counts.sum(axis=1)
+    rest = column_totals - counts
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = column_totals / group_n[:, np.newaxis]
+        expected_section = section_n[:, np.newaxis] * share
+        expected_rest = (group_n - section_n)[:, np.newaxis] * share
+        if method == 'chi2':
+            terms = ((counts - expected_section) ** 2 / expected_section
+                     + (rest - expected_rest) ** 2 / expected_rest)
+        else:
+            terms = 2 * (np.where(counts > 0, counts * np.log(counts / expected_section), 0.0)
+                         + np.where(rest > 0, rest * np.log(rest / expected_rest), 0.0))
+    # Grades nobody in the group received carry no information
+    statistic = np.where(column_totals > 0, terms, 0.0).sum(axis=1)
+
+    df = (column_totals > 0).sum(axis=1) - 1.0
+    undefined = (df < 1) | (section_n == 0) | (section_n == group_n)
+    statistic = np.where(undefined, np.nan, statistic)
+    df = np.where(undefined, np.nan, df)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        effect = np.sqrt(statistic / group_n)
+    return {'statistic': statistic, 'df': df, 'p_value': chi2_sf(statistic, df), 'effect_size': effect}
+
+
+def _anomaly_table(enrollments, group_column, method, alpha):
+    """Build the anomaly table for an enrollment table grouped by group_column."""
+    if enrollments.empty:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    grade_column = 'Grade' if 'Grade' in enrollments.columns else 'grade'
+    keys, counts = histogram_matrix(enrollments, grade_column=grade_column, group_column=group_column)
+    if keys.empty:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    tests = distribution_tests(counts, pd.factorize(keys['group'])[0], method)
+    table = keys.assign(n=counts.sum(axis=1), statistic=np.round(tests['statistic'], 3), df=tests['df'],
+                        p_value=np.round(tests['p_value'], 5), effect_size=np.round(tests['effect_size'], 3))
+    table['significant'] = (tests['p_value'] < alpha)
+    for bin_index, grade in enumerate(GRADE_BINS):
+        table[grade] = counts[:, bin_index]
+    return table.sort_values(['p_value', 'effect_size'], ascending=[True, False], na_position='last',
+                             kind='stable').reset_index(drop=True)
+
+
+def run_distribution_anomalies(run_file, method='g', alpha=0.05):
+    """
+    Test the grade distribution of every section of a run against its group.
+
+    Args:
+        run_file (str): Path to the run file.
+        method (str): 'g' (default) or 'chi2'.
+        alpha (float): Significance level (default 0.05).
+
+    Returns:
+        pd.DataFrame: Columns ANOMALY_COLUMNS followed by the 13 grade counts,
+            most unusual sections first.
+    """
+    from enrollments import run_enrollments
+
+    return _anomaly_table(run_enrollments(run_file), 'group', method, alpha)
+
+
+def corpus_distribution_anomalies(sections_dir, method='g', alpha=0.05, catalog=None):
+    """
+    Test every section on file against all sections of the same course.
+
+    Args:
+        sections_dir (str): Folder holding the .sec files.
+        method (str): 'g' (default) or 'chi2'.
+        alpha (float): Significance level (default 0.05).
+        catalog (SectionCatalog, optional): Catalog to use instead of opening one.
+
+    Returns:
+        pd.DataFrame: Like run_distribution_anomalies, with the course as group.
+    """
+    from catalog import SectionCatalog
+
+    catalog = catalog or SectionCatalog(sections_dir)
+    catalog.refresh()
+    enrollments = catalog.index.enrollments().rename(columns={'course': 'group'})
+    return _anomaly_table(enrollments, 'group', method, alpha)
@@ -0,0 +1,196 @@
+"""
+Incremental z-score analysis that only re-reads the sections that changed.
+
+Every section keeps its sufficient statistics (count, sum and sum of squares
+of its grade points, plus its grade counts), and every group keeps the totals
+of its sections. When a section file changes, its old statistics are
+subtracted from each group that lists it and the new ones added, so a group's
+mean and standard deviation are updated without touching its other sections.
+Only the z/p rows of the affected groups are recomputed.
+
+Provides:
+  - IncrementalAnalyzer: keeps a run's z-scores up to date as sections change.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from FileReader import fileReader
+from zscore_calculator import ZScoreCalculator
+
+# Columns of IncrementalAnalyzer.results(), in order
+RESULT_COLUMNS = ['group', 'section', 'section_gpa', 'section_count', 'n', 'group_gpa', 'group_std',
+                  'z_score', 'p_value', 'significant', 'performance', 'updated_at']
+
+
+class IncrementalAnalyzer:
+    """
+    Z-scores of a run's sections that can be refreshed section by section.
+
+    With group_by='run' every section is compared with all sections of the
+    run pooled together, like ZScoreCalculator.analyze_sections; with
+    group_by='group' each section is compared with its own group, like
+    ZScoreCalculator.analyze_groups.
+    """
+
+    def __init__(self, run_file, grp_files=None, threshold=2.0, group_by='run'):
+        """
+        Read every section of the run once and compute the first z-scores.
+
+        Args:
+            run_file (str): Path to the run file.
+            grp_files (list of str, optional): Group files to include (default:
+                every group in the run).
+            threshold (float): Z-score threshold for significance (default 2.0).
+            group_by (str): 'run' (one pooled population) or 'group'.
+
+        Raises:
+            ValueError: If group_by is not 'run' or 'group'.
+        """
+        from run_parser import runReader
+        from grp_parser import grpReader
+
+        if group_by not in ('run', 'group'):
+            raise ValueError(f"group_by must be 'run' or 'group', not {group_by!r}")
+        self.run_file = run_file
+        self.threshold = threshold
+        self.group_by = group_by
+
+        # section path -> groups it belongs to; group -> its section paths
+        self._groups_of = {}
+        self._members = {}
+        for grp_file in (grp_files if grp_files is not None else runReader(run_file)):
+            group = os.path.splitext(os.path.basename(grp_file))[0] if group_by == 'group' else 'run'
+            for sec_path in grpReader(run_file, [grp_file]):
+                members = self._members.setdefault(group, [])
+                if sec_path not in members:
+                    members.append(sec_path)
+                    self._groups_of.setdefault(sec_path, []).append(group)
+
+        # section path -> {'n', 'total', 'total_sq', 'counts', 'signature', 'updated_at'}
+        self._stats = {}
+        # group -> np.array([n, total, total_sq])
+        self._totals = {group: np.zeros(3) for group in self._members}
+        # group -> DataFrame of that group's result rows
+        self._rows = {}
+        # One entry per refresh that changed something
+        self.refresh_log = []
+        self.refresh(list(self._groups_of))
+
+    @staticmethod
+    def _signature(path):
+        """(mtime_ns, size) of a section file, or None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _section_stats(path, signature):
+        """Sufficient statistics of one section file."""
+        from gpa_engine import grade_points
+
+        stats = {'n': 0, 'total': 0.0, 'total_sq': 0.0, 'counts': {}, 'signature': signature,
+                 'updated_at': datetime.now().isoformat(timespec='seconds')}
+        if signature is None:
+            return stats
+        try:
+            grades = fileReader.cachedReadSEC(path)['Grade'].astype(str).to_numpy()
+        except Exception as e:
+            print(f"Error reading section {path}: {e}")
+            return stats
+        points = grade_points(grades)
+        valid = ~np.isnan(points)
+        points = points[valid]
+        graded, counts = np.unique(grades[valid], return_counts=True)
+        stats.update(n=len(points), total=float(points.sum()), total_sq=float((points ** 2).sum()),
+                     counts={grade: int(count) for grade, count in zip(graded, counts)})
+        return stats
+
+    def _changed_sections(self):
+        """Sections whose file was edited, added or removed since it was last read."""
+        return [path for path in self._groups_of
+                if path not in self._stats or self._stats[path]['signature'] != self._signature(path)]
+
+    def _recompute_group(self, group):
+        """Rebuild the z/p rows of one group from its sections' statistics."""
+        n, total, total_sq = self._totals[group]
+        mean = total / n if n else 0.0
+        std = float(np.sqrt(max(total_sq / n - mean ** 2, 0.0))) if n else 0.0
+
+        sections = self._members[group]
+        stats = [self._stats[path] for path in sections]
+        counts = np.array([entry['n'] for entry in stats], dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            section_gpa = np.where(counts > 0, np.array([entry['total'] for entry in stats]) / counts, 0.0)
+        z, p, significant = ZScoreCalculator._z_columns(section_gpa, mean, np.full(len(sections), std),
+                                                        self.threshold)
+        self._rows[group] = pd.DataFrame({
+            'group': group,
+            'section': sections,
+            'section_gpa': np.round(section_gpa, 3),
+            'section_count': [entry['counts'] for entry in stats],
+            'n': counts.astype(int),
+            'group_gpa': round(mean, 3),
+            'group_std': round(std, 3),
+            'z_score': np.round(z, 3),
+            'p_value': np.round(p, 5),
+            'significant': significant,
+            'performance': np.select([z > 0, z < 0], ['Above Average', 'Below Average'], 'Average'),
+            'updated_at': [entry['updated_at'] for entry in stats],
+        }, columns=RESULT_COLUMNS)
+
+    def refresh(self, sections=None):
+        """
+        Re-read changed sections and update the affected groups.
+
+        Args:
+            sections (list of str, optional): Section paths known to have
+                changed. If None, every section file of the run is stat'ed and
+                the ones whose mtime or size changed are refreshed.
+
+        Returns:
+            list of str: The sections that were re-read.
+        """
+        changed = self._changed_sections() if sections is None else [path for path in sections
+                                                                      if path in self._groups_of]
+        affected = set()
+        for path in changed:
+            old = self._stats.get(path)
+            new = self._section_stats(path, self._signature(path))
+            delta = np.array([new['n'], new['total'], new['total_sq']], dtype=float)
+            if old is not None:
+                delta -= np.array([old['n'], old['total'], old['total_sq']], dtype=float)
+            for group in self._groups_of[path]:
+                self._totals[group] += delta
+                affected.add(group)
+            self._stats[path] = new
+
+        for group in affected:
+            self._recompute_group(group)
+        if changed:
+            self.refresh_log.append({'time': datetime.now().isoformat(timespec='seconds'),
+                                     'sections': list(changed), 'groups': sorted(affected)})
+        return list(changed)
+
+    def results(self):
+        """
+        Return the current analysis.
+
+        Returns:
+            results (list of dict): Analysis per section, ready for JSON.
+            DataFrame: Columns RESULT_COLUMNS, sorted by |z_score| descending
+                within each group.
+        """
+        if not self._rows:
+            return [], pd.DataFrame(columns=RESULT_COLUMNS)
+        table = pd.concat([self._rows[group] for group in self._members if group in self._rows],
+                          ignore_index=True)
+        order = np.lexsort((-np.abs(np.nan_to_num(table['z_score'].to_numpy(dtype=float))),
+                            pd.factorize(table['group'])[0]))
+        table = table.iloc[order].reset_index(drop=True)
+        return table.to_dict('records'), table
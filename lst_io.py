@@ -0,0 +1,229 @@
+"""
+Streaming reader and writer for .lst student list files.
+
+A .lst file (see COMSC330_POC_Data/Some test data/good.lst and work.lst)
+lists every student on a list followed by the sections that put them there:
+
+    "AAkuQlN","Fxyhh, UgEryEh", 2
+    "COMSC111.11S11","A"
+    "ENGR123.11F21","A-"
+
+The writer makes a single pass over the classified enrollments: rows are
+grouped by student with a stable sort of the integer student codes, and each
+block of rows is written straight from the arrays without building a frame
+per student. The reader yields one student at a time, so large outputs can be
+compared with golden files without loading them whole.
+
+Provides:
+  - LST_COLUMNS: columns of read_lst.
+  - write_lst: write a .lst file from an enrollment table.
+  - write_run_lists: good.lst and work.lst for a run.
+  - iter_lst: stream (id, name, entries) records from a .lst file.
+  - read_lst: a .lst file as one row per student and section.
+  - compare_lst: entries found in only one of two .lst files.
+"""
+
+import csv
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Columns of read_lst, in order. As in fileReader.readSEC, FirstName is the
+# part of the name field before the comma and LastName the part after it.
+LST_COLUMNS = ['id', 'FirstName', 'LastName', 'section', 'grade']
+
+
+def _quote(value):
+    """Quote a field the way .lst files do."""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _column(df, *candidates):
+    """First of the candidate columns present in df."""
+    for column in candidates:
+        if column in df.columns:
+            return column
+    raise ValueError(f"The table has none of the columns {', '.join(candidates)}")
+
+
+def write_lst(enrollments, destination):
+    """
+    Write enrollments as a .lst file, one block per student.
+
+    Students appear in the order of their first row, and their sections in
+    table order; a student listed twice for the same section is written once.
+    The name is written in the order of the .sec name field: readSEC puts
+    the part before the comma in FirstName, so FirstName comes first.
+
+    Args:
+        enrollments (pd.DataFrame): Rows to list, with 'id' (or 'ID'),
+            'FirstName'/'LastName', 'section' (or 'section_source') and
+            'Grade' (or 'grade') - run_enrollments output, a Good/Work list
+            or a cohort.
+        destination (str or file): Path to write, or an open text file.
+
+    Returns:
+        int: Number of students written.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, 'w', newline='') as file:
+            return write_lst(enrollments, file)
+
+    id_column = _column(enrollments, 'id', 'ID')
+    section_column = _column(enrollments, 'section', 'section_source')
+    grade_column = _column(enrollments, 'Grade', 'grade')
+    rows = enrollments.drop_duplicates(subset=[id_column, section_column])
+    if rows.empty:
+        return 0
+
+    ids = rows[id_column].astype(str).str.strip().to_numpy(dtype=object)
+    first = rows[_column(rows, 'FirstName', 'FName')].fillna('').astype(str).str.strip().to_numpy(dtype=object)
+    last = rows[_column(rows, 'LastName', 'LName')].fillna('').astype(str).str.strip().to_numpy(dtype=object)
+    # Section names are listed without their .sec extension
+    sections = rows[section_column].astype(str).str.replace(r'\.sec$', '', case=False, regex=True).to_numpy(dtype=object)
+    grades = rows[grade_column].astype(str).str.strip().to_numpy(dtype=object)
+
+    # Group rows by student with one stable integer sort
+    codes = pd.factorize(ids)[0]
+    order = np.argsort(codes, kind='stable')
+    bounds = np.r_[0, np.flatnonzero(np.diff(codes[order])) + 1, len(order)]
+
+    write = destination.write
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        head = order[start]
+        write(f'{_quote(ids[head])},{_quote(f"{first[head]}, {last[head]}")}, {stop - start}\n')
+        for row in order[start:stop]:
+            write(f'{_quote(sections[row])},{_quote(grades[row])}\n')
+    return len(bounds) - 1
+
+
+def write_run_lists(run_file, output_dir):
+    """
+    Write good.lst and work.lst for a run.
+
+    The lists are the 'good' and 'work' cohorts of cohort_filter applied to
+    the run's enrollment table in one pass each.
+
+    Args:
+        run_file (str): Path to the run file.
+        output_dir (str): Folder to write good.lst and work.lst into.
+
+    Returns:
+        dict: {'good': path, 'work': path}.
+    """
+    from cohort_filter import compile_filter
+    from enrollments import run_enrollments
+
+    enrollments = run_enrollments(run_file)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name in ('good', 'work'):
+        paths[name] = os.path.join(output_dir, f"{name}.lst")
+        write_lst(compile_filter(name).apply(enrollments), paths[name])
+    return paths
+
+
+def iter_lst(path):
+    """
+    Stream the students of a .lst file.
+
+    Spacing after the commas is optional, and the last line may lack a newline.
+
+    Args:
+        path (str): Path to the .lst file.
+
+    Yields:
+        tuple: (id, name, entries) - name as written ("Last, First") and
+            entries as a list of (section, grade) pairs.
+
+    Raises:
+        ValueError: If a line is malformed or a student has fewer section
+            lines than their count says.
+    """
+    with open(path, 'r', newline='') as file:
+        reader = csv.reader(file, skipinitialspace=True)
+        student = None
+        expected = 0
+        entries = []
+        for line_number, fields in enumerate(reader, start=1):
+            if not fields or all(not field.strip() for field in fields):
+                continue
+            if student is None:
+                if len(fields) != 3:
+                    raise ValueError(f"{path}:{line_number}: expected \"ID\",\"Last, First\", count")
+                try:
+                    expected = int(fields[2])
+                except ValueError:
+                    raise ValueError(f"{path}:{line_number}: count {fields[2]!r} is not a number")
+                student = (fields[0].strip(), fields[1].strip())
+                entries = []
+            else:
+                if len(fields) != 2:
+                    raise ValueError(f"{path}:{line_number}: expected \"SECTION\",\"GRADE\"")
+                entries.append((fields[0].strip(), fields[1].strip()))
+            if student is not None and len(entries) == expected:
+                yield student[0], student[1], entries
+                student = None
+        if student is not None:
+            raise ValueError(f"{path}: student {student[0]} lists {len(entries)} of {expected} sections")
+
+
+def read_lst(path):
+    """
+    Read a .lst file as one row per student and section.
+
+    Args:
+        path (str): Path to the .lst file.
+
+    Returns:
+        pd.DataFrame: Columns LST_COLUMNS.
+    """
+    rows = []
+    for student_id, name, entries in iter_lst(path):
+        first, _, last = name.partition(',')
+        rows.extend((student_id, first.strip(), last.strip(), section, grade) for section, grade in entries)
+    return pd.DataFrame(rows, columns=LST_COLUMNS)
+
+
+def _name_key(name):
+    """A name field with the spacing around its comma normalized."""
+    return ', '.join(part.strip() for part in name.split(','))
+
+
+def compare_lst(expected_path, actual_path):
+    """
+    Compare two .lst files entry by entry, ignoring order and spacing.
+
+    Each entry is keyed by student id, name, section and grade, so a student
+    written under a different (or reversed) name counts as a difference.
+    Entries are counted rather than collected in a set, so a section listed
+    twice for a student (and the inflated count line that goes with it) is a
+    difference as well; count lines that do not match their entries make
+    iter_lst raise.
+
+    Args:
+        expected_path (str): The golden file.
+        actual_path (str): The file to check.
+
+    Returns:
+        pd.DataFrame: Columns id, name, section, grade, side - one row per
+            entry found more often in one file than in the other, side being
+            'expected' or 'actual'. Empty when the files agree.
+
+    Raises:
+        ValueError: If either file is malformed (see iter_lst).
+    """
+    def entries(path):
+        return Counter((student_id, _name_key(name), section.upper(), grade.upper())
+                       for student_id, name, listed in iter_lst(path) for section, grade in listed)
+
+    expected = entries(expected_path)
+    actual = entries(actual_path)
+    rows = ([(*entry, 'expected') for entry in sorted((expected - actual).elements())]
+            + [(*entry, 'actual') for entry in sorted((actual - expected).elements())])
+    return pd.DataFrame(rows, columns=['id', 'name', 'section', 'grade', 'side'])
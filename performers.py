@@ -0,0 +1,238 @@
+"""
+Top-N, bottom-N and percentile performer selection with partial sorting.
+
+The Good and Work lists pick students by letter grade. These lists rank them
+by GPA instead - per section, per group or over the whole run - and only the
+selected students are ever sorted:
+
+  - Top/bottom N: np.argpartition moves the N best (or worst) GPAs of a scope
+    to the front in O(n); only those N are then ordered for display.
+  - Percentile: np.partition finds the cutoff GPA of a scope in O(n), and
+    every student at or beyond it is selected (ties are kept together).
+
+Rows are grouped by scope with a stable sort of the integer scope codes (a
+radix sort), so a very large run costs O(n) plus the size of the selection.
+
+Provides:
+  - top_k_indices: indices of the k largest or smallest values, best first.
+  - percentile_cutoff: the value at a percentile, by partial selection.
+  - performer_scores: one credit-weighted GPA per student per scope.
+  - select_performers: top/bottom N or percentile students per scope.
+  - parse_selection: read a request like "top 10", "bottom 5%" or "top 3 by section".
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Scope -> columns that identify it in the enrollment table
+SCOPES = {'section': ['group', 'section'], 'group': ['group'], 'run': []}
+
+_SELECTION = re.compile(r'^\s*(top|bottom)\s+(\d+(?:\.\d+)?)\s*(%?)(?:\s+by\s+(section|group|run))?\s*$',
+                        re.IGNORECASE)
+
+# Columns of performer_scores, after the scope columns
+SCORE_COLUMNS = ['id', 'FirstName', 'LastName', 'gpa', 'credits', 'enrollments']
+
+
+def top_k_indices(values, k, largest=True):
+    """
+    Return the positions of the k largest (or smallest) values, best first.
+
+    NaN values are never selected. Only the k selected values are sorted.
+    When several values tie for the last place, the ones earliest in the
+    table are taken, so the result is the same as the first k of a stable
+    full sort.
+
+    Args:
+        values (array-like): Numeric values.
+        k (int): How many to select.
+        largest (bool): Select the largest values (default) or the smallest.
+
+    Returns:
+        np.ndarray: int64 positions into values, at most k of them.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    k = min(max(int(k), 0), len(valid))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    keys = -values[valid] if largest else values[valid]
+    if k < len(valid):
+        # argpartition picks an arbitrary subset of the values tied with the
+        # k-th one; keep every better value and the earliest of the ties
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+        better = np.flatnonzero(keys < kth)
+        tied = np.flatnonzero(keys == kth)[:k - len(better)]
+        chosen = np.concatenate([better, tied])
+    else:
+        chosen = np.arange(len(valid))
+    # Order the k chosen values; a stable sort keeps ties in table order
+    chosen = chosen[np.argsort(keys[chosen], kind='stable')]
+    return valid[chosen].astype(np.int64)
+
+
+def percentile_cutoff(values, percentile, largest=True):
+    """
+    Return the value that separates the top (or bottom) percentile.
+
+    Args:
+        values (array-like): Numeric values; NaN is ignored.
+        percentile (float): Share to select, in percent (0-100].
+        largest (bool): Cutoff for the top share (default) or the bottom share.
+
+    Returns:
+        float: The k-th best value, where k = ceil(n * percentile / 100);
+            NaN if there are no values.
+
+    Raises:
+        ValueError: If percentile is not in (0, 100].
+    """
+    if not 0 < percentile <= 100:
+        raise ValueError(f"percentile must be in (0, 100], not {percentile}")
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.nan
+    k = max(1, int(np.ceil(len(values) * percentile / 100.0)))
+    if largest:
+        return float(np.partition(values, len(values) - k)[len(values) - k])
+    return float(np.partition(values, k - 1)[k - 1])
+
+
+def performer_scores(enrollments, by='run'):
+    """
+    Credit-weighted GPA of every student within each scope.
+
+    Grades excluded from GPA (I, W, P, NP) are left out. With by='section'
+    the GPA is simply the grade points of that section.
+
+    Args:
+        enrollments (pd.DataFrame): run_enrollments output.
+        by (str): 'section', 'group' or 'run' (default).
+
+    Returns:
+        pd.DataFrame: The scope columns followed by SCORE_COLUMNS, in table
+            order (first enrollment of each student in the scope).
+
+    Raises:
+        ValueError: If by is unknown.
+    """
+    if by not in SCOPES:
+        raise ValueError(f"by must be one of {', '.join(SCOPES)}, not {by!r}")
+    columns = SCOPES[by] + SCORE_COLUMNS
+    points = pd.to_numeric(enrollments['GradePoints'], errors='coerce').to_numpy(dtype=float)
+    credits = pd.to_numeric(enrollments['credit_hours'], errors='coerce').to_numpy(dtype=float)
+    counted = ~np.isnan(points)
+    # Sections without credit hours still count, with weight 1
+    weights = np.where(np.isnan(credits) | (credits <= 0), 1.0, credits)
+    graded = enrollments[counted]
+    if graded.empty:
+        return pd.DataFrame(columns=columns)
+
+    keys = SCOPES[by] + ['id']
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(graded[keys].astype(str)))
+    weight = np.bincount(codes, weights=weights[counted], minlength=len(uniques))
+    quality = np.bincount(codes, weights=weights[counted] * points[counted], minlength=len(uniques))
+    first = np.full(len(uniques), len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+
+    scores = uniques.to_frame(index=False, name=keys)
+    rows = graded.iloc[first]
+    scores['FirstName'] = rows['FirstName'].to_numpy()
+    scores['LastName'] = rows['LastName'].to_numpy()
+    scores['gpa'] = np.round(quality / weight, 3)
+    scores['credits'] = weight
+    scores['enrollments'] = np.bincount(codes, minlength=len(uniques))
+    return scores[columns]
+
+
+def select_performers(enrollments, by='run', top=True, n=None, percentile=None):
+    """
+    Select the top or bottom students of each scope by GPA.
+
+    Give either n (top/bottom N per scope) or percentile (top/bottom share
+    per scope, ties at the cutoff included).
+
+    Args:
+        enrollments (pd.DataFrame): run_enrollments output.
+        by (str): 'section', 'group' or 'run' (default).
+        top (bool): Highest GPAs (default) or lowest.
+        n (int, optional): Students per scope.
+        percentile (float, optional): Percent of each scope's students.
+
+    Returns:
+        pd.DataFrame: The scope columns, 'rank' (1 = best for top lists,
+            worst for bottom lists) and SCORE_COLUMNS; ordered by scope, then rank.
+
+    Raises:
+        ValueError: If not exactly one of n and percentile is given, or by is unknown.
+    """
+    if (n is None) == (percentile is None):
+        raise ValueError("Give either n or percentile")
+    scores = performer_scores(enrollments, by)
+    columns = SCOPES[by] + ['rank'] + SCORE_COLUMNS
+    if scores.empty:
+        return pd.DataFrame(columns=columns)
+
+    gpa = scores['gpa'].to_numpy(dtype=float)
+    if SCOPES[by]:
+        scope_codes = pd.factorize(pd.MultiIndex.from_frame(scores[SCOPES[by]]))[0]
+    else:
+        scope_codes = np.zeros(len(scores), dtype=np.int64)
+    # Rows of each scope made contiguous with a stable integer sort
+    order = np.argsort(scope_codes, kind='stable')
+    bounds = np.r_[0, np.flatnonzero(np.diff(scope_codes[order])) + 1, len(order)]
+
+    picked = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        members = order[start:stop]
+        if n is not None:
+            chosen = members[top_k_indices(gpa[members], n, largest=top)]
+        else:
+            cutoff = percentile_cutoff(gpa[members], percentile, largest=top)
+            beyond = members[(gpa[members] >= cutoff) if top else (gpa[members] <= cutoff)]
+            chosen = beyond[top_k_indices(gpa[beyond], len(beyond), largest=top)]
+        picked.append(chosen)
+    picked = np.concatenate(picked) if picked else np.array([], dtype=np.int64)
+
+    selected = scores.iloc[picked].reset_index(drop=True)
+    # Competition ranking inside each scope: ties share the better rank
+    scope = scope_codes[picked]
+    values = gpa[picked]
+    new_scope = np.r_[True, scope[1:] != scope[:-1]]
+    new_value = new_scope | np.r_[True, values[1:] != values[:-1]]
+    row = np.arange(len(picked))
+    scope_start = np.maximum.accumulate(np.where(new_scope, row, 0))
+    tie_start = np.maximum.accumulate(np.where(new_value, row, 0))
+    selected['rank'] = tie_start - scope_start + 1
+    return selected[columns]
+
+
+def parse_selection(text):
+    """
+    Read a selection request such as "top 10", "bottom 5%" or "top 3 by section".
+
+    Args:
+        text (str): "top|bottom N[%] [by section|group|run]".
+
+    Returns:
+        dict: Keyword arguments for select_performers ('top', 'by' and
+            either 'n' or 'percentile'); by defaults to 'run'.
+
+    Raises:
+        ValueError: If text does not follow that form.
+    """
+    match = _SELECTION.match(text or '')
+    if match is None:
+        raise ValueError(f"Could not read {text!r}; use e.g. 'top 10', 'bottom 5%' or 'top 3 by section'")
+    direction, amount, percent, by = match.groups()
+    selection = {'top': direction.lower() == 'top', 'by': (by or 'run').lower()}
+    if percent:
+        selection['percentile'] = float(amount)
+    else:
+        if float(amount) != int(float(amount)):
+            raise ValueError(f"N must be a whole number, not {amount}")
+        selection['n'] = int(float(amount))
+    return selection
@@ -0,0 +1,209 @@
+"""
+Background prefetch of a run's groups, sections and performer lists.
+
+As soon as a RUN file is selected the GUIs can start a RunPrefetcher. It
+resolves the groups and sections, parses every section through
+fileReader.cachedReadSEC (warming the shared section cache used by
+GoodAndBadList and ZScoreCalculator) and then builds the good and bad lists,
+so the first click on Top Performers or Z-Score Analysis does not wait for
+parsing. The mtime and size of the run, group and section files are recorded
+before parsing, and results are dropped if any of those files changed since.
+
+Provides:
+  - RunPrefetcher: starts, cancels and serves results of a background prefetch.
+"""
+
+import os
+import threading
+import time
+
+
+class RunPrefetcher:
+    """
+    Prefetch the data for one run file on a background thread.
+
+    Only the most recently started run is kept: starting a new run cancels the
+    one in flight and drops its results. The worker gives up the interpreter
+    between sections so the GUI thread stays responsive.
+
+    Results (available through get) are stored under these keys:
+        'grp_files': group file paths from runReader.
+        'sec_files': section file paths from grpReader.
+        'good': Lists.goodList DataFrame.
+        'bad': Lists.badList DataFrame.
+
+    Results are only served while the files they were built from are
+    unchanged; an edited run, group or section file discards them.
+    """
+
+    def __init__(self, on_progress=None, on_done=None, pause=0.005):
+        """
+        Create an idle prefetcher.
+
+        Args:
+            on_progress (callable, optional): Called from the worker thread as
+                on_progress(run_file, done, total) after each section is parsed.
+            on_done (callable, optional): Called from the worker thread as
+                on_done(run_file) once every result is ready.
+            pause (float): Seconds to sleep between sections so the prefetch
+                runs at low priority (default 0.005).
+        """
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._run_file = None
+        self._results = {}
+        # Paths and (mtime_ns, size) of the files the results were built from
+        self._sources = []
+        self._signature = None
+        self._cancel_event = None
+        self._thread = None
+
+    @staticmethod
+    def _files_signature(paths):
+        """(path, mtime_ns, size) of each file, None for files that cannot be read."""
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def start(self, run_file):
+        """
+        Cancel any prefetch in flight and start one for run_file.
+
+        Args:
+            run_file (str): Path to the selected RUN file.
+        """
+        cancel_event = threading.Event()
+        with self._lock:
+            if self._cancel_event is not None:
+                self._cancel_event.set()
+            self._run_file = run_file
+            self._results = {}
+            self._sources = []
+            self._signature = None
+            self._cancel_event = cancel_event
+
+        self._thread = threading.Thread(
+            target=self._prefetch,
+            args=(run_file, cancel_event),
+            name="RunPrefetcher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the prefetch in flight (if any) and drop its results."""
+        with self._lock:
+            if self._cancel_event is not None:
+                self._cancel_event.set()
+            self._cancel_event = None
+            self._run_file = None
+            self._results = {}
+            self._sources = []
+            self._signature = None
+
+    def get(self, run_file, key):
+        """
+        Return a prefetched result for run_file, if it is ready.
+
+        Args:
+            run_file (str): RUN file the caller is working on.
+            key (str): One of 'grp_files', 'sec_files', 'good' or 'bad'.
+
+        Returns:
+            The prefetched value (DataFrames are copies), or None if the run
+            was not prefetched, that result is not ready yet, or a file it was
+            built from has changed since.
+        """
+        with self._lock:
+            if run_file != self._run_file:
+                return None
+            value = self._results.get(key)
+            sources, signature = self._sources, self._signature
+        if value is None:
+            return None
+        if signature is not None and self._files_signature(sources) != signature:
+            # A file was edited after the prefetch read it; recompute in the foreground
+            with self._lock:
+                if self._signature == signature:
+                    self._results = {}
+            return None
+        if hasattr(value, "copy"):
+            value = value.copy()
+        return value
+
+    def is_running(self):
+        """Return True while a prefetch thread is working."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _record_sources(self, run_file, cancel_event, paths):
+        """Remember the files the results are built from, as they are before parsing."""
+        signature = self._files_signature(paths)
+        with self._lock:
+            if cancel_event.is_set() or run_file != self._run_file:
+                return False
+            self._sources = list(paths)
+            self._signature = signature
+            return True
+
+    def _publish(self, run_file, cancel_event, key, value):
+        """Store a result unless the prefetch was cancelled meanwhile."""
+        with self._lock:
+            if cancel_event.is_set() or run_file != self._run_file:
+                return False
+            self._results[key] = value
+            return True
+
+    def _prefetch(self, run_file, cancel_event):
+        """Worker: resolve groups/sections, parse sections, build the lists."""
+        from run_parser import runReader
+        from grp_parser import grpReader
+        from FileReader import fileReader
+        from GoodAndBadList import Lists
+
+        try:
+            grp_files = runReader(run_file)
+            if not self._publish(run_file, cancel_event, 'grp_files', grp_files):
+                return
+            sec_files = grpReader(run_file, grp_files)
+
+            # Same path handling as Lists and ZScoreCalculator
+            base_dir = os.path.dirname(os.path.dirname(run_file))
+            sections_path = os.path.join(base_dir, "Sections")
+            # Stat before parsing, so an edit made while parsing also counts as a change
+            sources = [run_file] + list(grp_files) + [os.path.join(sections_path, sec) for sec in sec_files]
+            if not self._record_sources(run_file, cancel_event, sources):
+                return
+            if not self._publish(run_file, cancel_event, 'sec_files', sec_files):
+                return
+
+            for done, sec_file in enumerate(sec_files, 1):
+                if cancel_event.is_set():
+                    return
+                try:
+                    fileReader.cachedReadSEC(os.path.join(sections_path, sec_file))
+                except Exception as e:
+                    # Leave the error for the foreground read to report
+                    print(f"Prefetch: could not read section {sec_file}: {e}")
+                if self.on_progress is not None:
+                    self.on_progress(run_file, done, len(sec_files))
+                time.sleep(self.pause)
+
+            if cancel_event.is_set():
+                return
+            if not self._publish(run_file, cancel_event, 'good', Lists.goodList(run_file)):
+                return
+            if not self._publish(run_file, cancel_event, 'bad', Lists.badList(run_file)):
+                return
+        except Exception as e:
+            print(f"Prefetch of {run_file} stopped: {e}")
+            return
+
+        if self.on_done is not None and not cancel_event.is_set():
+            self.on_done(run_file)
@@ -0,0 +1,205 @@
+"""
+Resampling significance tests for section means against their group.
+
+The normal approximation in ZScoreCalculator says little about an 8-student
+section. These tests make no distributional assumption:
+
+  - Permutation test: under the null hypothesis a section's students are a
+    random draw (without replacement) from its group, so the group's grade
+    points are shuffled and re-split into sections of the same sizes. The
+    p-value is the share of shuffles whose section mean is at least as far
+    from the group mean as the observed one.
+  - Bootstrap: every section's students are resampled with replacement,
+    giving a percentile confidence interval for section mean - group mean.
+
+All sections are resampled at once: a batch of resamples is one 2-D array
+(resample x student), and every section mean comes out of one np.add.reduceat.
+Resamples are split into fixed-size chunks, each with its own child seed from
+np.random.SeedSequence, so results only depend on the seed - not on how many
+worker processes the chunks are spread across.
+
+Provides:
+  - group_arrays: grade points of a group, sorted by section.
+  - permutation_test: permutation p-value for every section.
+  - bootstrap_ci: bootstrap confidence interval of every section's difference.
+  - resample_sections: both, in one call.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_RESAMPLES = 10000
+
+# Resamples per chunk (one RNG stream and one unit of work for the pool)
+CHUNK_RESAMPLES = 500
+
+# Upper bound on the elements in one resample batch (rows x students)
+_BATCH_ELEMENTS = 2000000
+
+
+def group_arrays(section_values):
+    """
+    Lay out a group's grade points contiguously by section.
+
+    Args:
+        section_values (list of array-like): Grade points of each section, with
+            excluded grades already removed.
+
+    Returns:
+        tuple: (values, starts, counts) - all grade points as one float array,
+            and the start offset and size of each section inside it.
+    """
+    counts = np.array([len(values) for values in section_values], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64) if len(counts) else counts
+    values = np.concatenate([np.asarray(v, dtype=float) for v in section_values]) if len(counts) else np.array([])
+    return values, starts, counts
+
+
+def _section_means(batch, starts, counts):
+    """Mean of every section for every row of a (resample x student) batch."""
+    # reduceat needs valid offsets, so empty sections are summed as zero
+    nonempty = counts > 0
+    sums = np.zeros((batch.shape[0], len(counts)))
+    if nonempty.any():
+        sums[:, nonempty] = np.add.reduceat(batch, starts[nonempty], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def _batch_rows(n_values):
+    """Resamples per batch so one batch stays within _BATCH_ELEMENTS."""
+    return max(1, min(CHUNK_RESAMPLES, _BATCH_ELEMENTS // max(n_values, 1)))
+
+
+def _resample_chunk(values, starts, counts, n_resamples, seed_sequence):
+    """
+    Run one chunk of resamples (top-level so it can run in a worker process).
+
+    Returns:
+        tuple: (exceed, boot_diffs) - per-section count of permutations at
+            least as extreme as observed, and the (n_resamples x sections)
+            bootstrap differences section mean - group mean.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    group_mean = values.mean()
+    observed = np.abs(_section_means(values[np.newaxis, :], starts, counts)[0] - group_mean)
+    # Owning section of every student, for the bootstrap draws
+    section_of = np.repeat(np.arange(len(counts)), counts)
+    row_starts = starts[section_of]
+    row_counts = counts[section_of]
+
+    exceed = np.zeros(len(counts), dtype=np.int64)
+    boot_diffs = np.empty((n_resamples, len(counts)))
+    rows = _batch_rows(len(values))
+    done = 0
+    while done < n_resamples:
+        batch = min(rows, n_resamples - done)
+
+        # Permutation: shuffle the pooled group, re-split into the same section sizes
+        shuffled = rng.permuted(np.broadcast_to(values, (batch, len(values))), axis=1)
+        permuted = _section_means(shuffled, starts, counts)
+        # Tolerance so ties with the observed mean count as "at least as extreme"
+        exceed += (np.abs(permuted - group_mean) >= observed - 1e-12).sum(axis=0)
+
+        # Bootstrap: redraw each section's students from that section, with replacement
+        picks = row_starts + (rng.random((batch, len(values))) * row_counts).astype(np.int64)
+        drawn = values[picks]
+        boot_diffs[done:done + batch] = _section_means(drawn, starts, counts) - drawn.mean(axis=1, keepdims=True)
+        done += batch
+    return exceed, boot_diffs
+
+
+def resample_sections(values, starts, counts, n_resamples=DEFAULT_RESAMPLES, seed=None, workers=None,
+                      confidence=0.95):
+    """
+    Permutation p-values and bootstrap confidence intervals for every section of a group.
+
+    Args:
+        values (np.ndarray): Grade points of the whole group, contiguous by section
+            (see group_arrays).
+        starts (np.ndarray): Offset of each section in values.
+        counts (np.ndarray): Number of grade points of each section.
+        n_resamples (int): Resamples for each test (default 10000).
+        seed (int, optional): Seed for reproducible results.
+        workers (int, optional): Worker processes; 1 runs in this process,
+            None uses one per CPU when there is more than one chunk.
+        confidence (float): Confidence level of the interval (default 0.95).
+
+    Returns:
+        dict: Arrays with one entry per section:
+            'p_value': two-sided permutation p-value, (exceed + 1) / (n + 1).
+            'ci_low', 'ci_high': bootstrap percentile interval of
+                section mean - group mean.
+            NaN for sections without grade points.
+    """
+    values = np.asarray(values, dtype=float)
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    n_sections = len(counts)
+    if n_sections == 0 or len(values) == 0 or n_resamples <= 0:
+        empty = np.full(n_sections, np.nan)
+        return {'p_value': empty, 'ci_low': empty.copy(), 'ci_high': empty.copy()}
+
+    sizes = [CHUNK_RESAMPLES] * (n_resamples // CHUNK_RESAMPLES)
+    if n_resamples % CHUNK_RESAMPLES:
+        sizes.append(n_resamples % CHUNK_RESAMPLES)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers is None:
+        workers = min(len(sizes), os.cpu_count() or 1)
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_resample_chunk, [values] * len(sizes), [starts] * len(sizes),
+                                   [counts] * len(sizes), sizes, seeds))
+    else:
+        chunks = [_resample_chunk(values, starts, counts, size, child) for size, child in zip(sizes, seeds)]
+
+    exceed = sum(chunk[0] for chunk in chunks)
+    boot_diffs = np.concatenate([chunk[1] for chunk in chunks])
+    tail = (1 - confidence) / 2 * 100
+    ci_low, ci_high = np.percentile(boot_diffs, [tail, 100 - tail], axis=0)
+
+    p_value = (exceed + 1) / (n_resamples + 1)
+    empty = counts == 0
+    p_value[empty] = np.nan
+    ci_low[empty] = np.nan
+    ci_high[empty] = np.nan
+    return {'p_value': p_value, 'ci_low': ci_low, 'ci_high': ci_high}
+
+
+def permutation_test(section_values, n_resamples=DEFAULT_RESAMPLES, seed=None, workers=None):
+    """
+    Permutation p-value of every section's mean against its group.
+
+    Args:
+        section_values (list of array-like): Grade points of each section of one group.
+        n_resamples (int): Number of permutations (default 10000).
+        seed (int, optional): Seed for reproducible results.
+        workers (int, optional): Worker processes (see resample_sections).
+
+    Returns:
+        np.ndarray: Two-sided p-value per section.
+    """
+    values, starts, counts = group_arrays(section_values)
+    return resample_sections(values, starts, counts, n_resamples, seed, workers)['p_value']
+
+
+def bootstrap_ci(section_values, n_resamples=DEFAULT_RESAMPLES, seed=None, workers=None, confidence=0.95):
+    """
+    Bootstrap confidence interval of every section's mean minus its group mean.
+
+    Args:
+        section_values (list of array-like): Grade points of each section of one group.
+        n_resamples (int): Number of bootstrap resamples (default 10000).
+        seed (int, optional): Seed for reproducible results.
+        workers (int, optional): Worker processes (see resample_sections).
+        confidence (float): Confidence level (default 0.95).
+
+    Returns:
+        tuple: (ci_low, ci_high) arrays, one entry per section.
+    """
+    values, starts, counts = group_arrays(section_values)
+    result = resample_sections(values, starts, counts, n_resamples, seed, workers, confidence)
+    return result['ci_low'], result['ci_high']
@@ -0,0 +1,278 @@
+"""
+Course and department rollups materialized from the section catalog.
+
+Every row of the catalog's section table carries the section's graded count,
+grade-point sum and sum of squares and its grade histogram. Those sums add up,
+so the GPA, spread and grade distribution of any set of sections follow from
+the section rows alone - no .sec file is parsed to answer "COMSC110 across all
+its sections and terms" or "every COMSC course in F24".
+
+Three rollup levels are kept:
+
+  - course_term: one row per course and term.
+  - course: one row per course over every term on file.
+  - department: one row per department prefix (the letters of the course,
+    e.g. COMSC for COMSC110) over every course and term.
+
+RollupStore keeps the tables in memory, rebuilds only the rows whose sections
+were added, edited or removed, and materializes them as columnar tables in the
+catalog's cache folder so another process can load them without rebuilding.
+
+Provides:
+  - ROLLUP_LEVELS: rollup level -> key columns.
+  - ROLLUP_COLUMNS: value columns of every rollup table.
+  - department_of: department prefix of a course.
+  - rollup: one rollup level from a section table.
+  - RollupStore: materialized rollups kept up to date with a SectionCatalog.
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from enrollments import parse_section_name, term_sort_key
+from grade_distribution import GRADE_BINS
+
+# Rollup level -> key columns, in order
+ROLLUP_LEVELS = {
+    'course_term': ['department', 'course', 'term'],
+    'course': ['department', 'course'],
+    'department': ['department'],
+}
+
+# Value columns of every rollup table, after its keys (the grade counts follow)
+ROLLUP_COLUMNS = ['sections', 'terms', 'first_term', 'last_term', 'students', 'graded', 'gpa', 'gpa_std',
+                  'gpa_sum', 'gpa_sumsq']
+
+# Section aggregates summed into every rollup row
+_SUMMED = ['students', 'graded', 'gpa_sum', 'gpa_sumsq'] + GRADE_BINS
+
+_DEPARTMENT = re.compile(r'^[A-Za-z]+')
+
+
+def department_of(course):
+    """
+    Return the department prefix of a course.
+
+    Args:
+        course (str): Course code, e.g. "COMSC110".
+
+    Returns:
+        str: The leading letters, upper-cased ("COMSC"); '' if there are none.
+    """
+    match = _DEPARTMENT.match(str(course))
+    return match.group(0).upper() if match else ''
+
+
+def _columns(level):
+    """All columns of a rollup table of the given level."""
+    return ROLLUP_LEVELS[level] + ROLLUP_COLUMNS + GRADE_BINS
+
+
+def rollup(sections, level):
+    """
+    Sum the section aggregates of a catalog section table to one rollup level.
+
+    Args:
+        sections (pd.DataFrame): A catalog section table (SECTION_COLUMNS).
+        level (str): 'course_term', 'course' or 'department'.
+
+    Returns:
+        pd.DataFrame: One row per key of the level, sorted by key (terms
+            chronologically). GPAs are NaN when nothing was graded.
+
+    Raises:
+        ValueError: If level is unknown.
+    """
+    if level not in ROLLUP_LEVELS:
+        raise ValueError(f"level must be one of {', '.join(ROLLUP_LEVELS)}, not {level!r}")
+    sections = sections[sections['course'].fillna('') != '']
+    if sections.empty:
+        return pd.DataFrame(columns=_columns(level))
+
+    keys = ROLLUP_LEVELS[level]
+    # Chronological rank of every term, so first/last term come out of min/max
+    terms = sorted(set(sections['term']), key=term_sort_key)
+    term_rank = pd.Series(range(len(terms)), index=terms)
+    frame = sections.assign(department=sections['course'].map(department_of),
+                            term_rank=sections['term'].map(term_rank).to_numpy())
+
+    table = frame.groupby(keys, sort=False).agg(
+        sections=('section', 'size'), terms=('term', 'nunique'), first_rank=('term_rank', 'min'),
+        last_rank=('term_rank', 'max'), **{column: (column, 'sum') for column in _SUMMED}).reset_index()
+    ordered = np.asarray(terms, dtype=object)
+    table['first_term'] = ordered[table['first_rank'].to_numpy()]
+    table['last_term'] = ordered[table['last_rank'].to_numpy()]
+
+    graded = table['graded'].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gpa = np.where(graded > 0, table['gpa_sum'].to_numpy(dtype=float) / graded, np.nan)
+        variance = np.where(graded > 0, table['gpa_sumsq'].to_numpy(dtype=float) / graded - gpa ** 2, np.nan)
+    table['gpa'] = np.round(gpa, 3)
+    table['gpa_std'] = np.round(np.sqrt(np.maximum(variance, 0.0)), 3)
+
+    sort_columns = [key if key != 'term' else 'first_rank' for key in keys]
+    return table.sort_values(sort_columns, kind='stable').reindex(columns=_columns(level)).reset_index(drop=True)
+
+
+class RollupStore:
+    """
+    Course/term, course and department rollups kept in step with a SectionCatalog.
+
+    refresh() refreshes the catalog and rebuilds only the rollup rows that
+    contain an added, edited or removed section, from the catalog's stored
+    aggregates. The tables are written next to the catalog (one columnar
+    table per level) together with the catalog signature they were built
+    from; a new store loads them as they are when the signature still matches.
+    """
+
+    def __init__(self, sections_dir, catalog=None):
+        """
+        Open the catalog of a Sections folder.
+
+        Args:
+            sections_dir (str): Folder holding the .sec files.
+            catalog (SectionCatalog, optional): Catalog to use instead of opening one.
+        """
+        from catalog import SectionCatalog
+
+        self.catalog = catalog or SectionCatalog(sections_dir)
+        # level -> rollup table, None until the first refresh
+        self._tables = None
+
+    @property
+    def _signature_path(self):
+        return os.path.join(self.catalog.cache_dir, "rollups.signature")
+
+    def _load(self, signature):
+        """Read the materialized tables if they were built from this catalog state."""
+        import columnar_store
+
+        if not os.path.exists(self._signature_path):
+            return None
+        with open(self._signature_path, 'r') as file:
+            if file.read().strip() != signature:
+                return None
+        tables = {}
+        for level in ROLLUP_LEVELS:
+            table = columnar_store.read_table(self.catalog.cache_dir, "rollup_" + level)
+            if table.empty and not self.catalog.sections.empty:
+                return None
+            tables[level] = table.reindex(columns=_columns(level))
+        return tables
+
+    def _save(self, signature):
+        """Write every rollup table and the signature it belongs to."""
+        import columnar_store
+
+        for level, table in self._tables.items():
+            columnar_store.write_table(table, self.catalog.cache_dir, "rollup_" + level, partition_by=())
+        with open(self._signature_path, 'w') as file:
+            file.write(signature)
+
+    def _update(self, names):
+        """Rebuild the rows of every level that contain one of the named sections."""
+        sections = self.catalog.sections
+        parts = [part for part in map(parse_section_name, names) if part['course']]
+        touched = {
+            'course_term': {(department_of(part['course']), part['course'], part['term']) for part in parts},
+            'course': {(department_of(part['course']), part['course']) for part in parts},
+            'department': {(department_of(part['course']),) for part in parts},
+        }
+        departments = sections['course'].fillna('').map(department_of)
+        for level, keys in touched.items():
+            if not keys:
+                continue
+            columns = ROLLUP_LEVELS[level]
+            current = self._tables[level]
+            stale = pd.MultiIndex.from_frame(current[columns]).isin(list(keys)) if not current.empty else []
+            kept = current[~np.asarray(stale, dtype=bool)] if not current.empty else current
+            # Only the sections under a touched department can fall in a touched key
+            candidates = sections[departments.isin({key[0] for key in keys}).to_numpy()]
+            rebuilt = rollup(candidates, level)
+            if not rebuilt.empty:
+                rebuilt = rebuilt[pd.MultiIndex.from_frame(rebuilt[columns]).isin(list(keys))]
+            self._tables[level] = self._sorted(pd.concat([frame for frame in (kept, rebuilt) if not frame.empty],
+                                                         ignore_index=True), level)
+
+    @staticmethod
+    def _sorted(table, level):
+        """Sort a rollup table by its keys, terms chronologically."""
+        if table.empty:
+            return pd.DataFrame(columns=_columns(level))
+        keys = ROLLUP_LEVELS[level]
+        order = sorted(range(len(table)), key=lambda row: tuple(
+            term_sort_key(table[key].iat[row]) if key == 'term' else table[key].iat[row] for key in keys))
+        return table.iloc[order].reset_index(drop=True)
+
+    def refresh(self):
+        """
+        Refresh the catalog and bring the rollup tables up to date.
+
+        Returns:
+            list of str: The sections whose rollup rows were rebuilt (every
+                section on the first build).
+        """
+        changes = self.catalog.refresh()
+        names = changes['added'] + changes['changed'] + changes['removed']
+        signature = self.catalog.signature()
+        if self._tables is None:
+            self._tables = self._load(signature)
+            if self._tables is not None:
+                return []
+            self._tables = {level: rollup(self.catalog.sections, level) for level in ROLLUP_LEVELS}
+            names = list(self.catalog.sections['section'])
+        elif names:
+            self._update(names)
+        if names:
+            self._save(signature)
+        return names
+
+    def table(self, level, refresh=True):
+        """
+        Return one rollup table.
+
+        Args:
+            level (str): 'course_term', 'course' or 'department'.
+            refresh (bool): Pick up added or edited sections first (default True).
+
+        Returns:
+            pd.DataFrame: The rollup table (a copy, safe to modify).
+
+        Raises:
+            ValueError: If level is unknown.
+        """
+        if level not in ROLLUP_LEVELS:
+            raise ValueError(f"level must be one of {', '.join(ROLLUP_LEVELS)}, not {level!r}")
+        if refresh or self._tables is None:
+            self.refresh()
+        return self._tables[level].copy()
+
+    def query(self, level='course', department=None, course=None, term=None, refresh=True):
+        """
+        Return the rows of one rollup level that match the given keys.
+
+        Args:
+            level (str): 'course_term', 'course' or 'department' (default 'course').
+            department (str or list of str, optional): Department prefix(es).
+            course (str or list of str, optional): Course code(s).
+            term (str or list of str, optional): Term(s); course_term level only.
+            refresh (bool): Pick up added or edited sections first (default True).
+
+        Returns:
+            pd.DataFrame: Matching rows of the rollup table.
+
+        Raises:
+            ValueError: If level is unknown or a filter does not apply to it.
+        """
+        table = self.table(level, refresh)
+        for column, wanted in (('department', department), ('course', course), ('term', term)):
+            if wanted is None:
+                continue
+            if column not in ROLLUP_LEVELS[level]:
+                raise ValueError(f"the {level} rollup has no {column} column")
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            table = table[table[column].isin([str(value).strip().upper() for value in values])]
+        return table.reset_index(drop=True)
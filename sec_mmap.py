@@ -0,0 +1,281 @@
+"""
+Memory-mapped section (.sec) reading with a byte-offset row index.
+
+fileReader.readSEC decodes every line into Python strings. For very large
+section files (merged department rosters) MappedSEC maps the file instead
+and, on first access, builds a compact array holding the byte offset where
+each student row starts (uint32 for files under 4 GB). With it:
+
+  - row(i) decodes a single row,
+  - rows(start, stop) / sec[start:stop] decodes only a range,
+  - column('Grade') returns one field of every row by slicing the mapped
+    bytes with array arithmetic, without decoding the other fields.
+
+Fields are split like readSEC: a row "Last, First","ID","Grade" gives
+FirstName, LastName, ID and Grade with the surrounding quotes removed.
+
+The row index can be saved next to the section catalog
+(<data>/.catalog/row_index/) together with the file's mtime and size, so
+re-opening an unchanged file skips the newline scan.
+
+Provides:
+  - SEC_COLUMNS: field names, in file order.
+  - MappedSEC: random access to the rows and columns of one .sec file.
+"""
+
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fields of a student row, in file order (the names of readSEC's columns)
+SEC_COLUMNS = ['FirstName', 'LastName', 'ID', 'Grade']
+
+# Bytes scanned at a time when building the row index
+_SCAN_BLOCK = 1 << 24
+
+_NEWLINE = ord('\n')
+_COMMA = ord(',')
+
+
+class MappedSEC:
+    """
+    A .sec file mapped into memory, with its rows located by byte offset.
+
+    Use as a context manager (or call close()) to release the mapping.
+    """
+
+    def __init__(self, path, index_dir=None, cache_index=True):
+        """
+        Map a section file. The row index is built (or loaded) on first access.
+
+        Args:
+            path (str): Full path to the .sec file.
+            index_dir (str, optional): Where to cache row indexes (default:
+                .catalog/row_index next to the file's Sections folder).
+            cache_index (bool): Load and save the row index there (default True).
+
+        Raises:
+            Exception: If the file extension is not '.sec'.
+            IOError: If the file cannot be opened.
+        """
+        from catalog import CATALOG_DIR
+
+        if path.split(".")[-1].lower() != "sec":
+            raise Exception("Wrong File Type Passed")
+        self.path = os.path.abspath(path)
+        self.index_dir = index_dir or os.path.join(os.path.dirname(os.path.dirname(self.path)),
+                                                   CATALOG_DIR, "row_index")
+        self.cache_index = cache_index
+        stat = os.stat(self.path)
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+        self._file = open(self.path, 'rb')
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        self._starts = None
+        self._ends = None
+
+    def close(self):
+        """Release the mapping and the file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.index_dir, os.path.basename(self.path) + ".rows.npz")
+
+    def _bytes(self):
+        """The mapped file as a uint8 array (no copy)."""
+        return np.frombuffer(self._map, dtype=np.uint8) if len(self._map) else np.zeros(0, dtype=np.uint8)
+
+    def _scan(self):
+        """Start and end offsets of every non-empty line after the header."""
+        data = self._bytes()
+        newlines = [np.flatnonzero(data[start:start + _SCAN_BLOCK] == _NEWLINE) + start
+                    for start in range(0, len(data), _SCAN_BLOCK)]
+        newlines = np.concatenate(newlines) if newlines else np.zeros(0, dtype=np.int64)
+        if len(newlines) == 0 or newlines[-1] != len(data) - 1:
+            # Last line without a trailing newline
+            newlines = np.append(newlines, len(data))
+        starts = np.r_[0, newlines[:-1] + 1][1:]          # skip the header line
+        ends = newlines[1:]
+        # Drop the carriage return of CRLF files from the row
+        ends = ends - ((ends > starts) & (data[np.maximum(ends - 1, 0)] == ord('\r')))
+        keep = ends > starts
+        dtype = np.uint32 if len(data) < 2 ** 32 else np.int64
+        return starts[keep].astype(dtype), ends[keep].astype(dtype)
+
+    def _load_index(self):
+        """Read a cached row index if it belongs to the file as it is now."""
+        try:
+            with np.load(self._index_path) as stored:
+                if tuple(int(v) for v in stored['signature']) != self._signature:
+                    return False
+                self._starts, self._ends = stored['starts'], stored['ends']
+            return True
+        except (OSError, KeyError, ValueError):
+            return False
+
+    def save_index(self):
+        """Write the row index to index_dir (built first if needed)."""
+        starts, ends = self._index()
+        os.makedirs(self.index_dir, exist_ok=True)
+        temp = self._index_path + ".tmp.npz"
+        np.savez(temp, starts=starts, ends=ends, signature=np.array(self._signature, dtype=np.int64))
+        os.replace(temp, self._index_path)
+
+    def _index(self):
+        """Row start and end offsets, loaded or built on first use."""
+        if self._starts is None:
+            if not (self.cache_index and self._load_index()):
+                self._starts, self._ends = self._scan()
+                if self.cache_index:
+                    try:
+                        self.save_index()
+                    except OSError as e:
+                        print(f"Warning: Could not cache the row index of {os.path.basename(self.path)}: {e}")
+        return self._starts, self._ends
+
+    def __len__(self):
+        return len(self._index()[0])
+
+    def header(self):
+        """
+        Return the header line.
+
+        Returns:
+            tuple: (section_id, credit_hours) like fileReader.readSECHeader.
+        """
+        end = self._map.find(b'\n') if len(self._map) else -1
+        parts = bytes(self._map[:end if end >= 0 else len(self._map)]).decode().split()
+        try:
+            credit_hours = float(parts[-1]) if len(parts) > 1 else None
+        except ValueError:
+            credit_hours = None
+        return (parts[0] if parts else ""), credit_hours
+
+    @staticmethod
+    def _split(line):
+        """Split one decoded row into its fields like readSEC."""
+        return [item.strip('"\n') for item in line.split(",")]
+
+    def row(self, i):
+        """
+        Decode one row.
+
+        Args:
+            i (int): Row number (negative counts from the end).
+
+        Returns:
+            dict: SEC_COLUMNS -> value.
+
+        Raises:
+            IndexError: If i is out of range.
+        """
+        starts, ends = self._index()
+        if not -len(starts) <= i < len(starts):
+            raise IndexError(f"row {i} out of range for {len(starts)} rows")
+        line = bytes(self._map[int(starts[i]):int(ends[i])]).decode()
+        return dict(zip(SEC_COLUMNS, self._split(line)))
+
+    def rows(self, start=None, stop=None):
+        """
+        Decode a range of rows.
+
+        Args:
+            start (int, optional): First row (default 0).
+            stop (int, optional): Row after the last one (default: the end).
+
+        Returns:
+            pd.DataFrame: Columns SEC_COLUMNS, like readSEC for those rows.
+        """
+        starts, ends = self._index()
+        selected = range(len(starts))[slice(start, stop)]
+        if len(selected) == 0:
+            return pd.DataFrame({name: np.array([], dtype=str) for name in SEC_COLUMNS}, columns=SEC_COLUMNS)
+        # Rows of a range are contiguous, so they decode as one block
+        first, last = selected[0], selected[-1]
+        block = bytes(self._map[int(starts[first]):int(ends[last])]).decode()
+        fields = zip(*(self._split(line.rstrip('\r')) for line in block.split('\n') if line.rstrip('\r')))
+        return pd.DataFrame(dict(zip(SEC_COLUMNS, fields)), columns=SEC_COLUMNS)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("Row slices cannot have a step")
+            return self.rows(key.start, key.stop)
+        return self.row(key)
+
+    def column(self, name):
+        """
+        Read one field of every row without decoding the others.
+
+        Field boundaries come from the comma positions of the mapped bytes:
+        Grade and ID are counted from the end of the row (names contain a
+        comma), FirstName and LastName from its start.
+
+        Args:
+            name (str): One of SEC_COLUMNS.
+
+        Returns:
+            np.ndarray: str values, one per row.
+
+        Raises:
+            ValueError: If name is not one of SEC_COLUMNS, or a row has fewer
+                than four fields.
+        """
+        if name not in SEC_COLUMNS:
+            raise ValueError(f"column must be one of {', '.join(SEC_COLUMNS)}, not {name!r}")
+        starts, ends = self._index()
+        if len(starts) == 0:
+            return np.array([], dtype=str)
+        starts = starts.astype(np.int64)
+        ends = ends.astype(np.int64)
+        data = self._bytes()
+        commas = np.flatnonzero(data == _COMMA)
+        # Commas before each row's end / at or after its start
+        last = np.searchsorted(commas, ends) - 1
+        first = np.searchsorted(commas, starts)
+        short = np.flatnonzero(last - first < 2)
+        if len(short):
+            raise ValueError(f"{os.path.basename(self.path)}: row {short[0]} has fewer than {len(SEC_COLUMNS)} fields")
+        if name == 'Grade':
+            begin, stop = commas[last] + 1, ends
+        elif name == 'ID':
+            begin, stop = commas[last - 1] + 1, commas[last]
+        elif name == 'FirstName':
+            begin, stop = starts, commas[first]
+        else:
+            begin, stop = commas[first] + 1, commas[first + 1]
+
+        # Leave out the quotes around the field (and a trailing newline, like readSEC)
+        stop = stop - ((stop > begin) & (data[np.maximum(stop - 1, 0)] == ord('"')))
+        begin = begin + ((stop > begin) & (data[np.minimum(begin, len(data) - 1)] == ord('"')))
+
+        # Gather every field into a fixed-width byte matrix, padded with NUL
+        lengths = np.maximum(stop - begin, 0)
+        width = max(int(lengths.max()), 1)
+        positions = begin[:, np.newaxis] + np.arange(width)
+        matrix = data[np.minimum(positions, len(data) - 1)]
+        matrix[np.arange(width) >= lengths[:, np.newaxis]] = 0
+        fields = matrix.view(f'S{width}').ravel()
+        if (matrix >= 0x80).any():
+            return np.char.decode(fields, 'utf-8')
+        return fields.astype(f'U{width}')
+
+    def to_frame(self):
+        """
+        Decode every row.
+
+        Returns:
+            pd.DataFrame: The same table as fileReader.readSEC.
+        """
+        return pd.DataFrame({name: self.column(name) for name in SEC_COLUMNS}, columns=SEC_COLUMNS)
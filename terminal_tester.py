@@ -9,8 +9,10 @@ from grp_parser import grpReader
 from FileReader import fileReader
 from GoodAndBadList import Lists
 from History import HistoryManager  # Import the HistoryManager class
+from enrollments import run_name
+import numpy as np
 import pandas as pd
-from zscore_calculator import analyze_sections
+from zscore_calculator import ZScoreCalculator, ZScoreCache
 
 class TerminalTester:
     def __init__(self):
@@ -26,6 +28,14 @@ class TerminalTester:
         self.bottom_performers = None
         self.sec_data = None
         self.zscore_results = None
+        # Keeps per-section statistics so a repeat analysis only re-reads edited sections
+        self.zscore_analyzer = None
+        # Z-scores of the last analysis, re-used for new thresholds and sweeps
+        self.zscore_cache = None
+        # Course/term trends, rebuilt only for courses whose sections changed
+        self.trend_engine = None
+        # Course/term, course and department rollups of every section on file
+        self.rollup_store = None
         # Initialize the HistoryManager
         self.history = HistoryManager()
         self.handlers = {
@@ -39,6 +49,7 @@ class TerminalTester:
             '8': self.perform_zscore,
             '9': self.manage_history,  # Add new handler for history management
             '10': self.auto_process,   # New handler for auto-processing
+            '11': self.display_ranked_performers,
             '0': self.exit_program     # Changed from 9 to 0 to accommodate new option
         }
 
@@ -60,14 +71,15 @@ class TerminalTester:
         print("3. Display all sections from groups")
         print("4. Display top performers (A, A-)")
         print("5. Display bottom performers (F, D-)")
-        print("6. Export data to HTML")
+        print("6. Export data (HTML, CSV, Excel or columnar)")
         print("7. Read individual SEC file")
         print("8. Perform Z-score analysis")
         print("9. Manage student history")
         print("10. Auto-Process full pipeline")  # New option
+        print("11. Ranked performers (top/bottom N or percentile by GPA)")
         print("0. Exit")
         print("="*50)
-        return input("Select an option (0-10): ")  # Updated range
+        return input("Select an option (0-11): ")  # Updated range
 
 
     def find_run_files(self, base_dir=None):
@@ -105,9 +117,11 @@ class TerminalTester:
 
     def export_to_html(self, df, file_type):
         """
-        Export the provided pandas DataFrame to an HTML file. The filename is
-        determined by the file_type argument. Notifies the user of the export
-        location or if there is no data to export.
+        Export the provided pandas DataFrame to an HTML file, and optionally to
+        CSV and Excel files written in the same pass. The filenames are
+        determined by the file_type argument. Rows are streamed to disk in
+        chunks while progress is printed. Notifies the user
+        of the export location or if there is no data to export.
 
         Args:
             df (pd.DataFrame): The DataFrame to export.
@@ -117,10 +131,73 @@ class TerminalTester:
         if df is None or df.empty:
             print("No data to export!")
             return
-        
-        filename = f"{file_type}_export.html"
-        df.to_html(filename)
-        print(f"Data exported to {os.path.abspath(filename)}")
+
+        from exporter import export_dataframe
+
+        formats = input("Formats to write (html,csv,xlsx) [html]: ").strip().lower() or "html"
+        extensions = [f".{fmt.strip().lstrip('.')}" for fmt in formats.split(",") if fmt.strip()]
+        filenames = [f"{file_type}_export{ext}" for ext in extensions]
+
+        def on_progress(rows_written, total_rows):
+            print(f"\rExporting... {rows_written}/{total_rows} rows", end="", flush=True)
+
+        try:
+            export_dataframe(df, filenames, index=True, progress=on_progress)
+        except (ValueError, ImportError, OSError) as e:
+            print(f"\nExport failed: {e}")
+            return
+        print()
+        for filename in filenames:
+            print(f"Data exported to {os.path.abspath(filename)}")
+
+
+    def export_columnar(self):
+        """
+        Export the loaded run's good list, work list, enrollments and Z-score
+        results, together with the historical lists, to a typed columnar
+        dataset (Parquet/Feather with pyarrow, .npz otherwise). Run-level
+        tables are partitioned by run and term.
+        """
+        if not self.run_file:
+            print("Error: Please load a RUN file first (option 1)!")
+            return
+
+        import columnar_store
+
+        root = input("Dataset directory [columnar_export]: ").strip() or "columnar_export"
+        default = columnar_store.default_format()
+        fmt = input(f"Format ({'/'.join(columnar_store.COLUMNAR_FORMATS)}) [{default}]: ").strip().lower() or default
+        try:
+            written = columnar_store.export_run(self.run_file, root, fmt=fmt, history=self.history,
+                                                zscore_df=self.zscore_results)
+        except (ValueError, ImportError, OSError) as e:
+            print(f"Export failed: {e}")
+            return
+        for table, paths in written.items():
+            print(f"{table}: {len(paths)} file(s)")
+        print(f"Dataset written to {os.path.abspath(root)}")
+
+
+    def load_columnar(self):
+        """
+        Load one table from a columnar dataset, optionally only for one run
+        and/or term, and display it.
+        """
+        import columnar_store
+
+        root = input("Dataset directory [columnar_export]: ").strip() or "columnar_export"
+        name = input(f"Table ({', '.join(columnar_store.DATASET_TABLES)}): ").strip()
+        run = input("Run (blank for all): ").strip() or None
+        term = input("Term (blank for all): ").strip() or None
+        try:
+            table = columnar_store.load_table(root, name, run=run, term=term)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if table.empty:
+            print("No matching data found.")
+            return
+        print(table.to_string())
 
 
     def load_run(self):
@@ -232,7 +309,7 @@ class TerminalTester:
                 # Ask if user wants to update the history
                 update_history = input("\nUpdate Good List history with these students? (y/n): ")
                 if update_history.lower() == 'y':
-                    updated_df, already_on_list = self.history.update_good_list(self.top_performers)
+                    updated_df, already_on_list = self.history.update_good_list(self.top_performers, run=run_name(self.run_file))
                     if already_on_list:
                         print(f"\n{len(already_on_list)} students were already on the Good List.")
                     print(f"Good List updated with {len(self.top_performers) - len(already_on_list)} new students.")
@@ -263,7 +340,7 @@ class TerminalTester:
                 # Ask if user wants to update the history
                 update_history = input("\nUpdate Work List history with these students? (y/n): ")
                 if update_history.lower() == 'y':
-                    updated_df, already_on_list = self.history.update_work_list(self.bottom_performers)
+                    updated_df, already_on_list = self.history.update_work_list(self.bottom_performers, run=run_name(self.run_file))
                     if already_on_list:
                         print(f"\n{len(already_on_list)} students were already on the Work List.")
                     print(f"Work List updated with {len(self.bottom_performers) - len(already_on_list)} new students.")
@@ -271,6 +348,33 @@ class TerminalTester:
             print(f"Error getting bottom performers: {e}")
 
 
+    def display_ranked_performers(self):
+        """
+        Display the top or bottom students of the loaded RUN file by GPA, as
+        N students or a percentile per section, group or the whole run.
+        """
+        from performers import parse_selection
+        if not self.run_file:
+            print("Error: Please load a RUN file first (option 1)!")
+            return
+        request = input("Select (e.g. 'top 10', 'bottom 5%', 'top 3 by section') [top 10]: ").strip() or "top 10"
+        try:
+            selection = parse_selection(request)
+            ranked = Lists.rankedList(self.run_file, **selection)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if ranked.empty:
+            print("No graded students found!")
+            return
+        print(f"\n{request} ({len(ranked)} students):")
+        pd.set_option('display.max_rows', None)
+        print(ranked.drop(columns='section_source', errors='ignore').to_string(index=False))
+        pd.reset_option('display.max_rows')
+        if input("\nExport this list? (y/n): ").strip().lower() == 'y':
+            self.export_to_html(ranked, "ranked_performers")
+
+
     def export_data(self):
         """
         Present export options to the user for saving various data sets to HTML files.
@@ -285,8 +389,12 @@ class TerminalTester:
         print("4. Export Z-score analysis")
         print("5. Export historical Good List")  # New option
         print("6. Export historical Work List")  # New option
-        print("7. Cancel Export")
-        export_choice = input("Select data to export (1-7): ")
+        print("7. Export columnar dataset (lists, history, enrollments, z-scores)")
+        print("8. Load table from columnar dataset")
+        print("9. Export a cohort (filter expression)")
+        print("10. Write good.lst and work.lst")
+        print("11. Cancel Export")
+        export_choice = input("Select data to export (1-11): ")
         if export_choice == '1':
             if self.top_performers is None:
                 print("Error: Please load top performers first (option 4)!")
@@ -320,12 +428,82 @@ class TerminalTester:
                 return
             self.export_to_html(work_list, "historical_work_list")
         elif export_choice == '7':
+            self.export_columnar()
+        elif export_choice == '8':
+            self.load_columnar()
+        elif export_choice == '9':
+            self.export_cohort()
+        elif export_choice == '10':
+            self.export_lst()
+        elif export_choice == '11':
             print("Export cancelled.")
             return
         else:
             print("Invalid export option!")
 
 
+    def export_cohort(self):
+        """
+        Ask for a cohort filter expression, show the cohort's size and GPA per
+        course, and export its enrollments from the loaded run.
+        """
+        from cohort_filter import cohort_stats
+        if not self.run_file:
+            print("Error: No RUN file loaded!")
+            return
+        print("Examples: grade in (D+, D, D-, F) and term >= F20 and course ~ \"COMSC3*\"")
+        print("          good, work, department = COMSC and not grade = W")
+        expression = input("Cohort filter: ").strip()
+        if not expression:
+            print("Export cancelled.")
+            return
+        try:
+            cohort = Lists.cohortList(self.run_file, expression)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if cohort.empty:
+            print("No enrollments match the filter.")
+            return
+        print(f"\n{len(cohort)} enrollments, {cohort['id'].nunique()} students:")
+        print(cohort_stats(cohort, expression, by='course').to_string(index=False))
+        self.export_to_html(cohort.drop(columns='section_source'), "cohort")
+
+
+    def export_lst(self):
+        """
+        Write good.lst and work.lst for the loaded run and optionally compare
+        them with golden files of the same name in another folder.
+        """
+        from lst_io import compare_lst, write_run_lists
+        if not self.run_file:
+            print("Error: No RUN file loaded!")
+            return
+        default_dir = os.path.join("lst_export", run_name(self.run_file))
+        output_dir = input(f"Output folder [{default_dir}]: ").strip() or default_dir
+        paths = write_run_lists(self.run_file, output_dir)
+        for path in paths.values():
+            print(f"Wrote {path}")
+        golden_dir = input("Folder with golden good.lst/work.lst to compare (blank to skip): ").strip()
+        if not golden_dir:
+            return
+        for name, path in paths.items():
+            golden = os.path.join(golden_dir, f"{name}.lst")
+            if not os.path.exists(golden):
+                print(f"No {name}.lst in {golden_dir}, skipped.")
+                continue
+            try:
+                differences = compare_lst(golden, path)
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
+            if differences.empty:
+                print(f"{name}.lst matches the golden file.")
+            else:
+                print(f"\n{name}.lst differs from the golden file in {len(differences)} entries:")
+                print(differences.to_string(index=False))
+
+
     def read_sec_file(self):
         """
         Prompt the user to select or provide the path to a SEC file. Lists all
@@ -378,13 +556,53 @@ class TerminalTester:
             print(f"Error reading SEC file: {e}")
 
 
+    def print_zscore_table(self, result_data, mode='normal'):
+        """
+        Print section-level Z-score results as a fixed-width table.
+
+        Args:
+            result_data (list of dict): Rows from ZScoreCalculator.analyze_sections
+                (or the records of a cached analysis).
+            mode (str): 'resampling' also prints the permutation p-value and
+                bootstrap interval of every section.
+        """
+        print("\nSection Z-score Analysis:")
+        print("-" * 80)
+        print(f"{'Section':<45} {'GPA':<6} {'Count':<6} {'Z-score':<10} {'P-value':<10} {'Significant':<10}")
+        print("-" * 80)
+
+        # Path shortening logic to enshure more readable output
+        def shorten_section_path(section_path):
+            marker = "COMSC330_POC_Data"
+            idx = section_path.find(marker)
+            if idx != -1:
+                return section_path[idx:]
+            return section_path
+
+        for result in result_data:
+            z_score = result['z_score']
+            p_value = result['p_value']
+            z_display = f"{z_score:.2f}" if isinstance(z_score, (int, float)) else z_score
+            p_display = f"{p_value:.4f}" if isinstance(p_value, (int, float)) else p_value
+            section_short = shorten_section_path(result['section'])
+            # section_count maps each grade to its count; show the number of graded students
+            graded = sum(result['section_count'].values()) if isinstance(result['section_count'], dict) else result['section_count']
+            print(f"{section_short:<45} {result['section_gpa']:<6} {graded:<6} {z_display:<10} {p_display:<10} {'Yes' if result['significant'] else 'No':<10}")
+            if mode == 'resampling':
+                print(f"{'':<45} permutation p = {result['perm_p_value']}, "
+                      f"95% CI of GPA difference = [{result['ci_low']}, {result['ci_high']}]")
+
+
     def perform_zscore(self):
         """
         Perform Z-score statistical analysis on the loaded section data. Prompts
         the user for a significance threshold, runs the analysis, and displays
         a summary of results including group GPA, standard deviation, and
-        section-level Z-scores and significance. Requires that RUN, group, and
-        section files have been loaded.
+        section-level Z-scores and significance, optionally per group. If the
+        sections have not changed since the last analysis, its cached z-scores
+        can be re-used with a new threshold or swept over many thresholds
+        without reading any file. Requires that RUN, group, and section files
+        have been loaded.
         """
         if not self.run_file:
             print("Error: Please load a RUN file first (option 1)!")
@@ -405,9 +623,56 @@ class TerminalTester:
             custom_threshold = input("Enter significance threshold (default is 1.96): ")
             if custom_threshold.strip() and custom_threshold.replace('.', '', 1).isdigit():
                 threshold = float(custom_threshold)
-            
+
+            cache = self.zscore_cache
+            if cache is not None and cache.matches(self.run_file, self.sec_files):
+                print("\nThe sections have not changed since the last analysis.")
+                print("1. Re-use it with this threshold")
+                print("2. Sweep thresholds")
+                print("3. Run a new analysis")
+                choice = input("Select an option (1-3) [1]: ").strip() or '1'
+                if choice == '1':
+                    self.zscore_results = cache.apply(threshold)
+                    print(f"\n{cache.count(threshold)} of {cache.valid} sections significant at |z| >= {threshold}")
+                    self.print_zscore_table(self.zscore_results.to_dict('records'))
+                    return
+                if choice == '2':
+                    try:
+                        start = float(input("From threshold [0]: ").strip() or 0)
+                        stop = float(input("To threshold [4]: ").strip() or 4)
+                        step = float(input("Step [0.25]: ").strip() or 0.25)
+                    except ValueError:
+                        print("Error: Please enter numbers!")
+                        return
+                    if step <= 0:
+                        print("Error: Step must be positive!")
+                        return
+                    print(cache.sweep(np.arange(start, stop + step / 2, step)).round(3).to_string(index=False))
+                    return
+
+            analyzer = self.zscore_analyzer
+            if analyzer is not None and analyzer.run_file == self.run_file:
+                reuse = input("Only re-read the sections that changed since the last analysis? (y/n): ").strip().lower()
+                if reuse == 'y':
+                    refreshed = analyzer.refresh()
+                    print(f"Refreshed {len(refreshed)} section(s): {', '.join(os.path.basename(path) for path in refreshed) or 'none'}")
+                    _, results = analyzer.results()
+                    self.zscore_cache = ZScoreCache(results, self.run_file, self.sec_files)
+                    self.zscore_results = self.zscore_cache.apply(threshold)
+                    print(self.zscore_results[['section', 'section_gpa', 'n', 'group_gpa', 'group_std', 'z_score',
+                                               'p_value', 'significant', 'updated_at']]
+                          .assign(section=self.zscore_results['section'].map(os.path.basename))
+                          .to_string(index=False))
+                    return
+
+            mode = input("Significance test: normal or resampling (permutation + bootstrap)? [normal]: ").strip().lower() or 'normal'
+            if mode not in ('normal', 'resampling'):
+                print("Invalid option! Using the normal approximation.")
+                mode = 'normal'
+
             # Run the analysis
-            result_data, self.zscore_results = analyze_sections(self.run_file, self.grp_files, self.sec_files, threshold)
+            result_data, self.zscore_results = ZScoreCalculator.analyze_sections(
+                self.run_file, self.grp_files, self.sec_files, threshold, significance=mode)
             
             # Display results
             if not result_data:
@@ -417,29 +682,40 @@ class TerminalTester:
                 print("\nStatistical Summary:")
                 print(f"Group GPA: {result_data[0]['group_gpa']}")
                 print(f"Group Std Dev: {result_data[0]['group_std']}")
-                
-                # Print all section results
-                print("\nSection Z-score Analysis:")
-                print("-" * 80)
-                print(f"{'Section':<45} {'GPA':<6} {'Count':<6} {'Z-score':<10} {'P-value':<10} {'Significant':<10}")
-                print("-" * 80)
-                
-                # Path shortening logic to enshure more readable output
-                def shorten_section_path(section_path):
-                    marker = "COMSC330_POC_Data"
-                    idx = section_path.find(marker)
-                    if idx != -1:
-                        return section_path[idx:]
-                    return section_path
-
-                for result in result_data:
-                    z_score = result['z_score']
-                    p_value = result['p_value']
-                    z_display = f"{z_score:.2f}" if isinstance(z_score, (int, float)) else z_score
-                    p_display = f"{p_value:.4f}" if isinstance(p_value, (int, float)) else p_value
-                    section_short = shorten_section_path(result['section'])
-                    print(f"{section_short:<45} {result['section_gpa']:<6} {result['section_count']:<6} {z_display:<10} {p_display:<10} {'Yes' if result['significant'] else 'No':<10}")
-        
+                self.print_zscore_table(result_data, mode)
+
+            # Keep the z-scores for instant threshold changes; resampling marks
+            # significance by p-value, so only normal results are cached
+            self.zscore_cache = None
+            if mode == 'normal' and result_data:
+                self.zscore_cache = ZScoreCache(self.zscore_results, self.run_file, self.sec_files)
+
+            from incremental_zscore import IncrementalAnalyzer
+            # Sections are already in the shared cache, so this does not parse them again
+            self.zscore_analyzer = IncrementalAnalyzer(self.run_file, self.grp_files, threshold)
+
+            per_group = input("\nAlso compare each section with its own group and the run? (y/n): ").strip().lower()
+            if per_group == 'y':
+                _, group_results = ZScoreCalculator.analyze_groups(self.run_file, self.grp_files, threshold)
+                if group_results.empty:
+                    print("No results found!")
+                    return
+                print("\nGroup vs run:")
+                print(ZScoreCalculator.compare_groups(self.run_file, self.grp_files, threshold).to_string(index=False))
+                print("\nSections vs own group (z_score) and vs run (run_z_score):")
+                print(group_results[['group', 'section', 'section_gpa', 'group_gpa', 'z_score', 'p_value',
+                                     'significant', 'run_z_score', 'run_significant']].to_string(index=False))
+
+            distribution = input("\nAlso test each section's grade distribution against its group? (y/n): ").strip().lower()
+            if distribution == 'y':
+                from grade_distribution import run_distribution_anomalies
+                anomalies = run_distribution_anomalies(self.run_file)
+                if anomalies.empty:
+                    print("No results found!")
+                    return
+                print("\nGrade distribution vs group (G-test, most unusual first):")
+                print(anomalies.to_string(index=False))
+
         except Exception as e:
             print(f"Error performing Z-score analysis: {e}")
 
@@ -447,14 +723,25 @@ class TerminalTester:
     def manage_history(self):
         """
         Provide options for managing student history data, including viewing historical
-        lists and checking individual student history.
+        lists, checking individual student history, compacting the history journals,
+        listing the students recorded for a section, comparing two runs, finding
+        students who are on the Work List repeatedly, and showing full transcripts,
+        credit-weighted GPAs, course trends by term and course/department rollups.
         """
         print("\nHistory Management Options:")
         print("1. View historical Good List")
         print("2. View historical Work List")
         print("3. Check student history")
-        print("4. Return to main menu")
-        history_choice = input("Select an option (1-4): ")
+        print("4. Compact history journals")
+        print("5. Students recorded for a section")
+        print("6. Compare runs")
+        print("7. Repeat Work List students")
+        print("8. Student transcript (every section on file)")
+        print("9. Student GPAs (credit-weighted, term and cumulative)")
+        print("10. Course trends by term (rolling GPA and grade drift)")
+        print("11. Course and department rollups")
+        print("12. Return to main menu")
+        history_choice = input("Select an option (1-12): ")
         if history_choice == '1':
             good_list = self.history.get_good_list()
             if good_list.empty:
@@ -474,16 +761,164 @@ class TerminalTester:
                 print(work_list)
                 pd.reset_option('display.max_rows')
         elif history_choice == '3':
-            student_id = input("Enter student ID to check: ")
+            raw_ids = input("Enter student ID(s) to check (comma-separated): ")
+            student_ids = [student_id.strip() for student_id in raw_ids.split(",") if student_id.strip()]
+            if not student_ids:
+                print("Error: Please enter at least one student ID!")
+                return
+            # One lookup for the whole batch
+            history = self.history.check_students(student_ids)
+            for row in history.itertuples(index=False):
+                print(f"\nHistory for Student ID: {row.id}")
+                print(f"Previously on Good List: {'Yes' if row.good_list else 'No'}")
+                if row.good_list:
+                    print(f"  Sections: {row.good_sections}  Grades: {row.good_grades}")
+                print(f"Previously on Work List: {'Yes' if row.work_list else 'No'}")
+                if row.work_list:
+                    print(f"  Sections: {row.work_sections}  Grades: {row.work_grades}")
+        elif history_choice == '4':
+            self.history.compact()
+            print("History journals folded into the Good and Work List files.")
+        elif history_choice == '5':
+            section = input("Enter section file name (e.g. COMSC110.01S25.SEC): ").strip()
+            entries = self.history.students_in_section(section)
+            if entries.empty:
+                print(f"No history recorded for section {section}.")
+            else:
+                print(f"\nStudents recorded for {section} ({len(entries)} entries):")
+                print(entries[['list', 'id', 'FirstName', 'LastName', 'grade', 'run']].to_string(index=False))
+        elif history_choice == '6':
+            list_name = input("Which list? (good/work) [work]: ").strip().lower() or 'work'
+            if list_name not in ('good', 'work'):
+                print("Invalid list!")
+                return
+            saved = self.history.list_snapshots(list_name)
+            if saved:
+                print(f"Saved runs: {', '.join(saved)}")
+            before = input("Earlier run (e.g. SECONDRUN): ").strip()
+            after = input("Later run (e.g. SPRING25): ").strip()
+            if not before or not after:
+                print("Error: Please enter both runs!")
+                return
+            diff = self.history.diff_runs(before, after, list_name)
+            for key, title in (('added', f"New in {after}"), ('removed', f"No longer listed since {before}"),
+                               ('changed', "Grade changed")):
+                print(f"\n{title} ({len(diff[key])}):")
+                if not diff[key].empty:
+                    print(diff[key].to_string(index=False))
+        elif history_choice == '7':
+            by = input("Count distinct sections or terms? (section/term) [section]: ").strip().lower() or 'section'
+            if by not in ('section', 'term'):
+                print("Invalid option!")
+                return
             try:
-                student_id = int(student_id)
-                history = self.history.check_student_history(student_id)
-                print(f"\nHistory for Student ID: {student_id}")
-                print(f"Previously on Good List: {'Yes' if history['good_list'] else 'No'}")
-                print(f"Previously on Work List: {'Yes' if history['work_list'] else 'No'}")
+                min_count = int(input("Minimum number of appearances [2]: ").strip() or 2)
             except ValueError:
-                print("Error: Please enter a valid numeric student ID!")
-        elif history_choice == '4':
+                print("Error: Please enter a whole number!")
+                return
+            repeats = self.history.repeat_students(min_count, by=by)
+            if repeats.empty:
+                print(f"No students are on the Work List in {min_count} or more {by}s.")
+            else:
+                print(f"\nStudents on the Work List in {min_count} or more {by}s ({len(repeats)}):")
+                print(repeats.to_string(index=False))
+        elif history_choice == '8':
+            from catalog import SectionCatalog, default_sections_dir
+            raw_ids = input("Enter student ID(s) (comma-separated): ")
+            student_ids = [student_id.strip() for student_id in raw_ids.split(",") if student_id.strip()]
+            if not student_ids:
+                print("Error: Please enter at least one student ID!")
+                return
+            sections_dir = default_sections_dir(self.run_file)
+            transcripts = SectionCatalog(sections_dir).transcripts(student_ids)
+            for student_id in student_ids:
+                transcript = transcripts[transcripts['id'] == student_id]
+                if transcript.empty:
+                    print(f"\nNo sections on file for student ID {student_id}.")
+                else:
+                    print(f"\nTranscript for Student ID {student_id} ({len(transcript)} sections):")
+                    print(transcript.drop(columns='id').to_string(index=False))
+        elif history_choice == '9':
+            from catalog import default_sections_dir
+            from gpa_engine import corpus_gpas, run_gpas
+            scope = input("GPAs over the loaded run or every section on file? (run/all) [run]: ").strip().lower() or 'run'
+            if scope == 'run':
+                if not self.run_file:
+                    print("Error: No RUN file loaded!")
+                    return
+                gpas = run_gpas(self.run_file)
+            elif scope == 'all':
+                sections_dir = default_sections_dir(self.run_file)
+                gpas = corpus_gpas(sections_dir)
+            else:
+                print("Invalid option!")
+                return
+            raw_ids = input("Enter student ID(s) (comma-separated, blank for all): ")
+            student_ids = [student_id.strip() for student_id in raw_ids.split(",") if student_id.strip()]
+            if student_ids:
+                gpas = gpas[gpas['id'].isin(student_ids)]
+            if gpas.empty:
+                print("No GPA data found!")
+            else:
+                print(f"\nCredit-weighted GPAs ({gpas['id'].nunique()} students):")
+                pd.set_option('display.max_rows', None)
+                print(gpas[['id', 'term', 'term_credits', 'term_gpa', 'cumulative_credits', 'cumulative_gpa']]
+                      .round(3).to_string(index=False))
+                pd.reset_option('display.max_rows')
+        elif history_choice == '10':
+            from catalog import default_sections_dir
+            from trends import TrendEngine
+            sections_dir = default_sections_dir(self.run_file)
+            window = input("Rolling window in offerings [3]: ").strip() or '3'
+            try:
+                window = int(window)
+                if window < 1:
+                    raise ValueError
+            except ValueError:
+                print("Error: The window must be a positive whole number!")
+                return
+            if (self.trend_engine is None
+                    or self.trend_engine.catalog.sections_dir != os.path.abspath(sections_dir)):
+                self.trend_engine = TrendEngine(sections_dir, window=window)
+            elif self.trend_engine.window != window:
+                self.trend_engine.set_window(window)
+            raw_courses = input("Enter course(s) (comma-separated, blank for all): ")
+            courses = [course.strip().upper() for course in raw_courses.split(",") if course.strip()] or None
+            trends = self.trend_engine.trends(courses)
+            if trends.empty:
+                print("No trend data found!")
+            else:
+                print(f"\nCourse trends ({trends['course'].nunique()} courses, window of {window} offerings):")
+                pd.set_option('display.max_rows', None)
+                print(trends[['course', 'term', 'sections', 'graded', 'gpa', 'rolling_sections', 'rolling_gpa',
+                              'drift']].to_string(index=False))
+                pd.reset_option('display.max_rows')
+        elif history_choice == '11':
+            from catalog import default_sections_dir
+            from rollups import RollupStore
+            sections_dir = default_sections_dir(self.run_file)
+            print("1. Course by term")
+            print("2. Course over all terms")
+            print("3. Department over all courses")
+            level = {'1': 'course_term', '2': 'course', '3': 'department'}.get(input("Select a level (1-3): ").strip())
+            if level is None:
+                print("Invalid option!")
+                return
+            if (self.rollup_store is None
+                    or self.rollup_store.catalog.sections_dir != os.path.abspath(sections_dir)):
+                self.rollup_store = RollupStore(sections_dir)
+            key = 'department' if level == 'department' else 'course'
+            raw_keys = input(f"Enter {key}(s) (comma-separated, blank for all): ")
+            wanted = [value.strip() for value in raw_keys.split(",") if value.strip()] or None
+            rollups = self.rollup_store.query(level, **{key: wanted})
+            if rollups.empty:
+                print("No rollup data found!")
+            else:
+                print(f"\n{level.replace('_', ' by ').capitalize()} rollup ({len(rollups)} rows):")
+                pd.set_option('display.max_rows', None)
+                print(rollups.drop(columns=['gpa_sum', 'gpa_sumsq']).to_string(index=False))
+                pd.reset_option('display.max_rows')
+        elif history_choice == '12':
             return
         else:
             print("Invalid option!")
@@ -581,7 +1016,7 @@ class TerminalTester:
                 if 'id' not in self.top_performers.columns:
                     print("Error: Top performers data missing 'id' column. Skipping Good List update.")
                 else:
-                    updated_df, already_on_list = self.history.update_good_list(self.top_performers)
+                    updated_df, already_on_list = self.history.update_good_list(self.top_performers, run=run_name(self.run_file))
                     print(f"Good List updated: {len(self.top_performers) - len(already_on_list)} new, {len(already_on_list)} already on list")
 
             # 5. Process bottom performers
@@ -599,7 +1034,7 @@ class TerminalTester:
                 if 'id' not in self.bottom_performers.columns:
                     print("Error: Bottom performers data missing 'id' column. Skipping Work List update.")
                 else:
-                    updated_df, already_on_list = self.history.update_work_list(self.bottom_performers)
+                    updated_df, already_on_list = self.history.update_work_list(self.bottom_performers, run=run_name(self.run_file))
                     print(f"Work List updated: {len(self.bottom_performers) - len(already_on_list)} new, {len(already_on_list)} already on list")
 
             # 6. Read first SEC file
@@ -627,7 +1062,7 @@ class TerminalTester:
                 print("Missing required data for Z-score analysis. Skipping.")
             else:
                 threshold = 1.96
-                result_data, self.zscore_results = analyze_sections(self.run_file, self.grp_files, self.sec_files, threshold)
+                result_data, self.zscore_results = ZScoreCalculator.analyze_sections(self.run_file, self.grp_files, self.sec_files, threshold)
                 if not result_data:
                     print("No Z-score results found!")
                 else:
@@ -6,11 +6,9 @@ Manages the main window, pages, and navigation.
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import sv_ttk as sv
-import pandas as pd
 
 # Using absolute imports instead of relative imports
-from test_gui.config import BUTTON_FONT, options, configure_table_options
+from test_gui.config import BUTTON_FONT, configure_table_options
 
 # The PAGE_CLASSES will be imported after we define the pages class
 # to avoid circular imports
@@ -28,15 +26,17 @@ class ImprovedGradeGUI(tk.Tk):
         self.minsize(800, 500)
 
         # Set theme
+        import sv_ttk as sv
         sv.set_theme("dark")
 
-        # Configure table options - but don't apply them globally
-        self.table_options = configure_table_options()
-
         # Store current file path and last loaded file for caching checks
         self.filepath = ""
         self.last_loaded_file = None
 
+        # Background prefetch of the selected run file (optional)
+        self.prefetch_enabled = True
+        self.prefetcher = None
+
         # Create style for widgets
         style = ttk.Style()
         style.configure("TButton", font=BUTTON_FONT, padding=(10, 5))
@@ -45,26 +45,41 @@ class ImprovedGradeGUI(tk.Tk):
         self.load_icons()
 
         # Create main container
-        container = tk.Frame(self)
-        container.pack(side='top', fill='both', expand=True)
+        self.container = tk.Frame(self)
+        self.container.pack(side='top', fill='both', expand=True)
 
-        # Initialize frames dictionary
+        # Initialize frames dictionary, pages are created on first navigation
         self.frames = {}
 
-        # Import page classes here to avoid circular imports
-        from test_gui.pages import PAGE_CLASSES
-        
-        # Create all pages using the PAGE_CLASSES dictionary
-        for name, Page in PAGE_CLASSES.items():
-            page_instance = Page(container, self)
-            self.frames[name] = page_instance  # Store by name
-
         # Show initial page (HomePage)
         self.show_frame_by_name('HomePage')
 
         # Add an example data method for testing
         self.example_data_loaded = False
 
+    @property
+    def table_options(self):
+        """Table options, loaded with pandastable the first time a table needs them."""
+        return configure_table_options()
+
+    def get_frame(self, page_name):
+        """
+        Return the page with the given name, creating it on first use.
+
+        Args:
+            page_name: The string name of the page class
+
+        Returns:
+            The page instance, or None if no page has that name
+        """
+        if page_name not in self.frames:
+            # Import page classes here to avoid circular imports
+            from test_gui.pages import PAGE_CLASSES
+            if page_name not in PAGE_CLASSES:
+                return None
+            self.frames[page_name] = PAGE_CLASSES[page_name](self.container, self)
+        return self.frames[page_name]
+
     def load_icons(self):
         """Load and prepare icons for the application."""
         # Define icon paths relative to the script location might be safer
@@ -107,16 +122,16 @@ class ImprovedGradeGUI(tk.Tk):
             page_name: The string name of the page class to display
             **kwargs: Additional arguments to pass to the page's prepare method
         """
-        if page_name not in self.frames:
+        # Get the frame to show, building it if this is its first visit
+        frame = self.get_frame(page_name)
+        if frame is None:
             print(f"Error: Page '{page_name}' not found.")
             return
 
-        # Hide all frames first
-        for frame in self.frames.values():
-            frame.pack_forget()
-
-        # Get the frame to show
-        frame = self.frames[page_name]
+        # Hide all other frames
+        for other in self.frames.values():
+            if other is not frame:
+                other.pack_forget()
 
         # Prepare the frame with any data it needs
         if hasattr(frame, "prepare"):
@@ -131,11 +146,32 @@ class ImprovedGradeGUI(tk.Tk):
         frame.tkraise()  # Bring the frame to the front
 
     def set_filepath(self, filepath):
-        """Set the current file path."""
+        """Set the current file path and start prefetching it in the background."""
         self.filepath = filepath
         # Reset last loaded file when a new file is explicitly set
         self.last_loaded_file = None
 
+        if self.prefetch_enabled and filepath:
+            if self.prefetcher is None:
+                from prefetch import RunPrefetcher
+                self.prefetcher = RunPrefetcher()
+            # Cancels the prefetch of any previously selected run
+            self.prefetcher.start(filepath)
+
+    def get_prefetched(self, key):
+        """
+        Get a prefetched result for the current file.
+
+        Args:
+            key: 'grp_files', 'sec_files', 'good' or 'bad'
+
+        Returns:
+            The prefetched value, or None if it is not ready yet
+        """
+        if self.prefetcher is None or not self.filepath:
+            return None
+        return self.prefetcher.get(self.filepath, key)
+
     def get_filepath(self):
         """Get the current file path."""
         return self.filepath
@@ -168,29 +204,66 @@ class ImprovedGradeGUI(tk.Tk):
         if not file_path:
             return  # User cancelled
 
-        try:
-            # Export based on file extension
-            if file_path.endswith('.html'):
-                df.to_html(file_path, index=False)
-            elif file_path.endswith('.csv'):
-                df.to_csv(file_path, index=False)
-            elif file_path.endswith('.xlsx'):
-                # Ensure openpyxl is installed for Excel export
-                try:
-                    import openpyxl
-                    df.to_excel(file_path, index=False)
-                except ImportError:
-                    messagebox.showerror("Export Error", "Please install the 'openpyxl' library to export to Excel.\nRun: pip install openpyxl")
-                    return
-
-            messagebox.showinfo("Export Successful", f"Data exported successfully to {file_path}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export data: {str(e)}")
+        self.export_in_background(df, [file_path])
+
+    def export_in_background(self, df, paths):
+        """
+        Stream a DataFrame to one or more files on a worker thread.
+
+        A small progress window is shown while the export runs; the worker's
+        progress is handed to the Tk thread through a queue polled with after().
+
+        Args:
+            df: DataFrame to export
+            paths: Output file paths; every format is written in one pass
+        """
+        import queue
+        from exporter import export_in_background
+
+        updates = queue.Queue()
+
+        progress_window = tk.Toplevel(self)
+        progress_window.title("Exporting")
+        progress_window.transient(self)
+        ttk.Label(progress_window, text="Exporting " + ", ".join(os.path.basename(p) for p in paths)).pack(padx=20, pady=(15, 5))
+        progress_bar = ttk.Progressbar(progress_window, length=300, mode='determinate', maximum=max(len(df), 1))
+        progress_bar.pack(padx=20, pady=5)
+
+        _, cancel_event = export_in_background(
+            df, paths,
+            on_progress=lambda rows, total: updates.put(('progress', rows)),
+            on_done=lambda rows, error: updates.put(('done', error)),
+            index=False
+        )
+        ttk.Button(progress_window, text="Cancel", command=cancel_event.set).pack(pady=(5, 15))
+
+        def poll():
+            try:
+                while True:
+                    kind, value = updates.get_nowait()
+                    if kind == 'progress':
+                        progress_bar['value'] = value
+                    else:
+                        progress_window.destroy()
+                        if isinstance(value, InterruptedError):
+                            messagebox.showinfo("Export Cancelled", "The export was cancelled.")
+                        elif value is not None:
+                            messagebox.showerror("Export Error", f"Failed to export data: {str(value)}")
+                        else:
+                            messagebox.showinfo("Export Successful", "Data exported successfully to " + ", ".join(paths))
+                        return
+            except queue.Empty:
+                pass
+            self.after(100, poll)
+
+        poll()
 
     def load_example_data(self):
         """
         Loads example data for testing when no file is available.
         """
+        import pandas as pd
+
         # Create sample data with multiple sections
         data = {
             'FName': ['John', 'Jane', 'Bob', 'Alice', 'Tom', 'Sarah', 
@@ -6,21 +6,18 @@ Includes HomePage, DashBoard, SearchStudents, and PerformerPage.
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from pandastable import Table, TableModel, config
-import pandas as pd
-import numpy as np
 
-# Assuming GoodAndBadList is in the parent directory
+# GoodAndBadList is in the parent directory. It is imported where it is used,
+# together with pandas, pandastable and stats_utils, so that the home page
+# can be shown before any of them are loaded.
 import sys
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
-from GoodAndBadList import Lists
 
 # Use absolute imports
 from test_gui.base_page import BasePage
-from test_gui.config import TITLE_FONT, BUTTON_FONT, INFO_FONT, DEFAULT_PADDING, options
-from test_gui.stats_utils import perform_z_test, calculate_section_stats, compare_section_to_group
+from test_gui.config import TITLE_FONT, BUTTON_FONT, INFO_FONT, DEFAULT_PADDING, configure_table_options
 
 class HomePage(BasePage):
     """
@@ -230,6 +227,14 @@ class SearchStudents(BasePage):
         grade_combo.current(0)  # Set default to "All"
         grade_combo.pack(side=tk.LEFT, padx=(0, DEFAULT_PADDING))
 
+        # Cohort filter expression, e.g. grade in (D+, D, D-, F) and last ~ "s*"
+        filter_label = tk.Label(search_frame, text="Filter:")
+        filter_label.pack(side=tk.LEFT, padx=(DEFAULT_PADDING, 5))
+
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(search_frame, textvariable=self.filter_var, width=30)
+        filter_entry.pack(side=tk.LEFT, padx=(0, DEFAULT_PADDING))
+
         # Search button
         search_btn = ttk.Button(
             search_frame,
@@ -328,10 +333,16 @@ class SearchStudents(BasePage):
         Load all student data from the run file.
         Combines good and bad lists as a placeholder for a full data load method.
         """
+        import pandas as pd
+        from GoodAndBadList import Lists
         try:
             # This is a workaround - ideally we would have a proper method to load all students
-            good_df = Lists.goodList(filepath)
-            bad_df = Lists.badList(filepath)
+            good_df = self.controller.get_prefetched('good')
+            if good_df is None:
+                good_df = Lists.goodList(filepath)
+            bad_df = self.controller.get_prefetched('bad')
+            if bad_df is None:
+                bad_df = Lists.badList(filepath)
 
             # Combine both datasets
             if good_df is not None and bad_df is not None:
@@ -383,6 +394,16 @@ class SearchStudents(BasePage):
                 messagebox.showerror("Filter Error", "Grade column not found in data.")
                 return
 
+        # Apply cohort filter expression
+        expression = self.filter_var.get().strip()
+        if expression:
+            from cohort_filter import compile_filter
+            try:
+                filtered = compile_filter(expression).apply(filtered)
+            except ValueError as e:
+                messagebox.showerror("Filter Error", str(e))
+                return
+
         # Update filtered data
         self.filtered_df = filtered
 
@@ -397,6 +418,7 @@ class SearchStudents(BasePage):
         """Reset all filters."""
         self.name_var.set("")
         self.grade_var.set("All")
+        self.filter_var.set("")
 
         # Reset filtered data to full dataset
         if self.df is not None:
@@ -425,6 +447,8 @@ class SearchStudents(BasePage):
             return
 
         # Create new table with correct options
+        from pandastable import Table
+        options = configure_table_options()
         try:
             self.table = Table(
                 self.table_frame,
@@ -548,14 +572,19 @@ class PerformerPage(BasePage):
             return
 
         # Load data
+        import pandas as pd
+        from GoodAndBadList import Lists
         try:
             self.status_var.set("Loading data...")
             self.update()  # Force UI update
 
-            if self.performer_type == "top":
-                self.df = Lists.goodList(filepath)
-            else:
-                self.df = Lists.badList(filepath)
+            # Use the background prefetch if it has finished this list
+            self.df = self.controller.get_prefetched('good' if self.performer_type == "top" else 'bad')
+            if self.df is None:
+                if self.performer_type == "top":
+                    self.df = Lists.goodList(filepath)
+                else:
+                    self.df = Lists.badList(filepath)
 
             if hasattr(self.controller, 'last_loaded_file'):
                 self.controller.last_loaded_file = filepath  # Track loaded file
@@ -598,6 +627,8 @@ class PerformerPage(BasePage):
             return
 
         # Create new table with correct options
+        from pandastable import Table
+        options = configure_table_options()
         try:
             self.table = Table(
                 self.table_frame,
@@ -638,6 +669,8 @@ class PerformerPage(BasePage):
         if self.df is None or self.df.empty:
             messagebox.showinfo("Analysis", "No data available for analysis.")
             return
+
+        from test_gui.stats_utils import compare_sections_to_group
             
         # Create a new top-level window for the analysis
         analysis_window = tk.Toplevel(self)
@@ -655,10 +688,11 @@ class PerformerPage(BasePage):
                 analysis_window.destroy()
                 return
                 
-            course_ids = self.df['CourseID'].unique()
+            # Compare every section to the group in one batched computation
+            comparison, overall_stats = compare_sections_to_group(self.df, 'CourseID')
             
             # If no course IDs, show message
-            if len(course_ids) == 0:
+            if comparison.empty:
                 no_data_label = tk.Label(
                     content_frame, 
                     text="No course sections found for analysis.", 
@@ -671,9 +705,6 @@ class PerformerPage(BasePage):
             overall_frame = tk.LabelFrame(content_frame, text="Overall Statistics")
             overall_frame.pack(fill="x", padx=DEFAULT_PADDING, pady=DEFAULT_PADDING)
             
-            # Calculate overall statistics
-            overall_stats = calculate_section_stats(self.df)
-            
             # Display overall statistics
             overall_label = tk.Label(
                 overall_frame,
@@ -702,25 +733,19 @@ class PerformerPage(BasePage):
             canvas.pack(side="left", fill="both", expand=True)
             scrollbar.pack(side="right", fill="y")
             
-            # For each course ID, create a section in the analysis
-            for course_id in sorted(course_ids):
+            # Render one frame per row of the comparison table
+            for row in comparison.itertuples(index=False):
                 # Create a frame for this section
-                section_frame = tk.LabelFrame(scrollable_frame, text=f"Section: {course_id}")
+                section_frame = tk.LabelFrame(scrollable_frame, text=f"Section: {row.section}")
                 section_frame.pack(fill="x", padx=DEFAULT_PADDING, pady=DEFAULT_PADDING)
                 
-                # Get section data
-                section_df = self.df[self.df['CourseID'] == course_id]
-                
-                # Compare to overall
-                comparison = compare_section_to_group(section_df, self.df)
-                
                 # Build the display text
                 section_text = (
-                    f"Students: {comparison['section_stats']['count']}\n"
-                    f"Average GPA: {comparison['section_stats']['mean']:.2f}\n"
-                    f"Z-Score: {comparison['z_score']:.2f}\n"
-                    f"P-Value: {comparison['p_value']:.4f}\n"
-                    f"Interpretation: {comparison['interpretation']}"
+                    f"Students: {row.count}\n"
+                    f"Average GPA: {row.mean:.2f}\n"
+                    f"Z-Score: {row.z_score:.2f}\n"
+                    f"P-Value: {row.p_value:.4f}\n"
+                    f"Interpretation: {row.interpretation}"
                 )
                 
                 # Add a label with the section info
@@ -734,8 +759,8 @@ class PerformerPage(BasePage):
                 section_label.pack(anchor=tk.W)
                 
                 # Color-code based on significance and direction
-                if comparison['is_significant']:
-                    if comparison['z_score'] > 0:  # Above average
+                if row.is_significant:
+                    if row.z_score > 0:  # Above average
                         section_frame.config(bg="#d4edda")  # Light green
                         section_label.config(bg="#d4edda")
                     else:  # Below average
@@ -5,10 +5,26 @@ This module provides statistical functions for analyzing grade data,
 such as z-tests for comparing section GPAs to group averages.
 """
 
-import scipy.stats as stats
+import math
 import numpy as np
 import pandas as pd
 
+
+def normal_cdf(x):
+    """
+    Standard normal cumulative distribution function.
+
+    Uses math.erf (as ZScoreCalculator.compute_p_value does) so that scipy
+    is not needed for the z-tests.
+
+    Parameters:
+    x (float): Value to evaluate
+
+    Returns:
+    float: P(Z <= x) for a standard normal Z
+    """
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
 def perform_z_test(section_gpa, group_mean, group_std):
     """
     Performs a Z-test to compare a section's average GPA to the group average.
@@ -29,7 +45,7 @@ def perform_z_test(section_gpa, group_mean, group_std):
     z_score = (section_gpa - group_mean) / group_std
     
     # Get two-tailed p-value
-    p_value = 2 * (1 - stats.norm.cdf(abs(z_score)))
+    p_value = 2 * (1 - normal_cdf(abs(z_score)))
     
     return z_score, p_value
 
@@ -104,6 +120,76 @@ def compare_section_to_group(section_df, group_df):
         'interpretation': get_significance_interpretation(z_score, p_value)
     }
 
+def two_tailed_p_values(z_scores):
+    """
+    Two-tailed p-values for an array of z-scores.
+
+    Parameters:
+    z_scores (array-like): Z-scores
+
+    Returns:
+    np.ndarray: P(|Z| >= |z|) for each z, same as perform_z_test gives
+    """
+    from zscore_calculator import ZScoreCalculator
+
+    # erfc(|z|/sqrt(2)) == 2 * (1 - normal_cdf(|z|)), for the whole array at once
+    return ZScoreCalculator.compute_p_values(z_scores)
+
+def compare_sections_to_group(df, section_col='CourseID'):
+    """
+    Compare every section's performance to the overall group in one pass.
+
+    Batched version of compare_section_to_group: the section statistics come
+    from a single groupby, the group mean and standard deviation are computed
+    once, and the z-scores and p-values are calculated as arrays.
+
+    Parameters:
+    df (pd.DataFrame): Student data for the whole group, with a GPA column
+    section_col (str): Column identifying each student's section
+
+    Returns:
+    tuple: (results, group_stats)
+        results (pd.DataFrame): One row per section, sorted by section, with
+            columns section, count, mean, z_score, p_value, is_significant,
+            direction and interpretation
+        group_stats (dict): Group statistics as from calculate_section_stats
+    """
+    group_stats = calculate_section_stats(df)
+    columns = ['section', 'count', 'mean', 'z_score', 'p_value',
+               'is_significant', 'direction', 'interpretation']
+    if df.empty or 'GPA' not in df.columns or section_col not in df.columns:
+        return pd.DataFrame(columns=columns), group_stats
+
+    grouped = df.groupby(section_col, sort=True)['GPA']
+    counts = grouped.size()
+    means = grouped.mean()
+
+    section_means = means.to_numpy(dtype=float)
+    group_mean = group_stats['mean']
+    group_std = group_stats['std_dev']
+
+    # Same edge cases as perform_z_test: no spread or no data -> z 0, p 1
+    if group_std == 0 or np.isnan(group_std) or np.isnan(group_mean):
+        z_scores = np.zeros(len(section_means))
+    else:
+        z_scores = (section_means - group_mean) / group_std
+        z_scores[np.isnan(section_means)] = 0.0
+    p_values = two_tailed_p_values(z_scores)
+
+    results = pd.DataFrame({
+        'section': means.index,
+        'count': counts.to_numpy(),
+        'mean': section_means,
+        'z_score': z_scores,
+        'p_value': p_values,
+        'is_significant': p_values < 0.05,
+        'direction': np.where(z_scores > 0, 'above', 'below'),
+    })
+    results['interpretation'] = [
+        get_significance_interpretation(z, p) for z, p in zip(z_scores, p_values)
+    ]
+    return results, group_stats
+
 def get_significance_interpretation(z_score, p_value):
     """
     Get a human-readable interpretation of z-score and p-value.
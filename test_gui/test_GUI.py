@@ -20,13 +20,6 @@ if current_dir not in sys.path:
 # Import the function to run the app from the app module using absolute import
 from test_gui.app import run_app
 
-# Verify scipy is available for z-test functionality
-try:
-    import scipy.stats
-except ImportError:
-    print("Warning: scipy not found. Z-test functionality will be limited.")
-    print("Install scipy with: pip install scipy")
-
 # Run the application when the script is executed directly
 if __name__ == "__main__":
     run_app()
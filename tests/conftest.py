@@ -0,0 +1,33 @@
+"""Shared pytest setup: the modules live at the repository root."""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture
+def poc_data(tmp_path):
+    """A scratch copy of the bundled COMSC330_POC_Data folder, safe to edit."""
+    return shutil.copytree(os.path.join(REPO_ROOT, "COMSC330_POC_Data"), tmp_path / "COMSC330_POC_Data")
+
+
+@pytest.fixture
+def edit_section():
+    """Return edit(path, row=0, grade='F'), which sets one student's grade in a .sec file."""
+    def edit(path, row=0, grade='F'):
+        with open(path, 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        # Line 0 is the header
+        lines[row + 1] = f'{lines[row + 1].rsplit(",", 1)[0]},"{grade}"'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(lines) + '\n')
+        # Make the edit visible even when the size is unchanged
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return edit
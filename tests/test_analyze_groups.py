@@ -0,0 +1,45 @@
+"""Tests for ZScoreCalculator.analyze_groups on the bundled SPRING25 run."""
+
+import os
+
+import pytest
+
+from grp_parser import grpReader
+from run_parser import runReader
+from zscore_calculator import ZScoreCalculator
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "COMSC330_POC_Data")
+RUN_FILE = os.path.join(DATA_DIR, "Runs", "SPRING25.RUN")
+
+
+def test_each_section_is_compared_with_its_own_group():
+    _, table = ZScoreCalculator.analyze_groups(RUN_FILE)
+
+    groups = runReader(RUN_FILE)
+    assert sorted(table['group'].unique()) == ['COMSC110', 'COMSC210']
+    assert len(table) == 4
+    assert table.groupby('group')['group_gpa'].nunique().eq(1).all()
+    assert table['group_gpa'].nunique() == 2
+
+    for grp_file in groups:
+        group = os.path.splitext(os.path.basename(grp_file))[0]
+        sections = grpReader(RUN_FILE, [grp_file])
+        # analyze_sections on one group's sections pools exactly that group
+        _, expected = ZScoreCalculator.analyze_sections(RUN_FILE, [grp_file], sections)
+        rows = table[table['group'] == group].set_index('section')
+        assert sorted(rows.index) == sorted(os.path.basename(path) for path in sections)
+        for result in expected.itertuples():
+            row = rows.loc[os.path.basename(result.section)]
+            assert row['group_gpa'] == pytest.approx(result.group_gpa, abs=1e-3)
+            assert row['group_std'] == pytest.approx(result.group_std, abs=1e-3)
+            assert row['section_gpa'] == pytest.approx(result.section_gpa, abs=1e-3)
+            assert row['z_score'] == pytest.approx(result.z_score, abs=1e-3)
+            assert row['p_value'] == pytest.approx(result.p_value, abs=1e-5)
+
+
+def test_only_the_requested_groups():
+    first_group = runReader(RUN_FILE)[:1]
+    _, table = ZScoreCalculator.analyze_groups(RUN_FILE, first_group)
+    assert set(table['group']) == {'COMSC110'}
+    _, everything = ZScoreCalculator.analyze_groups(RUN_FILE)
+    assert list(table['z_score']) == list(everything[everything['group'] == 'COMSC110']['z_score'])
@@ -0,0 +1,104 @@
+"""Tests for catalog.SectionCatalog and StudentIndex."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalog import SectionCatalog, StudentIndex
+
+
+def _write_sec(folder, name, rows, credit_hours="4.0"):
+    """Write a .sec file: a header line, then "Last","First","id","grade" rows."""
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f"{os.path.splitext(name)[0]} {credit_hours}\n")
+        for student_id, grade in rows:
+            file.write(f'"Adams","Emily","{student_id}","{grade}"\n')
+    # Make an edit visible even on coarse file system clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+def _enrollments(index):
+    return index.enrollments().sort_values(['id', 'section']).reset_index(drop=True)
+
+
+def _assert_sorted(index):
+    assert np.all(index.ids[:-1] <= index.ids[1:])
+
+
+def _assert_matches_full_rebuild(catalog, tmp_path):
+    fresh = SectionCatalog(catalog.sections_dir, cache_dir=str(tmp_path / "fresh_cache"))
+    fresh.refresh(save=False)
+    pd.testing.assert_frame_equal(_enrollments(catalog.index), _enrollments(fresh.index))
+    assert list(catalog.sections['section']) == list(fresh.sections['section'])
+
+
+def test_refresh_adds_edits_and_removes_sections(tmp_path):
+    sections = tmp_path / "Sections"
+    sections.mkdir()
+    _write_sec(sections, "COMSC110.01S25.SEC", [('m2', 'A'), ('k1', 'B'), ('z9', 'F')])
+    _write_sec(sections, "COMSC210.01F24.SEC", [('a1', 'C'), ('m2', 'D')])
+    catalog = SectionCatalog(str(sections))
+
+    assert catalog.refresh() == {'added': ['COMSC110.01S25.SEC', 'COMSC210.01F24.SEC'], 'changed': [], 'removed': []}
+    assert len(catalog.index) == 5
+    _assert_sorted(catalog.index)
+    assert list(catalog.transcript('m2')['section']) == ['COMSC210.01F24.SEC', 'COMSC110.01S25.SEC']
+    assert catalog.refresh() == {'added': [], 'changed': [], 'removed': []}
+
+    # New students sort in between the kept ones
+    _write_sec(sections, "COMSC110.01S25.SEC", [('m2', 'A-'), ('b5', 'B'), ('y0', 'D'), ('k1', 'B')])
+    _write_sec(sections, "COMSC330.01S25.SEC", [('c3', 'A'), ('m2', 'B')])
+    assert catalog.refresh() == {'added': ['COMSC330.01S25.SEC'], 'changed': ['COMSC110.01S25.SEC'], 'removed': []}
+    _assert_sorted(catalog.index)
+    _assert_matches_full_rebuild(catalog, tmp_path)
+    assert catalog.transcript('z9').empty
+    assert list(catalog.transcript('m2')['grade']) == ['D', 'A-', 'B']
+
+    os.remove(sections / "COMSC210.01F24.SEC")
+    assert catalog.refresh() == {'added': [], 'changed': [], 'removed': ['COMSC210.01F24.SEC']}
+    _assert_sorted(catalog.index)
+    _assert_matches_full_rebuild(catalog, tmp_path)
+    assert catalog.transcript('a1').empty
+
+
+def test_apply_merges_into_a_sorted_index():
+    sections = pd.DataFrame({'section': ['S1', 'S2', 'S3'], 'course': 'C', 'number': '01', 'term': 'S25',
+                             'credit_hours': 3.0})
+    index = StudentIndex.build({'S1': pd.DataFrame({'id': ['b', 'd', 'f'], 'grade': ['A', 'B', 'C']}),
+                                'S2': pd.DataFrame({'id': ['a', 'd'], 'grade': ['F', 'D']})},
+                               sections.iloc[:2])
+
+    # Drop S1, add S3 with ids before, between and after the kept ones
+    updated = index.apply(sections.iloc[1:], ['S1'], {'S3': pd.DataFrame({'id': ['zz', 'a', 'c', 'd'],
+                                                                          'grade': ['A', 'B', 'W', 'A']})})
+
+    assert list(updated.ids) == ['a', 'a', 'c', 'd', 'd', 'zz']
+    rows = updated.enrollments()
+    assert list(rows['section']) == ['S2', 'S3', 'S3', 'S2', 'S3', 'S3']
+    assert list(rows['grade']) == ['F', 'B', 'W', 'D', 'A', 'A']
+
+
+def test_index_saved_for_other_sections_is_rejected(tmp_path, capsys):
+    sections = tmp_path / "Sections"
+    sections.mkdir()
+    _write_sec(sections, "COMSC110.01S25.SEC", [('m2', 'A'), ('k1', 'B')])
+    catalog = SectionCatalog(str(sections))
+    catalog.refresh()
+    index_path = os.path.join(catalog.cache_dir, "student_index.npz")
+
+    assert StudentIndex.load(index_path, catalog.sections, catalog.signature()) is not None
+    assert StudentIndex.load(index_path, catalog.sections, "some other signature") is None
+
+    # A section table from a later save next to the older index
+    stale = catalog.sections.copy()
+    stale['mtime_ns'] += 1
+    stale.to_csv(os.path.join(catalog.cache_dir, "sections.csv"), index=False)
+    reopened = SectionCatalog(str(sections))
+    assert "out of step" in capsys.readouterr().out
+    assert reopened.sections.empty and len(reopened.index) == 0
+    assert reopened.refresh()['added'] == ['COMSC110.01S25.SEC']
+    assert len(reopened.index) == 2
@@ -0,0 +1,125 @@
+"""Tests for the cohort filter expression parser and its masks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cohort_filter import CohortFilter, compile_filter
+
+
+@pytest.fixture
+def enrollments():
+    return pd.DataFrame({
+        'id': ['1', '2', '3', '4', '5', '6'],
+        'Grade': ['A', 'A-', 'B+', 'D', 'F', 'W'],
+        'term': ['S20', 'F20', 'S21', 'F20', 'F22', 'S20'],
+        'course': ['COMSC110', 'COMSC310', 'COMSC330', 'MATH200', 'COMSC330', 'ENGR123'],
+        'section': ['COMSC110.01S20.SEC', 'COMSC310.01F20.SEC', 'COMSC330.01S21.SEC',
+                    'MATH200.02F20.SEC', 'COMSC330.01F22.SEC', 'ENGR123.01S20.SEC'],
+        'credit_hours': [4.0, 3.0, 3.0, 4.0, 3.0, 2.0],
+    })
+
+
+def _ids(expression, df):
+    return list(CohortFilter(expression).apply(df)['id'])
+
+
+def test_named_cohorts(enrollments):
+    assert list(compile_filter('good').apply(enrollments)['id']) == ['1', '2']
+    assert list(compile_filter('work').apply(enrollments)['id']) == ['4', '5']
+    assert compile_filter(' Good ').expression == compile_filter('good').expression
+    assert compile_filter('good') is compile_filter('good')
+
+
+def test_in_and_not_in_ignore_case(enrollments):
+    assert _ids('grade in (a, a-)', enrollments) == ['1', '2']
+    assert _ids('grade not in (A, A-, W)', enrollments) == ['3', '4', '5']
+
+
+def test_term_compares_chronologically(enrollments):
+    # S20 < F20 < S21 < F22, unlike their string order
+    assert _ids('term >= F20', enrollments) == ['2', '3', '4', '5']
+    assert _ids('term < S21', enrollments) == ['1', '2', '4', '6']
+
+
+def test_grade_compares_by_points(enrollments):
+    assert _ids('grade >= B+', enrollments) == ['1', '2', '3']
+    # W has no grade points, so it is never ordered
+    assert '6' not in _ids('grade <= F', enrollments)
+
+
+def test_wildcards_and_department(enrollments):
+    assert _ids('course ~ "comsc3*"', enrollments) == ['2', '3', '5']
+    assert _ids('course !~ COMSC*', enrollments) == ['4', '6']
+    assert _ids('department = MATH', enrollments) == ['4']
+
+
+def test_numeric_fields(enrollments):
+    assert _ids('credits >= 4', enrollments) == ['1', '4']
+    assert _ids('credit_hours in (2, 3)', enrollments) == ['2', '3', '5', '6']
+
+
+def test_precedence_not_then_and_then_or(enrollments):
+    # and binds tighter than or
+    assert _ids('grade = A or grade = F and term = F22', enrollments) == ['1', '5']
+    assert _ids('(grade = A or grade = F) and term = F22', enrollments) == ['5']
+    # not binds tighter than and
+    assert _ids('not grade = A and credits = 4', enrollments) == ['4']
+    assert _ids('not (grade = A and credits = 4)', enrollments) == ['2', '3', '4', '5', '6']
+
+
+def test_missing_values_never_match():
+    df = pd.DataFrame({'id': ['1', '2'], 'Grade': ['A', None]})
+    assert list(CohortFilter('grade != A').mask(df)) == [False, False]
+    assert list(CohortFilter('not grade = A').mask(df)) == [False, True]
+
+
+def test_empty_table_gives_empty_mask():
+    mask = CohortFilter('grade = A').mask(pd.DataFrame(columns=['id', 'Grade']))
+    assert mask.dtype == bool and len(mask) == 0
+
+
+def test_fields_are_collected():
+    assert CohortFilter('grade = A and (term > F20 or not course ~ X*)').fields == {'grade', 'term', 'course'}
+
+
+@pytest.mark.parametrize('expression, message', [
+    ('', 'Empty filter expression'),
+    ('   ', 'Empty filter expression'),
+    ('colour = red', "Unknown field 'colour'"),
+    ('grade', 'Expected comparison operator'),
+    ('grade =', 'Expected value'),
+    ('grade in A, B', "Expected ( at position 9"),
+    ('grade in (A, B', 'Expected ) at position'),
+    ('(grade = A', 'Expected )'),
+    ('grade = A and', 'Expected value'),
+    ('grade = A grade = B', "Unexpected 'grade' at position 10"),
+    ('grade = A)', "Unexpected ')'"),
+    ('grade = "A', "Unexpected character"),
+    ('grade not = A', 'Expected in'),
+])
+def test_syntax_errors(expression, message):
+    with pytest.raises(ValueError, match=message.replace('(', r'\(').replace(')', r'\)')):
+        CohortFilter(expression)
+
+
+@pytest.mark.parametrize('expression, message', [
+    ('credits >= many', "needs a number"),
+    ('credits ~ 3', 'is numeric'),
+    ('course > COMSC110', 'cannot be ordered'),
+    ('grade > Z', 'Unknown grade'),
+    ('group = G1', "no column for field 'group'"),
+])
+def test_evaluation_errors(enrollments, expression, message):
+    with pytest.raises(ValueError, match=message):
+        CohortFilter(expression).mask(enrollments)
+
+
+def test_mask_matches_a_row_by_row_evaluation(enrollments):
+    rng = np.random.default_rng(0)
+    big = enrollments.sample(600, replace=True, random_state=1).reset_index(drop=True)
+    big['Grade'] = rng.choice(['A', 'A-', 'B', 'C+', 'D', 'F', 'I'], len(big))
+    mask = CohortFilter('grade in (D, F) and term >= F20 or course ~ ENGR*').mask(big)
+    expected = [(grade in ('D', 'F') and term in ('F20', 'S21', 'F22')) or course.startswith('ENGR')
+                for grade, term, course in zip(big['Grade'], big['term'], big['course'])]
+    assert list(mask) == expected
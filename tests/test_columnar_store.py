@@ -0,0 +1,115 @@
+"""Tests for columnar_store's npz tables and partition filtering."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar_store import append_table, list_partitions, load_table, read_table, write_table
+
+
+def _lists(run, rows):
+    return pd.DataFrame({
+        'id': [f"{run}-{n}" for n in range(rows)],
+        'FirstName': ['Adams'] * rows,
+        'Grade': ['A', 'A-'] * (rows // 2) + ['A'] * (rows % 2),
+        'gpa': np.linspace(3.0, 4.0, rows),
+        'n': np.arange(rows, dtype=np.int64),
+        'significant': [True, False] * (rows // 2) + [True] * (rows % 2),
+        'run': run,
+        'term': ['S25', 'F24'] * (rows // 2) + ['S25'] * (rows % 2),
+    })
+
+
+def _values(series):
+    """Values of a column with every missing value as None."""
+    return [None if pd.isna(value) else value for value in series]
+
+
+def test_npz_round_trip_keeps_strings_numbers_and_nulls(tmp_path):
+    table = pd.DataFrame({
+        'id': ['001', 'é2', None, ''],
+        'grade': ['A', None, 'F', 'B+'],
+        'counts': [{'A': 2}, None, {'F': 1}, {}],
+        'z_score': [1.5, np.nan, -2.25, 0.0],
+        'n': np.array([1, 2, 3, 4], dtype=np.int64),
+        'significant': [True, False, True, False],
+    })
+
+    write_table(table, str(tmp_path), 'zscores', fmt='npz', partition_by=())
+    stored = read_table(str(tmp_path), 'zscores')
+
+    assert _values(stored['id']) == ['001', 'é2', None, '']
+    assert _values(stored['grade']) == ['A', None, 'F', 'B+']
+    # dicts are kept as JSON text
+    assert _values(stored['counts']) == ['{"A": 2}', None, '{"F": 1}', '{}']
+    np.testing.assert_array_equal(stored['z_score'].to_numpy(), table['z_score'].to_numpy())
+    assert stored['n'].dtype == np.int64 and list(stored['n']) == [1, 2, 3, 4]
+    assert stored['significant'].dtype == bool
+    assert list(read_table(str(tmp_path), 'zscores', columns=['grade']).columns) == ['grade']
+
+
+def test_partitions_are_filtered_by_run_and_term(tmp_path):
+    root = str(tmp_path)
+    write_table(_lists('FIRSTRUN', 4), root, 'good_list', fmt='npz')
+    write_table(_lists('SPRING25', 3), root, 'good_list', fmt='npz')
+
+    partitions = list_partitions(root, 'good_list')
+    assert sorted(zip(partitions['run'], partitions['term'])) == [
+        ('FIRSTRUN', 'F24'), ('FIRSTRUN', 'S25'), ('SPRING25', 'F24'), ('SPRING25', 'S25')]
+
+    everything = read_table(root, 'good_list')
+    assert len(everything) == 7
+    assert list(everything.columns[:2]) == ['run', 'term']
+
+    spring = read_table(root, 'good_list', filters={'run': 'SPRING25'})
+    assert sorted(spring['id']) == ['SPRING25-0', 'SPRING25-1', 'SPRING25-2']
+    fall = read_table(root, 'good_list', filters={'run': ['FIRSTRUN', 'SPRING25'], 'term': 'F24'})
+    assert sorted(fall['id']) == ['FIRSTRUN-1', 'FIRSTRUN-3', 'SPRING25-1']
+    # Other columns are matched row by row
+    graded = read_table(root, 'good_list', filters={'run': 'FIRSTRUN', 'Grade': 'A-'}, columns=['id'])
+    assert sorted(graded['id']) == ['FIRSTRUN-1', 'FIRSTRUN-3']
+    assert set(graded.columns) == {'run', 'term', 'id'}
+
+
+def test_rewriting_a_run_replaces_only_its_partitions(tmp_path):
+    root = str(tmp_path)
+    write_table(_lists('FIRSTRUN', 4), root, 'good_list', fmt='npz')
+    write_table(_lists('SPRING25', 4), root, 'good_list', fmt='npz')
+    write_table(_lists('SPRING25', 1), root, 'good_list', fmt='npz')
+
+    assert len(read_table(root, 'good_list', filters={'run': 'FIRSTRUN'})) == 4
+    # Only the S25 partition was rewritten; SPRING25's F24 rows are still there
+    spring = read_table(root, 'good_list', filters={'run': 'SPRING25'})
+    assert sorted(spring['id']) == ['SPRING25-0', 'SPRING25-1', 'SPRING25-3']
+    assert all(len(os.listdir(os.path.dirname(path))) == 1 for path in list_partitions(root, 'good_list')['path'])
+
+
+def test_appended_parts_are_read_together(tmp_path):
+    root = str(tmp_path)
+    append_table(pd.DataFrame({'id': ['1'], 'grade': ['A']}), root, 'snap', fmt='npz')
+    append_table(pd.DataFrame({'id': ['2'], 'grade': [None]}), root, 'snap', fmt='npz')
+    snapshot = read_table(root, 'snap')
+    assert list(snapshot['id']) == ['1', '2']
+    assert _values(snapshot['grade']) == ['A', None]
+
+
+def test_unknown_filter_column_and_missing_table(tmp_path):
+    root = str(tmp_path)
+    write_table(_lists('FIRSTRUN', 2), root, 'good_list', fmt='npz')
+    with pytest.raises(ValueError):
+        read_table(root, 'good_list', filters={'section': 'X'})
+    assert read_table(root, 'no_such_table').empty
+    with pytest.raises(ValueError):
+        write_table(_lists('FIRSTRUN', 2), root, 'good_list', fmt='csv')
+
+
+def test_load_table_rejects_unknown_names_and_missing_roots(tmp_path):
+    root = str(tmp_path)
+    write_table(_lists('FIRSTRUN', 2), root, 'good_list', fmt='npz')
+    assert len(load_table(root, 'good_list', run='FIRSTRUN', term='S25')) == 1
+    with pytest.raises(ValueError):
+        load_table(root, 'good_lsit')
+    with pytest.raises(ValueError):
+        load_table(str(tmp_path / "missing"), 'good_list')
@@ -0,0 +1,102 @@
+"""Tests for exporter.export_dataframe."""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exporter import export_dataframe, export_in_background
+
+
+def _results(rows=7):
+    return pd.DataFrame({
+        'section': [f'COMSC110.0{n}S25.SEC' for n in range(rows)],
+        'note': ['<b>"quoted" & escaped</b>'] + [''] * (rows - 1),
+        'n': np.arange(rows),
+        'z_score': np.round(np.linspace(-2.5, 2.0, rows), 3),
+        'p_value': [np.nan] + [0.5] * (rows - 1),
+        'significant': [True, False] * (rows // 2) + [True] * (rows % 2),
+    })
+
+
+def test_several_formats_in_one_pass(tmp_path):
+    data = _results()
+    csv_path, html_path = str(tmp_path / "z.csv"), str(tmp_path / "z.html")
+    progress = []
+
+    written = export_dataframe(data, [csv_path, html_path], chunk_size=3,
+                               progress=lambda done, total: progress.append((done, total)))
+
+    assert written == 7
+    assert progress == [(3, 7), (6, 7), (7, 7)]
+    with open(csv_path, newline='', encoding='utf-8') as file:
+        assert file.read() == data.to_csv(index=False)
+    with open(html_path, encoding='utf-8') as file:
+        assert file.read().count("<tr>") == 7
+    assert sorted(os.listdir(tmp_path)) == ["z.csv", "z.html"]
+
+
+def test_excel_next_to_csv(tmp_path):
+    pytest.importorskip('openpyxl')
+    data = _results()
+    xlsx_path = str(tmp_path / "z.xlsx")
+
+    export_dataframe(data, [xlsx_path, str(tmp_path / "z.csv")], chunk_size=3)
+
+    pd.testing.assert_frame_equal(pd.read_excel(xlsx_path).fillna({'note': ''}), data, check_dtype=False)
+
+
+def test_html_equals_to_html(tmp_path):
+    data = _results()
+    path = str(tmp_path / "z.html")
+
+    export_dataframe(data, path)
+
+    with open(path, encoding='utf-8') as file:
+        assert file.read() == data.to_html(index=False) + "\n"
+
+
+def test_html_of_an_empty_frame(tmp_path):
+    data = _results().iloc[:0]
+    path = str(tmp_path / "z.html")
+    assert export_dataframe(data, path) == 0
+    with open(path, encoding='utf-8') as file:
+        assert file.read() == data.to_html(index=False) + "\n"
+
+
+def test_chunks_from_a_generator(tmp_path):
+    data = _results()
+    path = str(tmp_path / "z.csv")
+    assert export_dataframe((data.iloc[start:start + 2] for start in range(0, 7, 2)), path) == 7
+    assert len(pd.read_csv(path)) == 7
+
+
+def test_cancel_leaves_no_files(tmp_path):
+    cancel = threading.Event()
+    paths = [str(tmp_path / "z.csv"), str(tmp_path / "z.html")]
+
+    def stop_after_first_chunk(done, total):
+        cancel.set()
+
+    with pytest.raises(InterruptedError):
+        export_dataframe(_results(), paths, chunk_size=2, progress=stop_after_first_chunk, cancel_event=cancel)
+    assert os.listdir(tmp_path) == []
+
+
+def test_background_export_reports_cancel(tmp_path):
+    cancel = threading.Event()
+    cancel.set()
+    outcome = []
+    thread, _ = export_in_background(_results(), [str(tmp_path / "z.csv")], cancel_event=cancel,
+                                     on_done=lambda rows, error: outcome.append((rows, type(error))))
+    thread.join(10)
+    assert outcome == [(0, InterruptedError)]
+    assert os.listdir(tmp_path) == []
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError):
+        export_dataframe(_results(), str(tmp_path / "z.txt"))
+    assert os.listdir(tmp_path) == []
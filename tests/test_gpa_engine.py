@@ -0,0 +1,49 @@
+"""Tests for gpa_engine.compute_gpas against hand-computed GPAs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gpa_engine import GPA_COLUMNS, compute_gpas, cumulative_gpas
+
+
+def _enrollments(rows):
+    return pd.DataFrame(rows, columns=['id', 'term', 'credit_hours', 'Grade'])
+
+
+def test_credit_weighted_term_and_cumulative_gpas():
+    # Terms out of order on purpose; S18 < F18 < S19
+    enrollments = _enrollments([
+        ('x', 'F18', 4.0, 'B'),     # 4 credits * 3.0 = 12
+        ('x', 'S19', 3.0, 'C'),     # 3 * 2.0 = 6
+        ('x', 'S19', 4.0, 'W'),     # withdrawn: no weight
+        ('x', 'S19', np.nan, 'A'),  # no credit hours: no weight
+        ('x', 'S18', 3.0, 'A'),     # 3 * 4.0 = 12
+        ('y', 'S19', 3.0, 'I'),
+        ('y', 'S19', 3.0, 'P'),
+        ('y', 'S19', 3.0, 'NP'),
+        ('z', 'F18', 3.0, 'F'),     # 3 * 0.0 = 0, but the credits count
+        ('z', 'S18', 4.0, 'A-'),    # 4 * 3.7 = 14.8
+    ])
+
+    gpas = compute_gpas(enrollments)
+
+    assert list(gpas.columns) == GPA_COLUMNS
+    assert list(zip(gpas['id'], gpas['term'])) == [
+        ('x', 'S18'), ('x', 'F18'), ('x', 'S19'), ('y', 'S19'), ('z', 'S18'), ('z', 'F18')]
+    assert list(gpas['term_credits']) == [3.0, 4.0, 3.0, 0.0, 4.0, 3.0]
+    assert list(gpas['term_points']) == pytest.approx([12.0, 12.0, 6.0, 0.0, 14.8, 0.0])
+    assert list(gpas['term_gpa']) == pytest.approx([4.0, 3.0, 2.0, np.nan, 3.7, 0.0], nan_ok=True)
+    assert list(gpas['cumulative_credits']) == [3.0, 7.0, 10.0, 0.0, 4.0, 7.0]
+    assert list(gpas['cumulative_points']) == pytest.approx([12.0, 24.0, 30.0, 0.0, 14.8, 14.8])
+    assert list(gpas['cumulative_gpa']) == pytest.approx([4.0, 24 / 7, 3.0, np.nan, 3.7, 14.8 / 7], nan_ok=True)
+
+    latest = cumulative_gpas(gpas)
+    assert list(latest['last_term']) == ['S19', 'S19', 'F18']
+    assert list(latest['gpa']) == pytest.approx([3.0, np.nan, 14.8 / 7], nan_ok=True)
+
+
+def test_lowercase_grade_column_and_no_enrollments():
+    enrollments = _enrollments([('x', 'S25', 4.0, 'B+')]).rename(columns={'Grade': 'grade'})
+    assert compute_gpas(enrollments)['term_gpa'].tolist() == pytest.approx([3.3])
+    assert compute_gpas(enrollments.iloc[:0]).empty
@@ -0,0 +1,59 @@
+"""Tests for grade_distribution.distribution_tests against hand-computed tables."""
+
+import math
+
+import numpy as np
+import pytest
+
+from grade_distribution import GRADE_BINS, distribution_tests
+
+
+def _row(**grades):
+    """A 13-bin histogram row, e.g. _row(A=6, B=2, F=2)."""
+    return [grades.get(grade, 0) for grade in GRADE_BINS]
+
+
+# Group 0: two sections of 10 students (A/B/F = 8/6/6 overall, so 4/3/3 expected each)
+COUNTS = np.array([_row(A=6, B=2, F=2), _row(A=2, B=4, F=4)])
+GROUP = np.array([0, 0])
+
+
+def test_chi_square_of_each_section_against_the_rest():
+    result = distribution_tests(COUNTS, GROUP, method='chi2')
+
+    # Section: (6-4)^2/4 + (2-3)^2/3 + (2-3)^2/3 = 5/3; the rest mirrors it
+    expected = 10 / 3
+    assert list(result['statistic']) == pytest.approx([expected, expected])
+    assert list(result['df']) == [2.0, 2.0]
+    # With two degrees of freedom the tail is exp(-x / 2); chi2_sf may approximate it
+    assert list(result['p_value']) == pytest.approx([math.exp(-expected / 2)] * 2, abs=0.01)
+    assert list(result['effect_size']) == pytest.approx([math.sqrt(expected / 20)] * 2)
+
+
+def test_g_statistic_of_each_section_against_the_rest():
+    result = distribution_tests(COUNTS, GROUP)
+
+    expected = 2 * (6 * math.log(6 / 4) + 2 * math.log(2 / 3) + 2 * math.log(2 / 3)
+                    + 2 * math.log(2 / 4) + 4 * math.log(4 / 3) + 4 * math.log(4 / 3))
+    assert list(result['statistic']) == pytest.approx([expected, expected])
+    assert list(result['df']) == [2.0, 2.0]
+    assert list(result['p_value']) == pytest.approx([math.exp(-expected / 2)] * 2, abs=0.01)
+
+
+def test_undefined_cases_are_nan():
+    counts = np.array([
+        _row(A=6, B=2, F=2), _row(A=2, B=4, F=4),   # group 0: a normal pair
+        _row(A=3, C=1),                              # group 1: alone in its group
+        _row(A=5), _row(A=2),                        # group 2: a single grade
+        _row(B=1), _row(),                           # group 3: a section without grades
+    ])
+    result = distribution_tests(counts, np.array([0, 0, 1, 2, 2, 3, 3]), method='chi2')
+
+    for key in ('statistic', 'df', 'p_value', 'effect_size'):
+        assert not np.isnan(result[key][:2]).any()
+        assert np.isnan(result[key][2:]).all()
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        distribution_tests(COUNTS, GROUP, method='fisher')
@@ -0,0 +1,333 @@
+"""Tests for History.HistoryManager and the history helpers."""
+
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+from History import ENTRY_COLUMNS, HistoryManager, diff_entries
+
+
+def _rows(ids, grades, section="COMSC110.01S25.SEC", run="SPRING25"):
+    """A Lists-style frame, as update_list receives it."""
+    return pd.DataFrame({
+        'id': ids,
+        'FirstName': ['Adams'] * len(ids),
+        'LastName': ['Emily'] * len(ids),
+        'Grade': grades,
+        'section_source': section,
+        'run': run,
+    })
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    # HistoryManager keeps its files under ./historical_lists
+    monkeypatch.chdir(tmp_path)
+    manager = HistoryManager(compact_threshold=None)
+    yield manager
+    manager.close()
+
+
+def _journal_rows(manager, file_path):
+    with open(manager.journal_path(file_path), 'r', encoding='utf-8') as file:
+        return len(file.read().splitlines()) - 1
+
+
+def test_update_skips_entries_already_recorded(history):
+    appended, existing = history.update_work_list(_rows(['1', '2'], ['D', 'F']))
+    assert len(appended) == 2
+    assert existing == []
+
+    appended, existing = history.update_work_list(_rows(['1', '2', '3'], ['D', 'F', 'D-']))
+    assert list(appended['id']) == ['3']
+    assert sorted(existing) == ['1', '2']
+    assert _journal_rows(history, history.work_file) == 3
+
+    entries = history.get_entries('work')
+    assert not entries.duplicated(subset=['id', 'section', 'list']).any()
+    assert sorted(entries['id']) == ['1', '2', '3']
+
+
+def test_first_grade_for_a_section_wins(history):
+    history.update_work_list(_rows(['1'], ['D']))
+    history.update_work_list(_rows(['1'], ['F']))
+    assert list(history.get_entries('work')['grade']) == ['D']
+
+
+def test_same_batch_duplicates_are_written_once(history):
+    appended, _ = history.update_good_list(_rows(['1', '1'], ['A', 'A']))
+    assert len(appended) == 1
+    assert _journal_rows(history, history.good_file) == 1
+
+
+def test_compaction_folds_journal_and_keeps_entries(history):
+    history.update_good_list(_rows(['1', '2'], ['A', 'A-']))
+    history.update_good_list(_rows(['3'], ['A'], section="COMSC210.01S25.SEC"))
+    before = history.get_entries('good').sort_values('id').reset_index(drop=True)
+
+    wide = history.compact(history.good_file)
+
+    assert _journal_rows(history, history.good_file) == 0
+    assert os.path.exists(history.entries_path(history.good_file))
+    assert sorted(wide['id']) == ['1', '2', '3']
+    fresh = HistoryManager(compact_threshold=None)
+    after = fresh.get_entries('good').sort_values('id').reset_index(drop=True)
+    pd.testing.assert_frame_equal(after[ENTRY_COLUMNS], before[ENTRY_COLUMNS])
+
+
+def test_replaying_a_journal_after_compaction_does_not_duplicate(history):
+    history.update_work_list(_rows(['1', '2'], ['D', 'F']))
+    journal = history.journal_path(history.work_file)
+    with open(journal, 'r', encoding='utf-8') as file:
+        events = file.read()
+    history.compact(history.work_file)
+
+    # A crash before the journal was reset leaves the old events behind
+    with open(journal, 'w', encoding='utf-8') as file:
+        file.write(events)
+
+    fresh = HistoryManager(compact_threshold=None)
+    entries = fresh.get_entries('work')
+    assert sorted(entries['id']) == ['1', '2']
+    fresh.update_work_list(_rows(['2', '3'], ['F', 'D']))
+    assert sorted(fresh.get_entries('work')['id']) == ['1', '2', '3']
+
+
+def test_torn_last_journal_line_is_ignored(history):
+    history.update_work_list(_rows(['1'], ['D']))
+    with open(history.journal_path(history.work_file), 'a', encoding='utf-8') as file:
+        file.write('2,Adams,Emi')
+
+    fresh = HistoryManager(compact_threshold=None)
+    assert list(fresh.get_entries('work')['id']) == ['1']
+    # The next append terminates the torn line instead of merging into it
+    fresh.update_work_list(_rows(['3'], ['F']))
+    assert sorted(HistoryManager(compact_threshold=None).get_entries('work')['id']) == ['1', '3']
+
+
+def test_automatic_compaction_at_threshold(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = HistoryManager(compact_threshold=3)
+    manager.update_work_list(_rows(['1', '2'], ['D', 'F']))
+    assert _journal_rows(manager, manager.work_file) == 2
+    manager.update_work_list(_rows(['3'], ['D']))
+    assert _journal_rows(manager, manager.work_file) == 0
+    assert sorted(manager.get_entries('work')['id']) == ['1', '2', '3']
+
+
+def _append_from_process(folder, worker, count):
+    """Child process: record count students of its own on the work list."""
+    os.chdir(folder)
+    manager = HistoryManager(compact_threshold=5)
+    for number in range(count):
+        manager.update_work_list(_rows([f"{worker}-{number}"], ['F'], run=f"RUN{worker}"))
+
+
+def test_appends_from_several_processes_are_all_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    workers, count = 4, 8
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_append_from_process, args=(str(tmp_path), worker, count))
+                 for worker in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    entries = HistoryManager(compact_threshold=None).get_entries('work')
+    expected = sorted(f"{worker}-{number}" for worker in range(workers) for number in range(count))
+    assert sorted(entries['id']) == expected
+
+
+def test_background_writes_return_the_same_result(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = HistoryManager(compact_threshold=None, background_writes=True)
+    try:
+        futures = [manager.submit_update(_rows([str(number)], ['D']), manager.work_file) for number in range(5)]
+        assert [len(future.result()[0]) for future in futures] == [1] * 5
+        appended, existing = manager.update_work_list(_rows(['0'], ['D']))
+        assert appended.empty and existing == ['0']
+    finally:
+        manager.close()
+
+
+def test_run_snapshots_and_diff_runs(history):
+    history.update_work_list(_rows(['1', '2'], ['D', 'F'], run="R1"))
+    history.update_work_list(_rows(['3'], ['D'], run="R1"))
+    # Student 1 was recorded by R1 already, but still belongs to R2's list
+    history.update_work_list(_rows(['1', '3'], ['D', 'F'], run="R2"))
+
+    assert sorted(history.load_snapshot("R1", 'work')['id']) == ['1', '2', '3']
+    assert sorted(history.load_snapshot("R2", 'work')['id']) == ['1', '3']
+
+    result = history.diff_runs("R1", "R2")
+    assert result['added'].empty
+    assert list(result['removed']['id']) == ['2']
+    assert result['changed'].to_dict('records') == [
+        {'id': '3', 'section': 'COMSC110.01S25.SEC', 'grade_before': 'D', 'grade_after': 'F'}]
+
+    history.compact(history.work_file)
+    assert sorted(history.load_snapshot("R1", 'work')['id']) == ['1', '2', '3']
+
+
+def _entries(rows):
+    return pd.DataFrame(rows, columns=['id', 'section', 'grade'])
+
+
+def test_diff_entries_added_removed_changed():
+    before = _entries([('1', 'S1', 'A'), ('2', 'S1', 'B'), ('3', 'S2', 'C')])
+    after = _entries([('2', 'S1', 'B+'), ('3', 'S2', 'C'), ('4', 'S1', 'A')])
+
+    result = diff_entries(before, after)
+
+    assert list(result['added']['id']) == ['4']
+    assert list(result['removed']['id']) == ['1']
+    assert result['changed'].to_dict('records') == [
+        {'id': '2', 'section': 'S1', 'grade_before': 'B', 'grade_after': 'B+'}]
+
+
+def test_diff_entries_new_section_of_known_student_is_not_a_change():
+    before = _entries([('1', 'S1', 'A')])
+    after = _entries([('1', 'S1', 'A'), ('1', 'S2', 'F')])
+
+    result = diff_entries(before, after)
+
+    assert result['added'].empty
+    assert result['removed'].empty
+    assert result['changed'].empty
+
+
+def test_diff_entries_uses_the_first_row_of_duplicate_keys():
+    before = _entries([('1', 'S1', 'A'), ('1', 'S1', 'F')])
+    after = _entries([('1', 'S1', 'A')])
+    assert diff_entries(before, after)['changed'].empty
+
+
+def test_diff_entries_with_an_empty_side():
+    rows = _entries([('1', 'S1', 'A'), ('2', 'S1', 'B')])
+    empty = _entries([])
+
+    assert len(diff_entries(empty, rows)['added']) == 2
+    assert len(diff_entries(rows, empty)['removed']) == 2
+    result = diff_entries(empty, empty)
+    assert all(frame.empty for frame in result.values())
+
+
+def test_repeat_students_by_section_and_term(history):
+    history.update_work_list(_rows(['1', '2'], ['F', 'D'], section="COMSC110.01S25.SEC"))
+    history.update_work_list(_rows(['1'], ['D'], section="COMSC210.01S25.SEC"))
+    history.update_work_list(_rows(['1', '3'], ['F', 'F'], section="COMSC110.02F24.SEC"))
+
+    by_section = history.repeat_students(2, by='section')
+    assert list(by_section['id']) == ['1']
+    assert by_section.loc[0, 'section_count'] == 3
+    assert by_section.loc[0, 'sections'] == "COMSC110.01S25.SEC,COMSC210.01S25.SEC,COMSC110.02F24.SEC"
+    assert by_section.loc[0, 'grades'] == "F,D,F"
+
+    # Two S25 sections are one term
+    by_term = history.repeat_students(2, by='term')
+    assert list(by_term['id']) == ['1']
+    assert by_term.loc[0, 'term_count'] == 2
+    assert by_term.loc[0, 'terms'] == "S25,F24"
+    assert history.repeat_students(3, by='term').empty
+
+    everyone = history.repeat_students(1)
+    assert list(everyone['id']) == ['1', '2', '3']
+    assert list(everyone['section_count']) == [3, 1, 1]
+
+
+def test_repeat_counts_follow_a_second_update(history):
+    history.update_work_list(_rows(['1', '2'], ['F', 'D'], section="COMSC110.01S25.SEC"))
+    assert history.repeat_students(2).empty
+
+    history.update_work_list(_rows(['2', '2'], ['F', 'F'], section="COMSC210.01F25.SEC"))
+    repeats = history.repeat_students(2)
+    assert list(repeats['id']) == ['2']
+    assert list(repeats[['section_count', 'term_count']].iloc[0]) == [2, 2]
+
+    # Re-recording a known section does not count twice
+    history.update_work_list(_rows(['2'], ['D'], section="COMSC210.01F25.SEC"))
+    assert history.repeat_students(2).loc[0, 'section_count'] == 2
+
+
+def test_saved_repeat_counters_match_a_full_count(history):
+    history.update_work_list(_rows(['1', '2'], ['F', 'D'], section="COMSC110.01S25.SEC"))
+    history.update_work_list(_rows(['1'], ['D'], section="COMSC210.01F24.SEC"))
+    history.compact(history.work_file)
+    assert os.path.exists(history.repeats_path(history.work_file))
+    history.update_work_list(_rows(['2', '3'], ['F', 'F'], section="COMSC310.01S19.SEC"))
+
+    # Saved counters plus the journal, against counting every entry again
+    from_saved = HistoryManager(compact_threshold=None).repeat_students(1)
+    os.remove(history.repeats_path(history.work_file))
+    recounted = HistoryManager(compact_threshold=None).repeat_students(1)
+    pd.testing.assert_frame_equal(from_saved, recounted)
+    assert list(recounted['id']) == ['1', '2', '3']
+    assert list(recounted['terms']) == ['S25,F24', 'S25,S19', 'S19']
+
+
+def test_repeat_counters_are_kept_for_the_work_list_only(history):
+    history.update_good_list(_rows(['1'], ['A'], section="COMSC110.01S25.SEC"))
+    history.update_good_list(_rows(['1'], ['A'], section="COMSC210.01S25.SEC"))
+    history.compact()
+
+    assert history._index(history.good_file).counts is None
+    assert not os.path.exists(history.repeats_path(history.good_file))
+    assert list(history.repeat_students(2, list_name='good')['id']) == ['1']
+
+
+def test_repeat_students_rejects_an_unknown_by(history):
+    with pytest.raises(ValueError):
+        history.repeat_students(2, by='course')
+
+
+def test_check_students_looks_up_a_whole_roster(history):
+    history.update_good_list(_rows(['1'], ['A'], section="COMSC110.01S25.SEC"))
+    history.update_work_list(_rows(['1', '2'], ['F', 'D'], section="COMSC210.01S25.SEC"))
+
+    result = history.check_students(['1', '2', '9'])
+
+    assert list(result['id']) == ['1', '2', '9']
+    assert list(result['good_list']) == [True, False, False]
+    assert list(result['work_list']) == [True, True, False]
+    assert list(result['good_grades']) == ['A', '', '']
+    assert list(result['work_sections']) == ['COMSC210.01S25.SEC', 'COMSC210.01S25.SEC', '']
+    assert list(result['work_grades']) == ['F', 'D', '']
+
+
+def test_check_students_keeps_a_roster_frame_with_an_id_column(history):
+    history.update_work_list(_rows(['2'], ['D']))
+    roster = pd.DataFrame({'ID': [2, 5], 'Grade': ['D', 'B']})
+
+    result = history.check_students(roster)
+
+    assert list(result.columns[:2]) == ['ID', 'Grade']
+    assert list(result['ID']) == [2, 5]
+    assert list(result['work_list']) == [True, False]
+    assert list(result['good_list']) == [False, False]
+    assert list(result['work_grades']) == ['D', '']
+
+
+def test_students_in_section_for_each_list(history):
+    history.update_good_list(_rows(['1'], ['A'], section="COMSC110.01S25.SEC"))
+    history.update_work_list(_rows(['2', '3'], ['F', 'D'], section="COMSC110.01S25.SEC"))
+    history.update_work_list(_rows(['4'], ['F'], section="COMSC210.01S25.SEC"))
+
+    good = history.students_in_section("COMSC110.01S25.SEC", 'good')
+    assert list(good['id']) == ['1'] and list(good['list']) == ['good']
+    work = history.students_in_section("COMSC110.01S25.SEC", 'work')
+    assert list(work['id']) == ['2', '3'] and list(work['grade']) == ['F', 'D']
+    both = history.students_in_section("COMSC110.01S25.SEC")
+    assert list(both['id']) == ['1', '2', '3']
+    assert list(both.columns) == ENTRY_COLUMNS
+
+
+def test_students_in_a_section_not_on_file(history):
+    history.update_work_list(_rows(['2'], ['F']))
+    for list_name in (None, 'good', 'work'):
+        result = history.students_in_section("MATH100.01S25.SEC", list_name)
+        assert result.empty
+        assert list(result.columns) == ENTRY_COLUMNS
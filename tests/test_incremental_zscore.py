@@ -0,0 +1,57 @@
+"""Tests for incremental_zscore.IncrementalAnalyzer."""
+
+import os
+
+import pytest
+
+from grp_parser import grpReader
+from incremental_zscore import IncrementalAnalyzer
+from run_parser import runReader
+from zscore_calculator import ZScoreCalculator
+
+
+def _full_analysis(run_file):
+    """z and p of every section from a full analyze_sections run, keyed by section path."""
+    sections = list(dict.fromkeys(grpReader(run_file, runReader(run_file))))
+    _, table = ZScoreCalculator.analyze_sections(run_file, runReader(run_file), sections)
+    return _z_and_p(table)
+
+
+def _z_and_p(table):
+    values = {}
+    for row in table.itertuples():
+        values[(row.section, 'z')] = row.z_score
+        values[(row.section, 'p')] = row.p_value
+    return values
+
+
+def _incremental_analysis(analyzer):
+    return _z_and_p(analyzer.results()[1])
+
+
+def test_refresh_rereads_only_the_edited_section(poc_data, edit_section, monkeypatch):
+    run_file = os.path.join(poc_data, "Runs", "SPRING25.RUN")
+    analyzer = IncrementalAnalyzer(run_file)
+    before = _incremental_analysis(analyzer)
+    assert before == pytest.approx(_full_analysis(run_file), abs=1e-3)
+
+    edited = os.path.join(poc_data, "Sections", "COMSC210.01S25.SEC")
+    edit_section(edited, row=0, grade='F')
+    edit_section(edited, row=1, grade='F')
+    read = []
+    section_stats = IncrementalAnalyzer._section_stats
+
+    def counting_stats(path, signature):
+        read.append(path)
+        return section_stats(path, signature)
+
+    monkeypatch.setattr(IncrementalAnalyzer, '_section_stats', staticmethod(counting_stats))
+
+    assert analyzer.refresh() == [edited]
+    assert read == [edited]
+    assert analyzer.refresh() == []
+    assert read == [edited]
+
+    after = _incremental_analysis(analyzer)
+    assert after == pytest.approx(_full_analysis(run_file), abs=1e-3)
+    assert after[(edited, 'z')] < before[(edited, 'z')]
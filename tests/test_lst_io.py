@@ -0,0 +1,103 @@
+"""Tests for the .lst writer, streaming reader and comparison."""
+
+import pandas as pd
+import pytest
+
+from lst_io import compare_lst, iter_lst, read_lst, write_lst
+
+
+def _write(tmp_path, text, name="list.lst"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_iter_lst_reads_blocks(tmp_path):
+    path = _write(tmp_path, '"1","Adams, Emily", 2\n"COMSC110.01S25","A"\n"COMSC210.02S25","A-"\n'
+                            '\n"2","Lee, Ava",1\n"ENGR123.11F21","A"')
+    assert list(iter_lst(path)) == [
+        ('1', 'Adams, Emily', [('COMSC110.01S25', 'A'), ('COMSC210.02S25', 'A-')]),
+        ('2', 'Lee, Ava', [('ENGR123.11F21', 'A')]),
+    ]
+
+
+def test_iter_lst_student_with_fewer_sections_than_counted(tmp_path):
+    path = _write(tmp_path, '"1","Adams, Emily", 3\n"COMSC110.01S25","A"\n"COMSC210.02S25","A-"\n')
+    with pytest.raises(ValueError, match="student 1 lists 2 of 3 sections"):
+        list(iter_lst(path))
+
+
+def test_iter_lst_student_with_more_sections_than_counted(tmp_path):
+    # The extra section line is read where the next student's header belongs
+    path = _write(tmp_path, '"1","Adams, Emily", 1\n"COMSC110.01S25","A"\n"COMSC210.02S25","A-"\n')
+    with pytest.raises(ValueError, match=r'list\.lst:3: expected "ID","Last, First", count'):
+        list(iter_lst(path))
+
+
+def test_iter_lst_count_must_be_a_number(tmp_path):
+    path = _write(tmp_path, '"1","Adams, Emily", two\n"COMSC110.01S25","A"\n')
+    with pytest.raises(ValueError, match="count 'two' is not a number"):
+        list(iter_lst(path))
+
+
+def test_iter_lst_malformed_section_line(tmp_path):
+    path = _write(tmp_path, '"1","Adams, Emily", 1\n"COMSC110.01S25","A","extra"\n')
+    with pytest.raises(ValueError, match=r'list\.lst:2: expected "SECTION","GRADE"'):
+        list(iter_lst(path))
+
+
+def test_iter_lst_zero_count_student(tmp_path):
+    path = _write(tmp_path, '"1","Adams, Emily", 0\n"2","Lee, Ava", 1\n"S","A"\n')
+    assert [student_id for student_id, _, _ in iter_lst(path)] == ['1', '2']
+
+
+def _list_rows():
+    # Name fields split the way readSEC splits "Adams, Emily"
+    return pd.DataFrame({
+        'id': ['1', '2', '1', '1'],
+        'FirstName': ['Adams', 'Lee', 'Adams', 'Adams'],
+        'LastName': [' Emily', ' Ava', ' Emily', ' Emily'],
+        'Grade': ['A', 'A-', 'A-', 'A-'],
+        'section_source': ['COMSC110.01S25.SEC', 'COMSC110.01S25.SEC', 'COMSC210.02S25.sec',
+                           'COMSC210.02S25.sec'],
+    })
+
+
+def test_write_lst_keeps_the_source_name_order(tmp_path):
+    path = str(tmp_path / "good.lst")
+    assert write_lst(_list_rows(), path) == 2
+    with open(path) as file:
+        lines = file.read().splitlines()
+    assert lines == [
+        '"1","Adams, Emily", 2',
+        '"COMSC110.01S25","A"',
+        '"COMSC210.02S25","A-"',
+        '"2","Lee, Ava", 1',
+        '"COMSC110.01S25","A-"',
+    ]
+
+
+def test_write_then_read_round_trip(tmp_path):
+    path = str(tmp_path / "good.lst")
+    write_lst(_list_rows(), path)
+    rows = read_lst(path)
+    assert list(rows['FirstName']) == ['Adams', 'Adams', 'Lee']
+    assert list(rows['LastName']) == ['Emily', 'Emily', 'Ava']
+
+    again = str(tmp_path / "again.lst")
+    write_lst(rows, again)
+    assert compare_lst(path, again).empty
+
+
+def test_compare_lst_detects_names_and_duplicates(tmp_path):
+    golden = _write(tmp_path, '"1","Adams, Emily", 1\n"S1","A"\n', "golden.lst")
+    spacing = _write(tmp_path, '"1","Adams,Emily",1\n"s1","a"\n', "spacing.lst")
+    swapped = _write(tmp_path, '"1","Emily, Adams", 1\n"S1","A"\n', "swapped.lst")
+    repeated = _write(tmp_path, '"1","Adams, Emily", 2\n"S1","A"\n"S1","A"\n', "repeated.lst")
+
+    assert compare_lst(golden, spacing).empty
+    differences = compare_lst(golden, swapped)
+    assert list(differences['side']) == ['expected', 'actual']
+    assert list(differences['name']) == ['Adams, Emily', 'Emily, Adams']
+    assert compare_lst(golden, repeated).to_dict('records') == [
+        {'id': '1', 'name': 'Adams, Emily', 'section': 'S1', 'grade': 'A', 'side': 'actual'}]
@@ -0,0 +1,116 @@
+"""Tests for partial-sort performer selection, especially ties."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from performers import parse_selection, percentile_cutoff, select_performers, top_k_indices
+
+
+def test_top_k_orders_best_first():
+    values = [2.0, 3.5, 1.0, 4.0, 3.0]
+    assert list(top_k_indices(values, 3)) == [3, 1, 4]
+    assert list(top_k_indices(values, 2, largest=False)) == [2, 0]
+
+
+def test_top_k_ties_keep_table_order():
+    values = [3.0, 4.0, 3.0, 4.0, 3.0]
+    assert list(top_k_indices(values, 3)) == [1, 3, 0]
+    assert list(top_k_indices(values, 5)) == [1, 3, 0, 2, 4]
+    assert list(top_k_indices(values, 2, largest=False)) == [0, 2]
+
+
+def test_top_k_skips_nan_and_clamps_k():
+    values = [np.nan, 2.0, np.nan, 1.0]
+    assert list(top_k_indices(values, 10)) == [1, 3]
+    assert list(top_k_indices(values, 0)) == []
+    assert list(top_k_indices([np.nan], 1)) == []
+    assert top_k_indices(values, 1).dtype == np.int64
+
+
+def test_top_k_matches_a_full_sort():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20, 1000).astype(float) / 4
+    for k in (1, 7, 100, 999):
+        expected = np.argsort(-values, kind='stable')[:k]
+        assert list(top_k_indices(values, k)) == list(expected)
+
+
+def test_percentile_cutoff():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert percentile_cutoff(values, 10) == 10.0
+    assert percentile_cutoff(values, 25) == 8.0  # ceil(2.5) = 3 values
+    assert percentile_cutoff(values, 100) == 1.0
+    assert percentile_cutoff(values, 20, largest=False) == 2.0
+
+
+def test_percentile_cutoff_with_ties_and_nan():
+    values = [4.0, 4.0, 4.0, 3.0, np.nan]
+    assert percentile_cutoff(values, 25) == 4.0
+    assert percentile_cutoff(values, 25, largest=False) == 3.0
+    assert np.isnan(percentile_cutoff([np.nan], 50))
+
+
+@pytest.mark.parametrize('percentile', [0, -5, 100.5])
+def test_percentile_out_of_range(percentile):
+    with pytest.raises(ValueError):
+        percentile_cutoff([1.0], percentile)
+
+
+def _enrollments(rows):
+    return pd.DataFrame(rows, columns=['group', 'section', 'id', 'FirstName', 'LastName', 'GradePoints',
+                                       'credit_hours'])
+
+
+def test_select_performers_percentile_keeps_ties_at_the_cutoff():
+    enrollments = _enrollments([
+        ('G', 'S1', '1', 'a', 'a', 4.0, 3), ('G', 'S1', '2', 'b', 'b', 4.0, 3),
+        ('G', 'S1', '3', 'c', 'c', 4.0, 3), ('G', 'S1', '4', 'd', 'd', 2.0, 3),
+    ])
+    # 25% of 4 students is 1, but three share the cutoff GPA
+    selected = select_performers(enrollments, by='run', percentile=25)
+    assert list(selected['id']) == ['1', '2', '3']
+    assert list(selected['rank']) == [1, 1, 1]
+
+
+def test_select_performers_competition_rank_per_scope():
+    enrollments = _enrollments([
+        ('G', 'S1', '1', 'a', 'a', 4.0, 3), ('G', 'S1', '2', 'b', 'b', 3.0, 3),
+        ('G', 'S1', '3', 'c', 'c', 3.0, 3), ('G', 'S1', '4', 'd', 'd', 2.0, 3),
+        ('G', 'S2', '5', 'e', 'e', 1.0, 3), ('G', 'S2', '6', 'f', 'f', 3.7, 3),
+    ])
+    selected = select_performers(enrollments, by='section', n=4)
+    s1 = selected[selected['section'] == 'S1']
+    assert list(s1['id']) == ['1', '2', '3', '4']
+    assert list(s1['rank']) == [1, 2, 2, 4]
+    s2 = selected[selected['section'] == 'S2']
+    assert list(s2['rank']) == [1, 2]
+
+    bottom = select_performers(enrollments, by='section', top=False, n=1)
+    assert list(bottom['id']) == ['4', '5']
+
+
+def test_select_performers_weights_by_credits_and_skips_ungraded():
+    enrollments = _enrollments([
+        ('G', 'S1', '1', 'a', 'a', 4.0, 4), ('G', 'S2', '1', 'a', 'a', 2.0, 1),
+        ('G', 'S1', '2', 'b', 'b', 3.5, 3), ('G', 'S2', '2', 'b', 'b', np.nan, 3),
+    ])
+    selected = select_performers(enrollments, by='run', n=2)
+    assert list(selected['id']) == ['1', '2']
+    assert list(selected['gpa']) == [3.6, 3.5]
+    assert list(selected['enrollments']) == [2, 1]
+
+
+def test_select_performers_needs_exactly_one_of_n_and_percentile():
+    with pytest.raises(ValueError):
+        select_performers(_enrollments([]), n=1, percentile=5)
+    with pytest.raises(ValueError):
+        select_performers(_enrollments([]))
+
+
+def test_parse_selection():
+    assert parse_selection('top 10') == {'top': True, 'by': 'run', 'n': 10}
+    assert parse_selection(' Bottom 5% by Section ') == {'top': False, 'by': 'section', 'percentile': 5.0}
+    for text in ('best 3', 'top', 'top 2.5', 'top 3 by course'):
+        with pytest.raises(ValueError):
+            parse_selection(text)
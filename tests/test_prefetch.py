@@ -0,0 +1,68 @@
+"""Tests for prefetch.RunPrefetcher."""
+
+import os
+import threading
+
+import pytest
+
+from prefetch import RunPrefetcher
+
+
+def _wait_until_done(prefetcher, done, run_file):
+    assert done[run_file].wait(30), f"prefetch of {run_file} did not finish"
+    prefetcher._thread.join(30)
+
+
+def test_start_cancels_the_prefetch_in_flight(poc_data):
+    spring = os.path.join(poc_data, "Runs", "SPRING25.RUN")
+    first = os.path.join(poc_data, "Runs", "FIRSTRUN.RUN")
+    switched = threading.Event()
+    progress = []
+    done = {spring: threading.Event(), first: threading.Event()}
+
+    def on_progress(run_file, count, total):
+        progress.append(run_file)
+        if run_file == spring:
+            # Hold SPRING25 after its first section until FIRSTRUN has been started
+            switched.wait(30)
+
+    prefetcher = RunPrefetcher(on_progress=on_progress, on_done=lambda run_file: done[run_file].set(), pause=0)
+    prefetcher.start(spring)
+    spring_thread = prefetcher._thread
+    prefetcher.start(first)
+    switched.set()
+
+    _wait_until_done(prefetcher, done, first)
+    spring_thread.join(30)
+    assert not spring_thread.is_alive()
+    assert not done[spring].is_set()
+    assert progress.count(spring) <= 1
+    assert prefetcher.get(spring, 'good') is None
+    assert prefetcher.get(first, 'grp_files') == [os.path.join(poc_data, "Groups", "COMSC100.GRP")]
+    assert prefetcher.get(first, 'good') is not None and prefetcher.get(first, 'bad') is not None
+
+
+@pytest.mark.parametrize('changed', ['run', 'group', 'section'])
+def test_results_are_dropped_once_a_source_file_changes(poc_data, edit_section, changed):
+    run_file = os.path.join(poc_data, "Runs", "SPRING25.RUN")
+    done = {run_file: threading.Event()}
+    prefetcher = RunPrefetcher(on_done=lambda run_file: done[run_file].set(), pause=0)
+    prefetcher.start(run_file)
+    _wait_until_done(prefetcher, done, run_file)
+
+    good = prefetcher.get(run_file, 'good')
+    assert good is not None and not good.empty
+    assert len(prefetcher.get(run_file, 'sec_files')) == 4
+    # Callers get copies, so editing one does not change the cached list
+    good.drop(good.index, inplace=True)
+    assert not prefetcher.get(run_file, 'good').empty
+
+    if changed == 'section':
+        edit_section(os.path.join(poc_data, "Sections", "COMSC110.01S25.SEC"))
+    else:
+        path = run_file if changed == 'run' else os.path.join(poc_data, "Groups", "COMSC210.GRP")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert prefetcher.get(run_file, 'good') is None
+    assert prefetcher.get(run_file, 'grp_files') is None
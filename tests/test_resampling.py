@@ -0,0 +1,53 @@
+"""Tests for resampling.resample_sections."""
+
+import numpy as np
+
+from resampling import CHUNK_RESAMPLES, group_arrays, resample_sections
+
+SECTIONS = [
+    [4.0, 3.7, 4.0, 3.3, 4.0, 3.7],
+    [2.0, 1.0, 0.0, 1.3, 2.3],
+    [3.0, 2.7, 3.3, 3.0, 2.0, 3.7, 2.3],
+]
+
+
+def test_seeded_results_do_not_depend_on_workers():
+    values, starts, counts = group_arrays(SECTIONS)
+    n_resamples = 2 * CHUNK_RESAMPLES + 100
+
+    single = resample_sections(values, starts, counts, n_resamples, seed=7, workers=1)
+    pooled = resample_sections(values, starts, counts, n_resamples, seed=7, workers=2)
+
+    for key in ('p_value', 'ci_low', 'ci_high'):
+        np.testing.assert_array_equal(single[key], pooled[key])
+    # The strong and the weak section stand out; p-values stay within (0, 1]
+    assert single['p_value'][0] < 0.05 and single['p_value'][1] < 0.05
+    assert np.all((single['p_value'] > 0) & (single['p_value'] <= 1))
+    assert np.all(single['ci_low'] <= single['ci_high'])
+    assert single['ci_low'][0] > 0 > single['ci_high'][1]
+
+
+def test_different_seeds_differ():
+    values, starts, counts = group_arrays(SECTIONS)
+    first = resample_sections(values, starts, counts, 300, seed=1, workers=1)
+    second = resample_sections(values, starts, counts, 300, seed=2, workers=1)
+    assert not np.array_equal(first['ci_low'], second['ci_low'])
+
+
+def test_an_empty_section_gets_nan():
+    values, starts, counts = group_arrays([SECTIONS[0], [], SECTIONS[1]])
+    assert list(counts) == [6, 0, 5]
+
+    result = resample_sections(values, starts, counts, 300, seed=3, workers=1)
+
+    for key in ('p_value', 'ci_low', 'ci_high'):
+        assert np.isnan(result[key][1])
+        assert not np.isnan(result[key][[0, 2]]).any()
+    # The other sections are tested as if the empty one were not there
+    without = resample_sections(*group_arrays([SECTIONS[0], SECTIONS[1]]), 300, seed=3, workers=1)
+    np.testing.assert_array_equal(result['p_value'][[0, 2]], without['p_value'])
+
+
+def test_no_grade_points_at_all():
+    result = resample_sections(*group_arrays([[], []]), 100, seed=0, workers=1)
+    assert np.isnan(result['p_value']).all() and np.isnan(result['ci_high']).all()
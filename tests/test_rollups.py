@@ -0,0 +1,60 @@
+"""Tests for rollups.rollup and RollupStore."""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from rollups import ROLLUP_LEVELS, RollupStore, department_of, rollup
+
+
+def _assert_matches_full_rollup(store):
+    for level in ROLLUP_LEVELS:
+        pd.testing.assert_frame_equal(store.table(level, refresh=False), rollup(store.catalog.sections, level),
+                                      check_dtype=False)
+
+
+def test_incremental_update_equals_a_full_rollup(poc_data, edit_section):
+    sections_dir = os.path.join(poc_data, "Sections")
+    store = RollupStore(sections_dir)
+    assert len(store.refresh()) == len(store.catalog.sections)
+
+    edit_section(os.path.join(sections_dir, "COMSC110.01S25.SEC"), row=0, grade='F')
+    edit_section(os.path.join(sections_dir, "COMSC110.01S25.SEC"), row=1, grade='F')
+    before = store.table('course', refresh=False).set_index('course').loc['COMSC110', 'gpa']
+    assert store.refresh() == ['COMSC110.01S25.SEC']
+    assert store.table('course', refresh=False).set_index('course').loc['COMSC110', 'gpa'] < before
+    _assert_matches_full_rollup(store)
+
+    # A new course in a known department, and a removed section
+    shutil.copy(os.path.join(sections_dir, "COMSC210.01S25.SEC"), os.path.join(sections_dir, "COMSC999.01F25.SEC"))
+    os.remove(os.path.join(sections_dir, "COMSC210.02S25.SEC"))
+    assert sorted(store.refresh()) == ["COMSC210.02S25.SEC", "COMSC999.01F25.SEC"]
+    _assert_matches_full_rollup(store)
+    assert 'COMSC999' in set(store.table('course', refresh=False)['course'])
+
+
+def test_a_new_store_loads_the_materialized_tables(poc_data, edit_section):
+    sections_dir = os.path.join(poc_data, "Sections")
+    store = RollupStore(sections_dir)
+    store.refresh()
+
+    reopened = RollupStore(sections_dir)
+    assert reopened.refresh() == []
+    for level in ROLLUP_LEVELS:
+        pd.testing.assert_frame_equal(reopened.table(level, refresh=False), store.table(level, refresh=False),
+                                      check_dtype=False)
+
+    # Tables saved for an older catalog state are rebuilt, not loaded
+    edit_section(os.path.join(sections_dir, "COMSC210.01S25.SEC"))
+    stale = RollupStore(sections_dir)
+    assert 'COMSC210.01S25.SEC' in stale.refresh()
+    _assert_matches_full_rollup(stale)
+
+
+def test_department_and_unknown_level():
+    assert department_of("comsc110") == "COMSC"
+    assert department_of("110") == ""
+    with pytest.raises(ValueError):
+        rollup(pd.DataFrame(columns=['section', 'course', 'term']), 'year')
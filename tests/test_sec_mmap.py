@@ -0,0 +1,96 @@
+"""Tests for sec_mmap.MappedSEC."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from FileReader import fileReader
+from sec_mmap import SEC_COLUMNS, MappedSEC
+
+SECTIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "COMSC330_POC_Data", "Sections")
+
+ROWS = ['"Adams, Emily","A1","B+"', '"Baker, Sam","B22","F"', '"Chen, Li","C333","A-"']
+
+
+def _write(path, text):
+    with open(path, 'wb') as file:
+        file.write(text.encode())
+    return str(path)
+
+
+def test_to_frame_equals_read_sec_on_the_bundled_sections(tmp_path):
+    names = sorted(os.listdir(SECTIONS_DIR))
+    assert names
+    for name in names:
+        path = os.path.join(SECTIONS_DIR, name)
+        with MappedSEC(path, index_dir=str(tmp_path)) as sec:
+            pd.testing.assert_frame_equal(sec.to_frame(), fileReader.readSEC(path), check_dtype=False)
+            assert sec.header() == fileReader.readSECHeader(path)
+
+
+@pytest.mark.parametrize('text', [
+    "C1.01S25 3.0\r\n" + "\r\n".join(ROWS) + "\r\n",      # CRLF
+    "C1.01S25 3.0\n" + "\n".join(ROWS),                   # no final newline
+    "C1.01S25 3.0\r\n" + "\r\n".join(ROWS),               # both
+], ids=['crlf', 'no-final-newline', 'crlf-no-final-newline'])
+def test_line_endings(tmp_path, text):
+    path = _write(tmp_path / "C1.01S25.SEC", text)
+    expected = fileReader.readSEC(_write(tmp_path / "plain.SEC", "C1.01S25 3.0\n" + "\n".join(ROWS) + "\n"))
+
+    with MappedSEC(path, cache_index=False) as sec:
+        assert len(sec) == 3
+        pd.testing.assert_frame_equal(sec.to_frame(), expected, check_dtype=False)
+        pd.testing.assert_frame_equal(sec.rows(), expected, check_dtype=False)
+        assert sec[-1] == {'FirstName': 'Chen', 'LastName': ' Li', 'ID': 'C333', 'Grade': 'A-'}
+        assert list(sec.column('Grade')) == ['B+', 'F', 'A-']
+        assert sec.header() == ('C1.01S25', 3.0)
+
+
+def test_empty_file_and_header_only(tmp_path):
+    for text in ("", "C1.01S25 3.0\n"):
+        path = _write(tmp_path / "C1.01S25.SEC", text)
+        with MappedSEC(path, cache_index=False) as sec:
+            assert len(sec) == 0
+            frame = sec.to_frame()
+            assert frame.empty and list(frame.columns) == SEC_COLUMNS
+            assert sec.rows().empty
+            assert len(fileReader.readSEC(path)) == 0
+            with pytest.raises(IndexError):
+                sec.row(0)
+
+
+def test_cached_row_index_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    path = _write(tmp_path / "C1.01S25.SEC", "C1.01S25 3.0\n" + "\n".join(ROWS) + "\n")
+    index_dir = str(tmp_path / "row_index")
+    with MappedSEC(path, index_dir=index_dir) as sec:
+        assert len(sec) == 3
+    assert os.path.exists(os.path.join(index_dir, "C1.01S25.SEC.rows.npz"))
+
+    scans = []
+    scan = MappedSEC._scan
+
+    def counting_scan(self):
+        scans.append(self.path)
+        return scan(self)
+
+    monkeypatch.setattr(MappedSEC, '_scan', counting_scan)
+    with MappedSEC(path, index_dir=index_dir) as sec:
+        assert len(sec) == 3
+    assert scans == []
+
+    # Same size, newer mtime: the saved offsets may be wrong, so the file is scanned again
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with MappedSEC(path, index_dir=index_dir) as sec:
+        assert len(sec) == 3
+    assert len(scans) == 1
+
+    # A grown file gets a new index, which is then reused
+    _write(path, "C1.01S25 3.0\n" + "\n".join(ROWS + ['"Diaz, Ana","D4","C"']) + "\n")
+    with MappedSEC(path, index_dir=index_dir) as sec:
+        assert len(sec) == 4 and sec.row(3)['ID'] == 'D4'
+    with MappedSEC(path, index_dir=index_dir) as sec:
+        assert len(sec) == 4
+    assert len(scans) == 2
@@ -0,0 +1,69 @@
+"""Tests for trends.rolling_trends and TrendEngine."""
+
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from catalog import SectionCatalog
+from grade_distribution import GRADE_BINS
+from trends import TrendEngine, course_term_table, rolling_trends
+
+POINTS = {'A': 4.0, 'B': 3.0, 'C': 2.0, 'F': 0.0}
+
+
+def _section(name, course, term, **grades):
+    """A catalog section row with the aggregates of the given grade counts."""
+    graded = sum(grades.values())
+    row = {'section': name, 'course': course, 'term': term, 'students': graded, 'graded': graded,
+           'gpa_sum': sum(POINTS[grade] * count for grade, count in grades.items()),
+           'gpa_sumsq': sum(POINTS[grade] ** 2 * count for grade, count in grades.items())}
+    row.update({grade: grades.get(grade, 0) for grade in GRADE_BINS})
+    return row
+
+
+def test_rolling_windows_restart_at_each_course():
+    sections = pd.DataFrame([
+        _section("C1.01S19", 'C1', 'S19', A=1, F=1),
+        _section("C2.01F18", 'C2', 'F18', C=2),
+        _section("C1.01S18", 'C1', 'S18', A=2),
+        _section("C1.01F18", 'C1', 'F18', B=2),
+        _section("C2.01S19", 'C2', 'S19', A=2),
+    ])
+
+    trends = rolling_trends(course_term_table(sections), window=2)
+
+    assert list(zip(trends['course'], trends['term'])) == [
+        ('C1', 'S18'), ('C1', 'F18'), ('C1', 'S19'), ('C2', 'F18'), ('C2', 'S19')]
+    assert list(trends['gpa']) == [4.0, 3.0, 2.0, 2.0, 4.0]
+    # C2's first window holds only its own first offering
+    assert list(trends['rolling_sections']) == [1, 2, 2, 1, 2]
+    assert list(trends['rolling_students']) == [2, 4, 4, 2, 4]
+    assert list(trends['rolling_gpa']) == [4.0, 3.5, 2.5, 2.0, 3.0]
+    # Drift against the two offerings before: all A -> all B is 1; A/F against A/B is 0.5
+    drift = list(trends['drift'])
+    assert math.isnan(drift[0]) and math.isnan(drift[3])
+    assert drift[1] == 1.0 and drift[2] == 0.5 and drift[4] == 1.0
+
+
+def test_window_of_one_and_bad_window():
+    sections = pd.DataFrame([_section("C1.01S18", 'C1', 'S18', A=2), _section("C1.01F18", 'C1', 'F18', B=2)])
+    trends = rolling_trends(course_term_table(sections), window=1)
+    assert list(trends['rolling_gpa']) == list(trends['gpa'])
+    with pytest.raises(ValueError):
+        rolling_trends(course_term_table(sections), window=0)
+
+
+def test_refresh_rebuilds_only_the_edited_course(poc_data, edit_section, tmp_path):
+    sections_dir = os.path.join(poc_data, "Sections")
+    engine = TrendEngine(sections_dir)
+    first = engine.refresh()
+    assert 'COMSC110' in first and len(first) > 1
+
+    edit_section(os.path.join(sections_dir, "COMSC110.01S25.SEC"), row=0, grade='F')
+    assert engine.refresh() == ['COMSC110']
+    assert engine.refresh() == []
+
+    fresh = TrendEngine(sections_dir, catalog=SectionCatalog(sections_dir, cache_dir=str(tmp_path / "fresh")))
+    pd.testing.assert_frame_equal(engine.trends(refresh=False), fresh.trends())
@@ -0,0 +1,67 @@
+"""Tests for zscore_calculator.ZScoreCache."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from zscore_calculator import ZScoreCache
+
+
+def _cache(z_scores, **kwargs):
+    return ZScoreCache(pd.DataFrame({'section': [f"S{n}" for n in range(len(z_scores))], 'z_score': z_scores}),
+                       **kwargs)
+
+
+def test_count_at_and_between_stored_values():
+    cache = _cache([-2.5, 1.0, 2.0, -0.5, 3.25])
+
+    # A section whose |z| equals the threshold is significant
+    assert cache.count(2.0) == 3
+    assert cache.count(2.5) == 2
+    assert cache.count(3.25) == 1
+    assert cache.count(1.5) == 3
+    assert cache.count(2.01) == 2
+    assert cache.count(3.3) == 0
+    assert cache.count(0.0) == 5
+    assert list(cache.significant(2.5)) == [True, False, False, False, True]
+
+
+def test_nan_and_not_available_rows_are_never_significant():
+    cache = _cache([2.5, 'N/A', np.nan, -3.0])
+
+    assert cache.valid == 2
+    assert cache.count(0.0) == 2
+    assert cache.count(2.5) == 2
+    assert list(cache.significant(0.0)) == [True, False, False, True]
+    assert list(cache.apply(2.6)['significant']) == [False, False, False, True]
+
+
+def test_sweep_matches_count():
+    cache = _cache([-2.5, 1.0, 2.0, 'N/A', 3.25])
+    thresholds = [0.0, 1.0, 1.5, 2.0, 2.5, 3.25, 4.0]
+
+    sweep = cache.sweep(thresholds)
+
+    assert list(sweep['significant_sections']) == [cache.count(threshold) for threshold in thresholds]
+    assert list(sweep['significant_sections']) == [4, 4, 3, 3, 2, 1, 0]
+    assert list(sweep['share']) == [1.0, 1.0, 0.75, 0.75, 0.5, 0.25, 0.0]
+
+
+def test_sweep_without_any_z_score():
+    sweep = _cache(['N/A']).sweep([1.0, 2.0])
+    assert list(sweep['significant_sections']) == [0, 0]
+    assert list(sweep['share']) == [0.0, 0.0]
+
+
+def test_cache_goes_stale_when_a_section_changes(poc_data, edit_section):
+    run_file = os.path.join(poc_data, "Runs", "SPRING25.RUN")
+    sections = [os.path.join(poc_data, "Sections", name) for name in ("COMSC110.01S25.SEC", "COMSC210.01S25.SEC")]
+    cache = _cache([1.0, -2.0], run_file=run_file, sec_files=sections)
+
+    assert cache.matches(run_file, sections)
+    assert not cache.matches(run_file, sections[:1])
+    assert not cache.matches(os.path.join(poc_data, "Runs", "FIRSTRUN.RUN"), sections)
+
+    edit_section(sections[1])
+    assert not cache.matches(run_file, sections)
@@ -0,0 +1,210 @@
+"""
+Course and term trends built from the section catalog's per-section aggregates.
+
+Section names encode the course and term (COMSC335.01F18), and the catalog
+keeps each section's graded count, grade-point sum and sum of squares and its
+grade histogram. Summing those per course and term gives a time series per
+course without reading a single .sec file, and rolling windows over the terms
+a course was offered give:
+
+  - rolling_gpa: pooled GPA of the last `window` offerings (sum of grade
+    points over sum of graded students, so large sections weigh more).
+  - rolling_sections / rolling_students: size of the window.
+  - drift: total variation distance between this term's grade distribution
+    and the pooled distribution of the `window` offerings before it (0 = the
+    same shares, 1 = no grade in common).
+
+TrendEngine keeps the table per course and, after a catalog refresh, rebuilds
+only the courses whose sections were added, edited or removed.
+
+Provides:
+  - TREND_COLUMNS: columns of the trend table.
+  - course_term_table: per course and term sums of the section aggregates.
+  - rolling_trends: rolling GPA, counts and drift for a course/term table.
+  - TrendEngine: trend table kept up to date with a SectionCatalog.
+"""
+
+import numpy as np
+import pandas as pd
+
+from enrollments import parse_section_name, term_sort_key
+from grade_distribution import GRADE_BINS
+
+# Columns of the trend table, in order (the grade counts of the term follow)
+TREND_COLUMNS = ['course', 'term', 'sections', 'students', 'graded', 'gpa', 'gpa_std',
+                 'rolling_sections', 'rolling_students', 'rolling_gpa', 'drift']
+
+# Section aggregates summed per course and term
+_SUMMED = ['students', 'graded', 'gpa_sum', 'gpa_sumsq'] + GRADE_BINS
+
+
+def course_term_table(sections):
+    """
+    Sum the section aggregates of every course and term.
+
+    Args:
+        sections (pd.DataFrame): A catalog section table (SECTION_COLUMNS).
+
+    Returns:
+        pd.DataFrame: One row per course and term with 'sections' and the sums
+            of the aggregates, terms in chronological order within each course.
+    """
+    if sections.empty:
+        return pd.DataFrame(columns=['course', 'term', 'sections'] + _SUMMED)
+    table = sections.groupby(['course', 'term'], sort=False).agg(
+        sections=('section', 'size'), **{column: (column, 'sum') for column in _SUMMED}).reset_index()
+    order = sorted(range(len(table)), key=lambda row: (table['course'].iat[row], term_sort_key(table['term'].iat[row])))
+    return table.iloc[order].reset_index(drop=True)
+
+
+def rolling_trends(table, window=3):
+    """
+    Add rolling-window GPA, counts and grade drift to a course/term table.
+
+    Args:
+        table (pd.DataFrame): Output of course_term_table.
+        window (int): Number of offerings (terms the course ran) per window.
+
+    Returns:
+        pd.DataFrame: Columns TREND_COLUMNS followed by the grade counts.
+
+    Raises:
+        ValueError: If window is smaller than 1.
+    """
+    if window < 1:
+        raise ValueError(f"window must be at least 1, not {window}")
+    if table.empty:
+        return pd.DataFrame(columns=TREND_COLUMNS + GRADE_BINS)
+
+    graded = table['graded'].to_numpy(dtype=float)
+    gpa_sum = table['gpa_sum'].to_numpy(dtype=float)
+    gpa_sumsq = table['gpa_sumsq'].to_numpy(dtype=float)
+    counts = table[GRADE_BINS].to_numpy(dtype=float)
+
+    # Rolling sums restart at each course: prefix sums minus the prefix `window` rows back
+    course_codes = pd.factorize(table['course'])[0]
+    position = np.arange(len(table))
+    course_start = np.r_[0, np.flatnonzero(np.diff(course_codes)) + 1]
+    first_row = np.repeat(course_start, np.diff(np.r_[course_start, len(table)]))
+    window_start = np.maximum(position - window + 1, first_row)
+
+    summed = np.column_stack([table['sections'].to_numpy(dtype=float), table['students'].to_numpy(dtype=float),
+                              graded, gpa_sum, counts])
+    prefix = np.vstack([np.zeros(summed.shape[1]), np.cumsum(summed, axis=0)])
+    rolling = prefix[position + 1] - prefix[window_start]
+    # The `window` offerings before this one, for drift
+    previous_start = np.maximum(position - window, first_row)
+    previous = (prefix[position] - prefix[previous_start])[:, 4:]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gpa = np.where(graded > 0, gpa_sum / graded, np.nan)
+        gpa_std = np.where(graded > 0, np.sqrt(np.maximum(gpa_sumsq / graded - gpa ** 2, 0.0)), np.nan)
+        rolling_gpa = np.where(rolling[:, 2] > 0, rolling[:, 3] / rolling[:, 2], np.nan)
+        shares = counts / counts.sum(axis=1, keepdims=True)
+        previous_shares = previous / previous.sum(axis=1, keepdims=True)
+        drift = 0.5 * np.abs(shares - previous_shares).sum(axis=1)
+    drift = np.where((counts.sum(axis=1) > 0) & (previous.sum(axis=1) > 0), drift, np.nan)
+
+    trends = pd.DataFrame({
+        'course': table['course'].to_numpy(),
+        'term': table['term'].to_numpy(),
+        'sections': table['sections'].to_numpy(dtype=int),
+        'students': table['students'].to_numpy(dtype=int),
+        'graded': graded.astype(int),
+        'gpa': np.round(gpa, 3),
+        'gpa_std': np.round(gpa_std, 3),
+        'rolling_sections': rolling[:, 0].astype(int),
+        'rolling_students': rolling[:, 1].astype(int),
+        'rolling_gpa': np.round(rolling_gpa, 3),
+        'drift': np.round(drift, 3),
+    }, columns=TREND_COLUMNS)
+    for bin_index, grade in enumerate(GRADE_BINS):
+        trends[grade] = counts[:, bin_index].astype(int)
+    return trends
+
+
+class TrendEngine:
+    """
+    Course/term trend table kept in step with a SectionCatalog.
+
+    The first refresh builds every course; later refreshes rebuild only the
+    courses touched by added, edited or removed sections, from the catalog's
+    stored aggregates.
+    """
+
+    def __init__(self, sections_dir, window=3, catalog=None):
+        """
+        Open the catalog of a Sections folder.
+
+        Args:
+            sections_dir (str): Folder holding the .sec files.
+            window (int): Offerings per rolling window (default 3).
+            catalog (SectionCatalog, optional): Catalog to use instead of opening one.
+        """
+        from catalog import SectionCatalog
+
+        self.catalog = catalog or SectionCatalog(sections_dir)
+        self.window = window
+        # course -> trend rows of that course
+        self._courses = {}
+        self._built = False
+
+    def _rebuild(self, courses):
+        """Recompute the trend rows of the given courses from the catalog."""
+        sections = self.catalog.sections
+        for course in courses:
+            self._courses.pop(course, None)
+        selected = sections[sections['course'].isin(courses)]
+        trends = rolling_trends(course_term_table(selected), self.window)
+        for course, rows in trends.groupby('course', sort=False):
+            self._courses[course] = rows.reset_index(drop=True)
+
+    def refresh(self):
+        """
+        Refresh the catalog and rebuild the courses whose sections changed.
+
+        Returns:
+            list of str: The courses that were rebuilt.
+        """
+        changes = self.catalog.refresh()
+        if not self._built:
+            courses = sorted(set(self.catalog.sections['course'].dropna()) - {''})
+            self._built = True
+        else:
+            names = changes['added'] + changes['changed'] + changes['removed']
+            courses = sorted({parse_section_name(name)['course'] for name in names} - {''})
+        if courses:
+            self._rebuild(courses)
+        return courses
+
+    def set_window(self, window):
+        """
+        Change the rolling window and rebuild every course.
+
+        Args:
+            window (int): Offerings per rolling window.
+        """
+        self.window = window
+        self._built = False
+        self._courses = {}
+        self.refresh()
+
+    def trends(self, courses=None, refresh=True):
+        """
+        Return the trend table.
+
+        Args:
+            courses (list of str, optional): Only these courses (default: all).
+            refresh (bool): Pick up added or edited sections first (default True).
+
+        Returns:
+            pd.DataFrame: Columns TREND_COLUMNS followed by the grade counts,
+                sorted by course and chronologically by term.
+        """
+        if refresh or not self._built:
+            self.refresh()
+        names = sorted(self._courses) if courses is None else [course for course in courses
+                                                                 if course in self._courses]
+        if not names:
+            return pd.DataFrame(columns=TREND_COLUMNS + GRADE_BINS)
+        return pd.concat([self._courses[course] for course in names], ignore_index=True)
@@ -6,21 +6,56 @@ Module to compute and analyze Z-scores for course section GPAs relative to group
 This module includes:
   - letter_to_gpa: convert letter grades to numeric GPA (with exclusions)
   - compute_z_score: calculate Z-score given sample and population stats
+  - erfc: vectorized complementary error function (shared normal tail)
   - compute_p_value: compute two‐tailed p‐value for a Z‐score
+  - compute_p_values: two-tailed p-values for an array of Z-scores
   - is_significant: test if a Z‐score exceeds a threshold
   - calculate_section_stats: mean GPA and count of valid grades per section
   - calculate_group_stats: mean and stddev across sections
   - analyze_sections: load data, run analysis, return JSON‐ready results
+  - analyze_groups: z-scores of each section against its own group and the run
+  - compare_groups: z-score of each group's GPA against the whole run
+  - ZScoreCache: keeps a finished analysis so thresholds can be changed or swept instantly
 """
 
 
 import math
 import argparse
 import json
+import numpy as np
 import pandas as pd
 import os
 
 
+def erfc(x):
+    """
+    Complementary error function of an array, without a Python-level loop.
+
+    Uses scipy.special.erfc when scipy is installed, otherwise the Chebyshev
+    fit of Numerical Recipes (erfcc), whose relative error is below 1.2e-7
+    everywhere, so tail p-values stay accurate as well.
+
+    Args:
+        x (array-like): Values.
+
+    Returns:
+        np.ndarray: erfc(x) for each value (NaN stays NaN).
+    """
+    x = np.asarray(x, dtype=float)
+    try:
+        from scipy.special import erfc as scipy_erfc
+        return scipy_erfc(x)
+    except ImportError:
+        pass
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    value = t * np.exp(-z * z + poly)
+    return np.where(x >= 0, value, 2.0 - value)
+
+
 class ZScoreCalculator:
     """Compute and analyze Z‑scores for course section GPAs."""
 
@@ -82,6 +117,20 @@ class ZScoreCalculator:
         t = abs(z_score) / math.sqrt(2)
         return 1 - math.erf(t)
 
+    @staticmethod
+    def compute_p_values(z_scores):
+        """
+        Two-tailed p-values for an array of Z-scores, like compute_p_value.
+
+        Args:
+            z_scores (array-like): Z-scores (NaN gives NaN).
+
+        Returns:
+            np.ndarray: P(|Z| >= |z|) for each z.
+        """
+        # The polynomial fit can overshoot 1 by ~1e-7 at z = 0
+        return np.minimum(erfc(np.abs(np.asarray(z_scores, dtype=float)) / math.sqrt(2)), 1.0)
+
     @staticmethod
     def is_significant(z_score: float, threshold: float = 2.0) -> bool:
         """
@@ -172,20 +221,38 @@ class ZScoreCalculator:
         return mean, std_dev
 
     @staticmethod
-    def analyze_sections(run_file, grp_files, sec_files, threshold=2.0):
+    def analyze_sections(run_file, grp_files, sec_files, threshold=2.0, significance='normal',
+                         n_resamples=10000, seed=None, workers=None, alpha=0.05):
         """
         Load section files, compute Z-scores, and return analysis.
 
+        With significance='resampling' every section is also tested with a
+        permutation test and a bootstrap confidence interval (see resampling.py),
+        which do not rely on the normal approximation and suit small sections.
+
         Args:
             run_file (str): Path to this script (used to locate Sections folder).
             grp_files (list of str): Group‐level data files (currently unused).
             sec_files (list of str): Section filenames to analyze.
             threshold (float): Z-score threshold for significance (default 2.0).
+            significance (str): 'normal' marks sections with |z| >= threshold;
+                'resampling' marks sections whose permutation p-value is below
+                alpha and adds 'perm_p_value', 'ci_low' and 'ci_high' (bootstrap
+                interval of section GPA - group GPA).
+            n_resamples (int): Resamples for each test in resampling mode (default 10000).
+            seed (int, optional): Seed for reproducible resampling results.
+            workers (int, optional): Worker processes for resampling (default: one per CPU).
+            alpha (float): Significance level in resampling mode (default 0.05).
 
         Returns:
             results (list of dict): Analysis per section, ready for JSON.
             DataFrame: Pandas DataFrame of results.
+
+        Raises:
+            ValueError: If significance is not 'normal' or 'resampling'.
         """
+        if significance not in ('normal', 'resampling'):
+            raise ValueError(f"significance must be 'normal' or 'resampling', not {significance!r}")
         from FileReader import fileReader
         
         # Get base directory for sections path
@@ -199,7 +266,7 @@ class ZScoreCalculator:
         for sec_file in sec_files:
             full_path = os.path.join(sections_path, sec_file)
             try:
-                df = fileReader.readSEC(full_path)
+                df = fileReader.cachedReadSEC(full_path)
                 section_dfs[sec_file] = df
                 section_files.append(df)
             except Exception as e:
@@ -244,8 +311,267 @@ class ZScoreCalculator:
                     'error': str(e)
                 })
         
+        if significance == 'resampling' and results:
+            from resampling import group_arrays, resample_sections
+
+            # Grade points of each section, excluding I/W/P/NP like the z-test
+            section_values = []
+            for result in results:
+                points = [ZScoreCalculator.letter_to_gpa(grade) for grade in section_dfs[result['section']]['Grade']]
+                section_values.append([point for point in points if point is not None])
+            values, starts, counts = group_arrays(section_values)
+            tests = resample_sections(values, starts, counts, n_resamples, seed, workers, 1 - alpha)
+            for position, result in enumerate(results):
+                p_value = tests['p_value'][position]
+                valid = p_value == p_value
+                result['perm_p_value'] = round(float(p_value), 5) if valid else 'N/A'
+                result['ci_low'] = round(float(tests['ci_low'][position]), 3) if valid else 'N/A'
+                result['ci_high'] = round(float(tests['ci_high'][position]), 3) if valid else 'N/A'
+                result['significant'] = bool(valid and p_value < alpha)
+
         # Sort results by z-score (absolute value)
         results.sort(key=lambda x: abs(x['z_score']) if isinstance(x['z_score'], (int, float)) else 0, reverse=True)
         
         return results, pd.DataFrame(results)
 
+    @staticmethod
+    def _grouped_stats(run_file, grp_files=None):
+        """
+        Section, group and run GPA statistics from the run's enrollment table.
+
+        Every section is parsed once (through the shared section cache) and
+        all statistics come from grouped reductions over the one table.
+
+        Returns:
+            tuple: (sections, groups, run_mean, run_std)
+                sections (DataFrame): group, section, section_gpa, n, section_count.
+                groups (DataFrame): group, group_gpa, group_std, n.
+                run_mean, run_std (float): GPA statistics of the whole run.
+        """
+        from enrollments import run_enrollments
+
+        enrollments = run_enrollments(run_file)
+        if grp_files is not None:
+            wanted = {os.path.splitext(os.path.basename(grp_file))[0] for grp_file in grp_files}
+            enrollments = enrollments[enrollments['group'].isin(wanted)]
+        # Only grades that count towards GPA (F is 0, I/W/P/NP are excluded)
+        valid = enrollments[enrollments['GradePoints'].notna()]
+
+        per_section = valid.groupby(['group', 'section'], sort=False)['GradePoints']
+        sections = per_section.agg(section_gpa='mean', n='size').reset_index()
+        counts = valid.groupby(['group', 'section', 'Grade'], sort=False).size()
+        sections['section_count'] = [
+            counts.loc[(group, section)].to_dict() for group, section in zip(sections['group'], sections['section'])
+        ]
+
+        # Population std (ddof=0), like calculate_group_stats
+        groups = valid.groupby('group', sort=False)['GradePoints'].agg(
+            group_gpa='mean', group_std=lambda points: points.std(ddof=0), n='size').reset_index()
+
+        # A section listed by several groups counts once towards the run
+        first_group = valid.drop_duplicates('section').set_index('section')['group']
+        in_run = valid[valid['group'].to_numpy() == first_group.reindex(valid['section']).to_numpy()]
+        points = in_run['GradePoints']
+        run_mean = float(points.mean()) if len(points) else 0.0
+        run_std = float(points.std(ddof=0)) if len(points) else 0.0
+        return sections, groups, run_mean, run_std
+
+    @staticmethod
+    def _z_columns(values, mean, std, threshold):
+        """Vectorized z-score, p-value and significance (NaN/False where std is 0)."""
+        values = np.asarray(values, dtype=float)
+        std = np.asarray(std, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where(std > 0, (values - mean) / np.where(std > 0, std, 1.0), np.nan)
+        p = ZScoreCalculator.compute_p_values(z)
+        return z, p, np.abs(np.nan_to_num(z)) >= threshold
+
+    @staticmethod
+    def analyze_groups(run_file, grp_files=None, threshold=2.0):
+        """
+        Compare every section with its own group and with the whole run.
+
+        Unlike analyze_sections, which pools every section of the run into one
+        population, each section is tested against the GPA of the group file
+        that lists it. All groups are handled in one grouped computation over
+        the run's enrollment table, and no section file is read per group.
+
+        Args:
+            run_file (str): Path to the run file.
+            grp_files (list of str, optional): Only analyze these groups
+                (default: every group in the run).
+            threshold (float): Z-score threshold for significance (default 2.0).
+
+        Returns:
+            results (list of dict): Analysis per (group, section), ready for JSON.
+            DataFrame: Columns group, section, section_gpa, section_count,
+                group_gpa, group_std, z_score, p_value, significant, performance,
+                run_gpa, run_std, run_z_score, run_p_value, run_significant -
+                sorted by group, then |z_score| descending.
+        """
+        sections, groups, run_mean, run_std = ZScoreCalculator._grouped_stats(run_file, grp_files)
+        if sections.empty:
+            return [], pd.DataFrame()
+
+        table = sections.merge(groups[['group', 'group_gpa', 'group_std']], on='group', how='left')
+        z, p, significant = ZScoreCalculator._z_columns(table['section_gpa'], table['group_gpa'],
+                                                        table['group_std'], threshold)
+        run_z, run_p, run_significant = ZScoreCalculator._z_columns(table['section_gpa'], run_mean,
+                                                                    np.full(len(table), run_std), threshold)
+        table['z_score'] = np.round(z, 3)
+        table['p_value'] = np.round(p, 5)
+        table['significant'] = significant
+        table['performance'] = np.select([z > 0, z < 0], ['Above Average', 'Below Average'], 'Average')
+        table['run_gpa'] = round(run_mean, 3)
+        table['run_std'] = round(run_std, 3)
+        table['run_z_score'] = np.round(run_z, 3)
+        table['run_p_value'] = np.round(run_p, 5)
+        table['run_significant'] = run_significant
+        for col in ('section_gpa', 'group_gpa', 'group_std'):
+            table[col] = table[col].round(3)
+
+        table['_order'] = -np.abs(np.nan_to_num(z))
+        table = table.sort_values(['group', '_order'], kind='stable').drop(columns=['_order', 'n'])
+        table = table.reset_index(drop=True)
+        return table.to_dict('records'), table
+
+    @staticmethod
+    def compare_groups(run_file, grp_files=None, threshold=2.0):
+        """
+        Test whether each group's GPA differs from all groups combined.
+
+        Args:
+            run_file (str): Path to the run file.
+            grp_files (list of str, optional): Only these groups (default: every group).
+            threshold (float): Z-score threshold for significance (default 2.0).
+
+        Returns:
+            DataFrame: Columns group, group_gpa, group_std, n, run_gpa, run_std,
+                z_score, p_value, significant - sorted by |z_score| descending.
+        """
+        _, groups, run_mean, run_std = ZScoreCalculator._grouped_stats(run_file, grp_files)
+        if groups.empty:
+            return pd.DataFrame()
+        z, p, significant = ZScoreCalculator._z_columns(groups['group_gpa'], run_mean,
+                                                        np.full(len(groups), run_std), threshold)
+        table = groups.assign(run_gpa=round(run_mean, 3), run_std=round(run_std, 3),
+                              z_score=np.round(z, 3), p_value=np.round(p, 5), significant=significant)
+        table['group_gpa'] = table['group_gpa'].round(3)
+        table['group_std'] = table['group_std'].round(3)
+        order = np.argsort(-np.abs(np.nan_to_num(z)), kind='stable')
+        return table.iloc[order].reset_index(drop=True)
+
+
+class ZScoreCache:
+    """
+    A finished z-score analysis kept for instant threshold changes.
+
+    The |z| values are stored once as a sorted array, so the number of
+    significant sections for any threshold is one searchsorted, and the
+    significance mask for a threshold is one vectorized comparison - no file
+    is read and no statistic is recomputed.
+    """
+
+    def __init__(self, results_df, run_file=None, sec_files=None):
+        """
+        Cache the z-scores of an analysis.
+
+        Args:
+            results_df (DataFrame): Output of analyze_sections, analyze_groups or
+                IncrementalAnalyzer.results (needs a 'z_score' column; 'N/A'
+                entries never count as significant).
+            run_file (str, optional): Run the analysis was done on.
+            sec_files (list of str, optional): Sections the analysis read; their
+                mtime and size are recorded to tell when the cache is stale.
+        """
+        self.results = results_df
+        self.run_file = run_file
+        self.sec_files = list(sec_files or [])
+        self._signature = self._files_signature(self.sec_files)
+        self.abs_z = np.abs(pd.to_numeric(results_df['z_score'], errors='coerce').to_numpy(dtype=float))
+        # NaN sorts last, so counts below only ever see real |z| values
+        self.sorted_abs_z = np.sort(self.abs_z)
+        self.valid = int(np.count_nonzero(~np.isnan(self.abs_z)))
+
+    @staticmethod
+    def _files_signature(paths):
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def matches(self, run_file, sec_files):
+        """
+        True if the cache was built for this run and these unchanged sections.
+
+        Args:
+            run_file (str): Run file of the new request.
+            sec_files (list of str): Section files of the new request.
+
+        Returns:
+            bool: Whether the cached analysis can be reused.
+        """
+        return (run_file == self.run_file and list(sec_files or []) == self.sec_files
+                and self._files_signature(self.sec_files) == self._signature)
+
+    def significant(self, threshold):
+        """
+        Significance mask for a threshold.
+
+        Args:
+            threshold (float): Z-score threshold.
+
+        Returns:
+            np.ndarray: bool per row of the results, |z| >= threshold.
+        """
+        with np.errstate(invalid='ignore'):
+            return self.abs_z >= threshold
+
+    def count(self, threshold):
+        """
+        Number of significant sections at a threshold.
+
+        Args:
+            threshold (float): Z-score threshold.
+
+        Returns:
+            int: Sections with |z| >= threshold.
+        """
+        return self.valid - int(np.searchsorted(self.sorted_abs_z[:self.valid], threshold, side='left'))
+
+    def apply(self, threshold):
+        """
+        Return the results with the 'significant' column set for a threshold.
+
+        Args:
+            threshold (float): Z-score threshold.
+
+        Returns:
+            DataFrame: Copy of the cached results.
+        """
+        results = self.results.copy()
+        results['significant'] = self.significant(threshold)
+        return results
+
+    def sweep(self, thresholds):
+        """
+        Count significant sections for many thresholds at once.
+
+        Args:
+            thresholds (array-like of float): Thresholds to try.
+
+        Returns:
+            DataFrame: Columns threshold, significant_sections, share (of the
+                sections that have a z-score).
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        counts = self.valid - np.searchsorted(self.sorted_abs_z[:self.valid], thresholds, side='left')
+        return pd.DataFrame({
+            'threshold': thresholds,
+            'significant_sections': counts,
+            'share': counts / self.valid if self.valid else np.zeros(len(thresholds)),
+        })